@@ -0,0 +1,4 @@
+"""
+Модуль тестов производительности.
+Содержит замеры времени и памяти для преобразований и сравнения качества.
+"""
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Тест производительности преобразований.
+
+Прогоняет все зарегистрированные преобразования, оценку качества и поиск
+параметров резкости на синтетических изображениях разного размера (0.25-50 Мп)
+в оттенках серого, RGB и RGBA при разном числе потоков. Результаты (время,
+Мп/с, пиковая память) сохраняются в JSON и могут сравниваться с сохраненной
+базовой линией для обнаружения регрессий.
+
+Запуск:
+    python -m benchmarks.transform_benchmark --sizes 0.25 1 --output results.json
+    python -m benchmarks.transform_benchmark --baseline results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_processing.factories.transform_factory import TransformFactory
+from image_processing.quality_assessment import QualityAssessment, FilterQualityComparator
+from image_processing.sharpness_comparator import SharpnessComparator
+
+logger = logging.getLogger(__name__)
+
+# Версия формата файла результатов
+RESULTS_VERSION = 1
+
+# Размеры изображений в мегапикселях
+DEFAULT_SIZES = (0.25, 1.0, 4.0, 12.0, 50.0)
+
+# Режимы изображений и число каналов
+MODE_CHANNELS = {
+    "gray": 1,
+    "rgb": 3,
+    "rgba": 4,
+}
+
+# Число уровней шума синтетического изображения; градиент ограничен
+# 255 - (SYNTHETIC_NOISE_LEVELS - 1), чтобы сумма не переполняла uint8
+SYNTHETIC_NOISE_LEVELS = 32
+
+# Пути кроме зарегистрированных преобразований
+QUALITY_TARGET = "quality:compute_quality_metrics"
+COMPARATOR_TARGET = "quality:compare_filters"
+SHARPNESS_TARGET = "sharpness:optimize_parameters"
+
+# Допустимое ухудшение относительно базовой линии (доля)
+DEFAULT_TOLERANCE = 0.2
+
+# Если один прогон дольше, большие размеры для этой цели пропускаются (секунды)
+DEFAULT_MAX_SECONDS = 60.0
+
+STATUS_OK = "ok"
+STATUS_OVER_BUDGET = "over_budget"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+
+class BenchmarkCase(NamedTuple):
+    """Один замер: цель, размер, режим изображения и число потоков."""
+    target: str
+    megapixels: float
+    mode: str
+    workers: int
+
+    @property
+    def key(self) -> str:
+        """Ключ для сопоставления с базовой линией."""
+        return f"{self.target}|{self.megapixels:g}|{self.mode}|{self.workers}"
+
+
+def default_workers() -> Tuple[int, ...]:
+    """Число потоков по умолчанию: 1 и все ядра процессора."""
+    cpu_count = os.cpu_count() or 1
+    return (1, cpu_count) if cpu_count > 1 else (1,)
+
+
+def synthetic_image(megapixels: float, mode: str, seed: int = 0) -> np.ndarray:
+    """
+    Создает синтетическое изображение: плавный градиент с шумом.
+
+    Args:
+        megapixels: Размер в мегапикселях (соотношение сторон 4:3)
+        mode: Режим (gray, rgb, rgba)
+        seed: Зерно генератора шума
+
+    Returns:
+        np.ndarray: Массив uint8
+    """
+    channels = MODE_CHANNELS[mode]
+    height = max(1, int(round(np.sqrt(megapixels * 1e6 * 3 / 4))))
+    width = max(1, int(round(megapixels * 1e6 / height)))
+
+    rng = np.random.default_rng(seed)
+    # Сумма градиентов по осям достигает 255 - (SYNTHETIC_NOISE_LEVELS - 1)
+    axis_max = (255 - (SYNTHETIC_NOISE_LEVELS - 1)) / 2
+    gradient = np.add.outer(np.linspace(0, axis_max, height), np.linspace(0, axis_max, width))
+    shape = (height, width) if channels == 1 else (height, width, channels)
+    noise = rng.integers(0, SYNTHETIC_NOISE_LEVELS, shape, dtype=np.uint8)
+    if channels == 1:
+        return (gradient.astype(np.uint8) + noise).astype(np.uint8)
+
+    image = gradient.astype(np.uint8)[..., np.newaxis] + noise
+    if mode == "rgba":
+        # Непрозрачная альфа, как у большинства загруженных RGBA-изображений
+        image[..., 3] = 255
+    return image
+
+
+class TransformBenchmark:
+    """
+    Набор замеров производительности.
+
+    Каждый замер выполняется в пуле из workers потоков, каждый поток
+    обрабатывает свою копию задания (BaseTransform.execute не изменяет
+    общий экземпляр). Первый прогон - прогревочный, в нем же измеряется
+    пиковая память через tracemalloc; время берется как минимум по repeats
+    последующим прогонам.
+    """
+
+    def __init__(self, sizes: Sequence[float] = DEFAULT_SIZES,
+                 modes: Sequence[str] = tuple(MODE_CHANNELS),
+                 workers: Optional[Sequence[int]] = None,
+                 targets: Optional[Sequence[str]] = None,
+                 repeats: int = 1,
+                 max_seconds: float = DEFAULT_MAX_SECONDS,
+                 measure_memory: bool = True):
+        """
+        Инициализация набора замеров.
+
+        Args:
+            sizes: Размеры изображений в мегапикселях
+            modes: Режимы изображений (gray, rgb, rgba)
+            workers: Числа потоков (по умолчанию 1 и число ядер)
+            targets: Цели замеров (по умолчанию все преобразования и пути качества)
+            repeats: Число замеряемых прогонов
+            max_seconds: Бюджет времени одного прогона
+            measure_memory: Измерять ли пиковую память
+        """
+        for mode in modes:
+            if mode not in MODE_CHANNELS:
+                raise ValueError(f"Неизвестный режим изображения: {mode}")
+        self.sizes = sorted(sizes)
+        self.modes = list(modes)
+        self.workers = list(workers or default_workers())
+        self.targets = list(targets or self.available_targets())
+        self.repeats = max(1, repeats)
+        self.max_seconds = max_seconds
+        self.measure_memory = measure_memory
+
+    @staticmethod
+    def available_targets() -> List[str]:
+        """
+        Возвращает все доступные цели замеров.
+
+        Returns:
+            List[str]: Названия преобразований и путей оценки качества
+        """
+        return TransformFactory.get_available_transforms() + [
+            QUALITY_TARGET, COMPARATOR_TARGET, SHARPNESS_TARGET
+        ]
+
+    def cases(self) -> List[BenchmarkCase]:
+        """
+        Возвращает список замеров в порядке выполнения (размеры по возрастанию).
+
+        Returns:
+            List[BenchmarkCase]: Замеры
+        """
+        return [BenchmarkCase(target, megapixels, mode, workers)
+                for target in self.targets
+                for mode in self.modes
+                for workers in self.workers
+                for megapixels in self.sizes]
+
+    def run(self, on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+        """
+        Выполняет все замеры.
+
+        Args:
+            on_result: Callback, вызываемый после каждого замера
+
+        Returns:
+            List[Dict[str, Any]]: Результаты замеров
+        """
+        results = []
+        # Цели, превысившие бюджет, по (цель, режим, потоки)
+        over_budget = set()
+        images: Dict[Tuple[float, str], np.ndarray] = {}
+
+        for case in self.cases():
+            group = (case.target, case.mode, case.workers)
+            if group in over_budget:
+                result = self._result(case, STATUS_SKIPPED)
+            else:
+                image_key = (case.megapixels, case.mode)
+                if image_key not in images:
+                    # Хранится только текущее изображение: 50 Мп RGBA занимают 200 МБ
+                    images.clear()
+                    images[image_key] = synthetic_image(case.megapixels, case.mode)
+                result = self.run_case(case, images[image_key])
+                if result['status'] == STATUS_OVER_BUDGET:
+                    over_budget.add(group)
+
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    def run_case(self, case: BenchmarkCase, image: np.ndarray) -> Dict[str, Any]:
+        """
+        Выполняет один замер.
+
+        Args:
+            case: Описание замера
+            image: Входное изображение
+
+        Returns:
+            Dict[str, Any]: Результат замера
+        """
+        try:
+            task = self._make_task(case.target, image)
+            peak_memory, first_time = self._run_parallel(task, case.workers, self.measure_memory)
+            if first_time > self.max_seconds:
+                return self._result(case, STATUS_OVER_BUDGET, first_time, peak_memory)
+
+            wall_time = min(self._run_parallel(task, case.workers, False)[1]
+                            for _ in range(self.repeats))
+            return self._result(case, STATUS_OK, wall_time, peak_memory)
+        except Exception as e:
+            logger.error(f"Ошибка замера {case.key}: {e}")
+            result = self._result(case, STATUS_ERROR)
+            result['error'] = str(e)
+            return result
+
+    def _make_task(self, target: str, image: np.ndarray) -> Callable[[], Any]:
+        """Создает задание для одного потока."""
+        if target == QUALITY_TARGET:
+            assessor = QualityAssessment()
+            processed = np.ascontiguousarray(image[::-1])
+            return lambda: assessor.compute_quality_metrics(image, processed)
+        if target == COMPARATOR_TARGET:
+            processed = {"flip": np.ascontiguousarray(image[::-1]),
+                         "negative": 255 - image}
+            return lambda: FilterQualityComparator().compare_filters(image, processed)
+        if target == SHARPNESS_TARGET:
+            return lambda: SharpnessComparator().optimize_sharpness_parameters(image)
+
+        # Параметры точечных преобразований подбираются до замера
+        transform = TransformFactory.create_transform(target)
+        parameters = transform.get_optimal_parameters(image)
+        return lambda: transform.execute(image, **parameters)
+
+    def _run_parallel(self, task: Callable[[], Any], workers: int,
+                      measure_memory: bool) -> Tuple[Optional[int], float]:
+        """Выполняет задание в workers потоках; возвращает пиковую память и время."""
+        if measure_memory:
+            tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            if workers == 1:
+                task()
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for future in [executor.submit(task) for _ in range(workers)]:
+                        future.result()
+            elapsed = time.perf_counter() - start
+            peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        finally:
+            if measure_memory:
+                tracemalloc.stop()
+        return peak_memory, elapsed
+
+    def _result(self, case: BenchmarkCase, status: str, wall_time: Optional[float] = None,
+                peak_memory: Optional[int] = None) -> Dict[str, Any]:
+        """Формирует запись результата."""
+        throughput = None
+        if wall_time:
+            throughput = case.megapixels * case.workers / wall_time
+        return {
+            'key': case.key,
+            'target': case.target,
+            'megapixels': case.megapixels,
+            'mode': case.mode,
+            'workers': case.workers,
+            'status': status,
+            'wall_time': wall_time,
+            'megapixels_per_second': throughput,
+            'peak_memory_bytes': peak_memory,
+        }
+
+
+def environment_info() -> Dict[str, Any]:
+    """Описание окружения, в котором выполнены замеры."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_results(path: str, results: List[Dict[str, Any]]) -> None:
+    """
+    Сохраняет результаты в JSON.
+
+    Args:
+        path: Путь к файлу
+        results: Результаты замеров
+    """
+    document = {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment_info(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> List[Dict[str, Any]]:
+    """
+    Загружает результаты из JSON.
+
+    Args:
+        path: Путь к файлу
+
+    Returns:
+        List[Dict[str, Any]]: Результаты замеров
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        document = json.load(file)
+    if document.get('version') != RESULTS_VERSION:
+        raise ValueError(f"Неподдерживаемая версия файла результатов: {document.get('version')}")
+    return document['results']
+
+
+def compare_results(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    Сравнивает результаты с базовой линией.
+
+    Регрессией считается падение пропускной способности или рост пиковой
+    памяти больше чем на tolerance, а также ошибка или превышение бюджета
+    там, где базовый замер был успешным.
+
+    Args:
+        current: Текущие результаты
+        baseline: Результаты базовой линии
+        tolerance: Допустимое относительное ухудшение
+
+    Returns:
+        List[Dict[str, Any]]: Найденные регрессии
+    """
+    baseline_by_key = {result['key']: result for result in baseline}
+    regressions = []
+
+    for result in current:
+        reference = baseline_by_key.get(result['key'])
+        if reference is None or reference['status'] != STATUS_OK:
+            continue
+
+        if result['status'] != STATUS_OK:
+            regressions.append({'key': result['key'], 'metric': 'status',
+                                'baseline': reference['status'], 'current': result['status']})
+            continue
+
+        throughput, reference_throughput = result['megapixels_per_second'], reference['megapixels_per_second']
+        if throughput < reference_throughput * (1.0 - tolerance):
+            regressions.append({'key': result['key'], 'metric': 'megapixels_per_second',
+                                'baseline': reference_throughput, 'current': throughput})
+
+        memory, reference_memory = result['peak_memory_bytes'], reference['peak_memory_bytes']
+        if memory is not None and reference_memory and memory > reference_memory * (1.0 + tolerance):
+            regressions.append({'key': result['key'], 'metric': 'peak_memory_bytes',
+                                'baseline': reference_memory, 'current': memory})
+
+    return regressions
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """Строка отчета для одного замера."""
+    if result['status'] in (STATUS_SKIPPED, STATUS_ERROR):
+        return f"{result['key']}: {result['status']}"
+    memory = result['peak_memory_bytes']
+    memory_text = f", {memory / 2**20:.1f} МБ" if memory is not None else ""
+    return (f"{result['key']}: {result['wall_time']:.3f} с, "
+            f"{result['megapixels_per_second']:.2f} Мп/с{memory_text} [{result['status']}]")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Точка входа командной строки.
+
+    Returns:
+        int: Код возврата (1 при обнаружении регрессий)
+    """
+    parser = argparse.ArgumentParser(description="Тест производительности преобразований")
+    parser.add_argument('--sizes', type=float, nargs='+', default=list(DEFAULT_SIZES),
+                        help="Размеры изображений в мегапикселях")
+    parser.add_argument('--modes', nargs='+', default=list(MODE_CHANNELS), choices=list(MODE_CHANNELS),
+                        help="Режимы изображений")
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="Числа потоков (по умолчанию 1 и число ядер)")
+    parser.add_argument('--targets', nargs='+', default=None,
+                        help="Цели замеров (по умолчанию все)")
+    parser.add_argument('--repeats', type=int, default=1, help="Число замеряемых прогонов")
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS,
+                        help="Бюджет одного прогона; большие размеры пропускаются при превышении")
+    parser.add_argument('--no-memory', action='store_true', help="Не измерять пиковую память")
+    parser.add_argument('--output', help="Файл JSON для сохранения результатов")
+    parser.add_argument('--baseline', help="Файл JSON базовой линии для сравнения")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Допустимое относительное ухудшение")
+    parser.add_argument('--list', action='store_true', help="Вывести доступные цели и выйти")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(TransformBenchmark.available_targets()))
+        return 0
+
+    benchmark = TransformBenchmark(sizes=args.sizes, modes=args.modes, workers=args.workers,
+                                   targets=args.targets, repeats=args.repeats,
+                                   max_seconds=args.max_seconds, measure_memory=not args.no_memory)
+    results = benchmark.run(on_result=lambda result: print(format_result(result), flush=True))
+
+    if args.output:
+        save_results(args.output, results)
+        print(f"Результаты сохранены: {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.tolerance)
+        for regression in regressions:
+            print(f"РЕГРЕССИЯ {regression['key']}: {regression['metric']} "
+                  f"{regression['baseline']} -> {regression['current']}")
+        if regressions:
+            return 1
+        print("Регрессий не обнаружено")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,6 +23,14 @@ DISPLAY_IMAGE_SIZE = (400, 300)
 DIFF_MAP_SIZE = (400, 200)
 FULL_DIFF_MAP_SIZE = (580, 380)
 
+# Предпросмотр преобразований
+PREVIEW_IMAGE_SIZE = DISPLAY_IMAGE_SIZE
+PREVIEW_IDLE_DELAY_MS = 700  # Задержка перед расчетом в полном разрешении
+
+# Фоновый расчет преобразований
+RENDER_DEBOUNCE_MS = 150  # Пауза для объединения частых запросов
+RENDER_POLL_MS = 30  # Период опроса готовых результатов
+
 # Размеры окон
 COMPARISON_WINDOW_SIZE = "800x600"
 SHARPNESS_WINDOW_SIZE = "900x700"
@@ -283,7 +283,8 @@ class LoadingSpinner:
     
     def start(self):
         """Запускает анимацию спиннера."""
-        self._animate()
+        if self.animation_id is None:
+            self._animate()
     
     def stop(self):
         """Останавливает анимацию спиннера."""
@@ -361,6 +362,7 @@ class ProgressBar:
         self.bg_color = bg_color
         self.fill_color = fill_color
         self.progress = 0
+        self.eta: Optional[float] = None
         
         self.canvas = tk.Canvas(parent, width=width, height=height, 
                                highlightthickness=0, bg=bg_color)
@@ -382,19 +384,30 @@ class ProgressBar:
         
         # Текст прогресса
         text = f"{int(self.progress)}%"
+        if self.eta is not None and 0 < self.progress < 100:
+            text += f" · {self._format_eta(self.eta)}"
         self.canvas.create_text(self.width // 2, self.height // 2, 
                               text=text, fill='#ffffff', font=('Segoe UI', 9))
     
-    def set_progress(self, progress: int):
+    def set_progress(self, progress: float, eta: Optional[float] = None):
         """
         Устанавливает прогресс.
         
         Args:
             progress: Прогресс в процентах (0-100)
+            eta: Оценка оставшегося времени в секундах
         """
         self.progress = max(0, min(100, progress))
+        self.eta = eta
         self._draw()
     
+    def _format_eta(self, eta: float) -> str:
+        """Форматирует оставшееся время для подписи."""
+        seconds = int(round(eta))
+        if seconds < 60:
+            return f"~{seconds} с"
+        return f"~{seconds // 60} мин {seconds % 60:02d} с"
+    
     def pack(self, **kwargs):
         """Упаковывает прогресс-бар."""
         self.canvas.pack(**kwargs)
@@ -0,0 +1,214 @@
+"""
+Многоуровневая пирамида изображения (mipmaps) для быстрого масштабирования и панорамирования.
+"""
+
+import math
+from typing import List, Tuple
+import numpy as np
+from PIL import Image
+
+from image_processing.bit_depth import dtype_max
+from image_processing.instrumentation import instrumentation
+
+# Минимальная сторона самого грубого уровня пирамиды
+MIN_PYRAMID_SIZE = 256
+
+# Пределы масштаба просмотра
+MIN_ZOOM = 0.01
+MAX_ZOOM = 16.0
+
+# Начиная с этого увеличения пиксели показываются без сглаживания
+NEAREST_ZOOM = 2.0
+
+
+class ImagePyramid:
+    """
+    Пирамида уменьшенных копий изображения.
+
+    Уровень i уменьшен в 2^i раз. Уровни строятся лениво через Image.reduce
+    и кэшируются, поэтому каждый следующий уровень стоит четверть предыдущего.
+    Для отображения выбирается ближайший уровень, не меньший требуемого
+    масштаба, и из него пересчитывается только видимая область.
+    """
+
+    def __init__(self, image: Image.Image, min_size: int = MIN_PYRAMID_SIZE):
+        """
+        Инициализация пирамиды.
+
+        Args:
+            image: Изображение полного разрешения
+            min_size: Минимальная сторона самого грубого уровня
+        """
+        self.image = self._to_display_mode(image)
+        self.min_size = min_size
+        self._levels: List[Image.Image] = [self.image]
+
+        # Число уровней: уменьшаем вдвое, пока меньшая сторона больше min_size
+        self.level_count = 1
+        side = min(self.image.size)
+        while side // 2 >= min_size:
+            side //= 2
+            self.level_count += 1
+
+    @staticmethod
+    def _to_display_mode(image: Image.Image) -> Image.Image:
+        """Приводит изображение к режиму, поддерживаемому Image.reduce и PhotoImage."""
+        if image.mode in ('L', 'RGB', 'RGBA'):
+            return image
+        if image.mode in ('LA', 'PA') or 'transparency' in image.info:
+            return image.convert('RGBA')
+        if image.mode in ('I;16', 'I;16B', 'I;16L', 'I', 'F'):
+            # Высокая разрядность масштабируется в 8 бит, а не обрезается
+            array = np.asarray(image)
+            if image.mode == 'I' and array.size and 0 <= array.min() and array.max() <= 65535:
+                array = array.astype(np.uint16)
+            values = array.astype(np.float64) * (255.0 / dtype_max(array))
+            return Image.fromarray(np.clip(values, 0, 255).astype(np.uint8))
+        if image.mode == '1':
+            return image.convert('L')
+        return image.convert('RGB')
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Размер изображения полного разрешения."""
+        return self.image.size
+
+    def get_level(self, index: int) -> Image.Image:
+        """
+        Возвращает уровень пирамиды, строя недостающие уровни.
+
+        Args:
+            index: Номер уровня (0 - полное разрешение)
+
+        Returns:
+            Image.Image: Изображение уровня
+        """
+        index = max(0, min(index, self.level_count - 1))
+        instrumentation.record_cache("pyramid", index < len(self._levels))
+        while len(self._levels) <= index:
+            self._levels.append(self._levels[-1].reduce(2))
+        return self._levels[index]
+
+    def select_level(self, zoom: float) -> int:
+        """
+        Выбирает самый грубый уровень, разрешение которого не ниже zoom.
+
+        Args:
+            zoom: Масштаб отображения относительно полного разрешения
+
+        Returns:
+            int: Номер уровня
+        """
+        if zoom >= 1.0:
+            return 0
+        index = int(math.floor(math.log2(1.0 / zoom)))
+        return max(0, min(index, self.level_count - 1))
+
+    def render(self, zoom: float, region: Tuple[int, int, int, int]) -> Image.Image:
+        """
+        Отрисовывает область отображения в заданном масштабе.
+
+        Args:
+            zoom: Масштаб отображения относительно полного разрешения
+            region: Область (x, y, ширина, высота) в координатах отображения
+
+        Returns:
+            Image.Image: Изображение области размером ширина x высота
+        """
+        x, y, width, height = region
+        level = self.get_level(self.select_level(zoom))
+
+        # Масштаб уровня относительно полного разрешения (reduce округляет вниз)
+        level_scale_x = level.size[0] / self.size[0]
+        level_scale_y = level.size[1] / self.size[1]
+
+        box = (
+            x / zoom * level_scale_x,
+            y / zoom * level_scale_y,
+            (x + width) / zoom * level_scale_x,
+            (y + height) / zoom * level_scale_y,
+        )
+        resample = Image.Resampling.NEAREST if zoom >= NEAREST_ZOOM else Image.Resampling.BILINEAR
+        with instrumentation.measure("display.render", width * height / 1e6):
+            return level.resize((width, height), resample, box=box)
+
+
+class ImageViewport:
+    """Состояние просмотра: масштаб и смещение видимой области."""
+
+    def __init__(self, image_size: Tuple[int, int]):
+        """
+        Инициализация области просмотра.
+
+        Args:
+            image_size: Размер изображения полного разрешения
+        """
+        self.image_size = image_size
+        self.zoom = 1.0
+        # Смещение левого верхнего угла области в координатах отображения
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+
+    def fit(self, canvas_width: int, canvas_height: int):
+        """Вписывает изображение в область без увеличения."""
+        scale_x = canvas_width / self.image_size[0]
+        scale_y = canvas_height / self.image_size[1]
+        self.zoom = max(MIN_ZOOM, min(scale_x, scale_y, 1.0))
+        self.clamp(canvas_width, canvas_height)
+
+    def zoom_at(self, factor: float, x: float, y: float, canvas_width: int, canvas_height: int):
+        """
+        Изменяет масштаб, сохраняя точку под курсором на месте.
+
+        Args:
+            factor: Множитель масштаба
+            x, y: Позиция курсора на canvas
+            canvas_width, canvas_height: Размер canvas
+        """
+        new_zoom = max(MIN_ZOOM, min(self.zoom * factor, MAX_ZOOM))
+        ratio = new_zoom / self.zoom
+        self.offset_x = (self.offset_x + x) * ratio - x
+        self.offset_y = (self.offset_y + y) * ratio - y
+        self.zoom = new_zoom
+        self.clamp(canvas_width, canvas_height)
+
+    def pan(self, dx: float, dy: float, canvas_width: int, canvas_height: int):
+        """Сдвигает изображение на (dx, dy) пикселей canvas."""
+        self.offset_x -= dx
+        self.offset_y -= dy
+        self.clamp(canvas_width, canvas_height)
+
+    def display_size(self) -> Tuple[int, int]:
+        """Размер изображения в текущем масштабе."""
+        return (max(1, int(round(self.image_size[0] * self.zoom))),
+                max(1, int(round(self.image_size[1] * self.zoom))))
+
+    def clamp(self, canvas_width: int, canvas_height: int):
+        """Ограничивает смещение: малое изображение центрируется, большое не уходит за края."""
+        display_width, display_height = self.display_size()
+        self.offset_x = self._clamp_axis(self.offset_x, display_width, canvas_width)
+        self.offset_y = self._clamp_axis(self.offset_y, display_height, canvas_height)
+
+    def _clamp_axis(self, offset: float, display: int, canvas: int) -> float:
+        """Ограничивает смещение по одной оси."""
+        if display <= canvas:
+            return -(canvas - display) / 2
+        return max(0.0, min(offset, display - canvas))
+
+    def visible_region(self, canvas_width: int, canvas_height: int) -> Tuple[int, int, Tuple[int, int, int, int]]:
+        """
+        Вычисляет видимую часть изображения.
+
+        Returns:
+            Tuple: (x, y) позиция на canvas и область (x, y, ширина, высота)
+            в координатах отображения
+        """
+        display_width, display_height = self.display_size()
+        left = int(max(0, self.offset_x))
+        top = int(max(0, self.offset_y))
+        right = int(min(display_width, self.offset_x + canvas_width))
+        bottom = int(min(display_height, self.offset_y + canvas_height))
+        width = max(1, right - left)
+        height = max(1, bottom - top)
+        return (int(round(left - self.offset_x)), int(round(top - self.offset_y)),
+                (left, top, width, height))
@@ -5,10 +5,29 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional, Callable
+from collections import OrderedDict
 import os
 import logging
 from PIL import Image, ImageTk
 
+from .image_pyramid import ImagePyramid, ImageViewport
+from .overlay_compositor import OverlayCompositor, OVERLAY_SWIPE, OVERLAY_OPACITY, OVERLAY_DIFFERENCE
+
+# Число кэшированных PhotoImage на canvas
+PHOTO_CACHE_SIZE = 16
+
+# Множитель масштаба на один шаг колесика мыши
+ZOOM_STEP = 1.25
+
+# Число кэшированных пирамид изображений
+PYRAMID_CACHE_SIZE = 4
+
+# Минимальный интервал перерисовки при перетаскивании (~60 кадров/с)
+FRAME_INTERVAL_MS = 16
+
+# Расстояние в пикселях, на котором разделитель захватывается мышью
+DIVIDER_GRAB_DISTANCE = 8
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +50,15 @@ class ModernImageDisplay:
         self.processed_image = None
         self.display_mode = "split"  # "split", "before", "after", "overlay"
         
+        # Состояние просмотра для каждого canvas: пирамида, масштаб, кэш PhotoImage
+        self._views = {}
+        self._pyramids = OrderedDict()
+        self._render_ids = {}
+        
+        # Режим наложения: разделитель, прозрачность или разность
+        self.overlay_compositor = OverlayCompositor()
+        self.swipe_position = 0.5
+        
         self._create_widgets()
         self._setup_bindings()
     
@@ -100,6 +128,30 @@ class ModernImageDisplay:
                                         style='Modern.TButton',
                                         command=self.toggle_fullscreen)
         self.fullscreen_btn.grid(row=0, column=4, padx=(20, 0))
+        
+        # Настройки режима наложения (показываются только в этом режиме)
+        self.overlay_controls = ttk.Frame(controls_frame, style='Modern.TFrame')
+        self.overlay_controls.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(10, 0))
+        
+        self.overlay_mode_var = tk.StringVar(value=OVERLAY_SWIPE)
+        for column, (text, value) in enumerate([("Шторка", OVERLAY_SWIPE),
+                                                ("Прозрачность", OVERLAY_OPACITY),
+                                                ("Разность", OVERLAY_DIFFERENCE)]):
+            ttk.Radiobutton(self.overlay_controls, 
+                           text=text, 
+                           variable=self.overlay_mode_var, 
+                           value=value,
+                           style='Modern.TRadiobutton',
+                           command=lambda: self.render_view(self.original_canvas)).grid(row=0, column=column, padx=(0, 10))
+        
+        self.overlay_opacity_var = tk.DoubleVar(value=0.5)
+        ttk.Scale(self.overlay_controls, 
+                 from_=0.0, 
+                 to=1.0, 
+                 variable=self.overlay_opacity_var,
+                 command=lambda value: self._request_render(self.original_canvas)).grid(row=0, column=3, sticky=(tk.W, tk.E), padx=(10, 0))
+        self.overlay_controls.columnconfigure(3, weight=1)
+        self.overlay_controls.grid_remove()
     
     def create_image_area(self, parent):
         """Создает область отображения изображений."""
@@ -127,15 +179,13 @@ class ModernImageDisplay:
         # Скроллбары для исходного изображения
         self.original_v_scroll = ttk.Scrollbar(self.original_frame, 
                                               orient=tk.VERTICAL, 
-                                              command=self.original_canvas.yview)
+                                              command=lambda *args: self.on_scroll(self.original_canvas, 'y', *args))
         self.original_v_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.original_canvas.configure(yscrollcommand=self.original_v_scroll.set)
         
         self.original_h_scroll = ttk.Scrollbar(self.original_frame, 
                                               orient=tk.HORIZONTAL, 
-                                              command=self.original_canvas.xview)
+                                              command=lambda *args: self.on_scroll(self.original_canvas, 'x', *args))
         self.original_h_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        self.original_canvas.configure(xscrollcommand=self.original_h_scroll.set)
         
         # Обработанное изображение
         self.processed_frame = ttk.LabelFrame(self.image_container, 
@@ -154,15 +204,13 @@ class ModernImageDisplay:
         # Скроллбары для обработанного изображения
         self.processed_v_scroll = ttk.Scrollbar(self.processed_frame, 
                                                orient=tk.VERTICAL, 
-                                               command=self.processed_canvas.yview)
+                                               command=lambda *args: self.on_scroll(self.processed_canvas, 'y', *args))
         self.processed_v_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.processed_canvas.configure(yscrollcommand=self.processed_v_scroll.set)
         
         self.processed_h_scroll = ttk.Scrollbar(self.processed_frame, 
                                                orient=tk.HORIZONTAL, 
-                                               command=self.processed_canvas.xview)
+                                               command=lambda *args: self.on_scroll(self.processed_canvas, 'x', *args))
         self.processed_h_scroll.grid(row=1, column=0, sticky=(tk.W, tk.E))
-        self.processed_canvas.configure(xscrollcommand=self.processed_h_scroll.set)
         
         # Начальные сообщения
         self.show_placeholder_messages()
@@ -200,9 +248,14 @@ class ModernImageDisplay:
     
     def _setup_bindings(self):
         """Настраивает привязки событий."""
-        # Привязка событий мыши для масштабирования
-        self.original_canvas.bind("<MouseWheel>", self.on_mousewheel_original)
-        self.processed_canvas.bind("<MouseWheel>", self.on_mousewheel_processed)
+        # Привязка событий мыши для масштабирования (Button-4/5 - колесико в X11)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.original_canvas.bind(sequence, self.on_mousewheel_original)
+            self.processed_canvas.bind(sequence, self.on_mousewheel_processed)
+        
+        # Перерисовка видимой области при изменении размера
+        self.original_canvas.bind("<Configure>", lambda e: self.render_view(self.original_canvas))
+        self.processed_canvas.bind("<Configure>", lambda e: self.render_view(self.processed_canvas))
         
         # Привязка событий для перетаскивания
         self.original_canvas.bind("<Button-1>", self.start_drag_original)
@@ -238,6 +291,11 @@ class ModernImageDisplay:
         mode = self.mode_var.get()
         self.display_mode = mode
         
+        if mode != "overlay":
+            self.original_frame.configure(text="Исходное изображение")
+            self.overlay_controls.grid_remove()
+            self.render_view(self.original_canvas)
+        
         if mode == "split":
             self.show_split_view()
         elif mode == "before":
@@ -269,13 +327,15 @@ class ModernImageDisplay:
         self.image_container.columnconfigure(1, weight=1)
     
     def show_overlay_view(self):
-        """Показывает наложенный вид."""
-        # Показываем оба фрейма, но обработанное поверх исходного
+        """Показывает наложенный вид: результат и исходное на одном canvas."""
         self.original_frame.grid()
-        self.processed_frame.grid()
+        self.processed_frame.grid_remove()
         self.image_container.columnconfigure(0, weight=1)
-        self.image_container.columnconfigure(1, weight=1)
-        # TODO: Реализовать наложение изображений
+        self.image_container.columnconfigure(1, weight=0)
+        
+        self.original_frame.configure(text="Сравнение: исходное / результат")
+        self.overlay_controls.grid()
+        self.render_view(self.original_canvas)
     
     def display_original_image(self, image):
         """
@@ -302,15 +362,19 @@ class ModernImageDisplay:
         if image:
             self.processed_image = image
             self.display_image_on_canvas(self.processed_canvas, image)
+            if self.display_mode == "overlay":
+                self.render_view(self.original_canvas)
         else:
             self.clear_canvas(self.processed_canvas)
             self.show_placeholder_messages()
     
     def display_image_on_canvas(self, canvas, image):
-        """Отображает изображение на canvas."""
-        # Очищаем canvas
-        canvas.delete("all")
+        """
+        Отображает изображение на canvas, вписывая его в видимую область.
         
+        Для изображения строится пирамида уменьшенных копий; отрисовывается
+        только видимая область из ближайшего уровня пирамиды.
+        """
         # Получаем размеры canvas
         canvas_width = canvas.winfo_width()
         canvas_height = canvas.winfo_height()
@@ -320,40 +384,218 @@ class ModernImageDisplay:
             canvas.after(100, lambda: self.display_image_on_canvas(canvas, image))
             return
         
-        # Получаем размеры изображения
-        img_width, img_height = image.size
+        view = self._views.get(canvas)
+        if view is None or view['image'] is not image:
+            view = {
+                'image': image,
+                'pyramid': self._get_pyramid(image),
+                'viewport': ImageViewport(image.size),
+                'photos': OrderedDict(),
+                'drag': None,
+            }
+            self._views[canvas] = view
+        
+        view['viewport'].fit(canvas_width, canvas_height)
+        self.render_view(canvas)
+    
+    def render_view(self, canvas):
+        """Отрисовывает видимую область изображения в текущем масштабе."""
+        view = self._views.get(canvas)
+        if view is None:
+            return
         
-        # Вычисляем масштаб для вписывания в canvas
-        scale_x = canvas_width / img_width
-        scale_y = canvas_height / img_height
-        scale = min(scale_x, scale_y, 1.0)  # Не увеличиваем изображение
+        canvas_width = canvas.winfo_width()
+        canvas_height = canvas.winfo_height()
+        if canvas_width <= 1 or canvas_height <= 1:
+            return
         
-        # Вычисляем новые размеры
-        new_width = int(img_width * scale)
-        new_height = int(img_height * scale)
+        viewport = view['viewport']
+        viewport.clamp(canvas_width, canvas_height)
+        x, y, region = viewport.visible_region(canvas_width, canvas_height)
         
-        # Изменяем размер изображения
-        resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        if canvas is self.original_canvas and self.display_mode == "overlay" and self.processed_image:
+            self._render_overlay(canvas, view, x, y, region)
+            self._update_scrollbars(canvas)
+            return
         
-        # Конвертируем в PhotoImage
-        photo = ImageTk.PhotoImage(resized_image)
+        # Повторные отрисовки той же области берутся из кэша PhotoImage
+        key = (round(viewport.zoom, 6), region)
+        photos = view['photos']
+        photo = photos.get(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(view['pyramid'].render(viewport.zoom, region))
+            photos[key] = photo
+            if len(photos) > PHOTO_CACHE_SIZE:
+                photos.popitem(last=False)
+        else:
+            photos.move_to_end(key)
+        
+        canvas.delete("all")
+        canvas.create_image(x, y, anchor=tk.NW, image=photo)
         
-        # Отображаем изображение по центру canvas
-        x = (canvas_width - new_width) // 2
-        y = (canvas_height - new_height) // 2
+        # Сохраняем ссылку на изображение
+        canvas.image = photo
+        
+        self._update_scrollbars(canvas)
+    
+    def _render_overlay(self, canvas, view, x, y, region):
+        """Отрисовывает наложение результата на исходное изображение в видимой области."""
+        viewport = view['viewport']
+        key = (round(viewport.zoom, 6), region, id(self.original_image), id(self.processed_image))
+        
+        compositor = self.overlay_compositor
+        if not compositor.has_buffers(key):
+            # Масштаб результата приводим к масштабу исходного изображения
+            processed_zoom = viewport.zoom * self.processed_image.size[0] / self.original_image.size[0]
+            compositor.set_buffers(
+                key,
+                view['pyramid'].render(viewport.zoom, region),
+                self._get_pyramid(self.processed_image).render(processed_zoom, region)
+            )
+        
+        mode = self.overlay_mode_var.get()
+        divider_x = int(self.swipe_position * canvas.winfo_width())
+        composed = compositor.compose(mode, split=divider_x - x, opacity=self.overlay_opacity_var.get())
+        photo = ImageTk.PhotoImage(composed)
         
+        canvas.delete("all")
         canvas.create_image(x, y, anchor=tk.NW, image=photo)
+        if mode == OVERLAY_SWIPE:
+            canvas.create_line(divider_x, 0, divider_x, canvas.winfo_height(), fill="#ffffff", width=2)
         
         # Сохраняем ссылку на изображение
         canvas.image = photo
+    
+    def _request_render(self, canvas):
+        """Планирует перерисовку не чаще FRAME_INTERVAL_MS, объединяя частые события."""
+        if canvas in self._render_ids:
+            return
         
-        # Настраиваем скроллинг
-        canvas.configure(scrollregion=canvas.bbox("all"))
+        def render():
+            self._render_ids.pop(canvas, None)
+            self.render_view(canvas)
+        
+        self._render_ids[canvas] = canvas.after(FRAME_INTERVAL_MS, render)
+    
+    def _get_pyramid(self, image):
+        """Возвращает кэшированную пирамиду изображения."""
+        key = id(image)
+        cached = self._pyramids.get(key)
+        if cached is not None and cached[0] is image:
+            self._pyramids.move_to_end(key)
+            return cached[1]
+        
+        pyramid = ImagePyramid(image)
+        self._pyramids[key] = (image, pyramid)
+        if len(self._pyramids) > PYRAMID_CACHE_SIZE:
+            self._pyramids.popitem(last=False)
+        return pyramid
     
     def clear_canvas(self, canvas):
         """Очищает canvas."""
         canvas.delete("all")
         canvas.image = None
+        self._views.pop(canvas, None)
+        self._update_scrollbars(canvas)
+    
+    def _get_scrollbars(self, canvas):
+        """Возвращает пару (вертикальный, горизонтальный) скроллбаров canvas."""
+        if canvas is self.original_canvas:
+            return self.original_v_scroll, self.original_h_scroll
+        return self.processed_v_scroll, self.processed_h_scroll
+    
+    def _update_scrollbars(self, canvas):
+        """Синхронизирует скроллбары с видимой областью."""
+        v_scroll, h_scroll = self._get_scrollbars(canvas)
+        view = self._views.get(canvas)
+        if view is None:
+            v_scroll.set(0.0, 1.0)
+            h_scroll.set(0.0, 1.0)
+            return
+        
+        viewport = view['viewport']
+        display_width, display_height = viewport.display_size()
+        canvas_width = canvas.winfo_width()
+        canvas_height = canvas.winfo_height()
+        
+        first_x = max(0.0, viewport.offset_x / display_width)
+        first_y = max(0.0, viewport.offset_y / display_height)
+        h_scroll.set(first_x, min(1.0, first_x + canvas_width / display_width))
+        v_scroll.set(first_y, min(1.0, first_y + canvas_height / display_height))
+    
+    def on_scroll(self, canvas, axis, *args):
+        """Обрабатывает команды скроллбара ('moveto' и 'scroll')."""
+        view = self._views.get(canvas)
+        if view is None or not args:
+            return
+        
+        viewport = view['viewport']
+        display_width, display_height = viewport.display_size()
+        canvas_size = canvas.winfo_width() if axis == 'x' else canvas.winfo_height()
+        display_size = display_width if axis == 'x' else display_height
+        
+        if args[0] == 'moveto':
+            offset = float(args[1]) * display_size
+        elif args[0] == 'scroll':
+            step = canvas_size if args[2] == 'pages' else canvas_size / 10
+            current = viewport.offset_x if axis == 'x' else viewport.offset_y
+            offset = current + int(args[1]) * step
+        else:
+            return
+        
+        if axis == 'x':
+            viewport.offset_x = offset
+        else:
+            viewport.offset_y = offset
+        self.render_view(canvas)
+    
+    def zoom_canvas(self, canvas, event):
+        """Масштабирует изображение колесиком мыши относительно курсора."""
+        view = self._views.get(canvas)
+        if view is None:
+            return
+        
+        if getattr(event, 'num', None) == 5 or getattr(event, 'delta', 0) < 0:
+            factor = 1 / ZOOM_STEP
+        else:
+            factor = ZOOM_STEP
+        
+        view['viewport'].zoom_at(factor, event.x, event.y, canvas.winfo_width(), canvas.winfo_height())
+        self.render_view(canvas)
+    
+    def start_drag(self, canvas, event):
+        """Запоминает начальную точку перетаскивания или захватывает разделитель."""
+        view = self._views.get(canvas)
+        if view is None:
+            return
+        
+        view['drag'] = (event.x, event.y)
+        view['drag_divider'] = (
+            self._is_swipe_active(canvas)
+            and abs(event.x - self.swipe_position * canvas.winfo_width()) <= DIVIDER_GRAB_DISTANCE
+        )
+    
+    def _is_swipe_active(self, canvas):
+        """Проверяет, показан ли на canvas разделитель режима наложения."""
+        return (canvas is self.original_canvas and self.display_mode == "overlay"
+                and self.processed_image is not None and self.overlay_mode_var.get() == OVERLAY_SWIPE)
+    
+    def drag(self, canvas, event):
+        """Сдвигает видимую область вслед за курсором."""
+        view = self._views.get(canvas)
+        if view is None or view['drag'] is None:
+            return
+        
+        if view.get('drag_divider'):
+            # Разделитель перерисовывается из буферов экрана, без пересчета пирамиды
+            self.swipe_position = max(0.0, min(1.0, event.x / max(1, canvas.winfo_width())))
+            self._request_render(canvas)
+            return
+        
+        last_x, last_y = view['drag']
+        view['drag'] = (event.x, event.y)
+        view['viewport'].pan(event.x - last_x, event.y - last_y, canvas.winfo_width(), canvas.winfo_height())
+        self._request_render(canvas)
     
     def update_image_info(self):
         """Обновляет информацию об изображении."""
@@ -368,27 +610,27 @@ class ModernImageDisplay:
     
     def on_mousewheel_original(self, event):
         """Обрабатывает прокрутку колесика мыши для исходного изображения."""
-        self.original_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.zoom_canvas(self.original_canvas, event)
     
     def on_mousewheel_processed(self, event):
         """Обрабатывает прокрутку колесика мыши для обработанного изображения."""
-        self.processed_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        self.zoom_canvas(self.processed_canvas, event)
     
     def start_drag_original(self, event):
         """Начинает перетаскивание для исходного изображения."""
-        self.original_canvas.scan_mark(event.x, event.y)
+        self.start_drag(self.original_canvas, event)
     
     def drag_original(self, event):
         """Перетаскивает исходное изображение."""
-        self.original_canvas.scan_dragto(event.x, event.y, gain=1)
+        self.drag(self.original_canvas, event)
     
     def start_drag_processed(self, event):
         """Начинает перетаскивание для обработанного изображения."""
-        self.processed_canvas.scan_mark(event.x, event.y)
+        self.start_drag(self.processed_canvas, event)
     
     def drag_processed(self, event):
         """Перетаскивает обработанное изображение."""
-        self.processed_canvas.scan_dragto(event.x, event.y, gain=1)
+        self.drag(self.processed_canvas, event)
     
     def toggle_fullscreen(self):
         """Переключает полноэкранный режим."""
@@ -0,0 +1,90 @@
+"""
+Совмещение исходного и обработанного изображений для режима наложения.
+"""
+
+from typing import Any, Optional
+from PIL import Image, ImageChops
+
+# Режимы наложения
+OVERLAY_SWIPE = "swipe"
+OVERLAY_OPACITY = "opacity"
+OVERLAY_DIFFERENCE = "difference"
+
+
+class OverlayCompositor:
+    """
+    Совмещает видимые области двух изображений.
+
+    Работает только с буферами разрешения экрана, отрисованными из пирамид.
+    Буферы пересчитываются лишь при смене масштаба или видимой области,
+    поэтому перемещение разделителя и изменение прозрачности не обращаются
+    к массивам полного разрешения.
+    """
+
+    def __init__(self):
+        """Инициализация компоновщика."""
+        self.key: Optional[Any] = None
+        self.original: Optional[Image.Image] = None
+        self.processed: Optional[Image.Image] = None
+        self._difference: Optional[Image.Image] = None
+        self._blend: Optional[Image.Image] = None
+        self._blend_opacity: Optional[float] = None
+
+    def has_buffers(self, key: Any) -> bool:
+        """Проверяет, отрисованы ли буферы для ключа (масштаб, область, изображения)."""
+        return self.key == key and self.original is not None
+
+    def set_buffers(self, key: Any, original: Image.Image, processed: Image.Image):
+        """
+        Сохраняет буферы видимой области и сбрасывает производные кэши.
+
+        Args:
+            key: Ключ буферов
+            original: Видимая область исходного изображения
+            processed: Видимая область обработанного изображения
+        """
+        mode = 'RGBA' if 'A' in original.mode or 'A' in processed.mode else 'RGB'
+        if processed.size != original.size:
+            processed = processed.resize(original.size, Image.Resampling.BILINEAR)
+
+        self.key = key
+        self.original = original.convert(mode)
+        self.processed = processed.convert(mode)
+        self._difference = None
+        self._blend = None
+        self._blend_opacity = None
+
+    def compose(self, mode: str, split: int = 0, opacity: float = 0.5) -> Image.Image:
+        """
+        Совмещает буферы.
+
+        Args:
+            mode: Режим наложения (swipe, opacity, difference)
+            split: Позиция разделителя в пикселях буфера (для swipe)
+            opacity: Непрозрачность обработанного изображения 0-1 (для opacity)
+
+        Returns:
+            Image.Image: Совмещенное изображение
+        """
+        if mode == OVERLAY_SWIPE:
+            # Слева от разделителя - исходное изображение, справа - результат
+            split = max(0, min(int(split), self.original.size[0]))
+            composed = self.processed.copy()
+            if split > 0:
+                composed.paste(self.original.crop((0, 0, split, self.original.size[1])), (0, 0))
+            return composed
+
+        if mode == OVERLAY_OPACITY:
+            if self._blend is None or self._blend_opacity != opacity:
+                self._blend = Image.blend(self.original, self.processed, opacity)
+                self._blend_opacity = opacity
+            return self._blend
+
+        if mode == OVERLAY_DIFFERENCE:
+            if self._difference is None:
+                self._difference = ImageChops.difference(
+                    self.original.convert('RGB'), self.processed.convert('RGB')
+                )
+            return self._difference
+
+        raise ValueError(f"Неизвестный режим наложения: {mode}")
@@ -0,0 +1,240 @@
+"""
+Фоновая очередь расчета преобразований для GUI.
+
+Расчет выполняется в рабочем потоке, а результат возвращается в поток Tk
+через after(). Частые запросы объединяются: выполняется только последний.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+from constants import RENDER_DEBOUNCE_MS, RENDER_POLL_MS
+from image_processing.transforms.progress import ProgressContext, TransformCancelled
+
+logger = logging.getLogger(__name__)
+
+
+class RenderTask:
+    """Задача расчета, переданная в рабочий поток."""
+
+    def __init__(self, generation: int, render: Callable, on_done: Callable,
+                 on_error: Optional[Callable], owner: 'RenderQueue'):
+        """
+        Инициализация задачи.
+
+        Args:
+            generation: Номер поколения запроса
+            render: Функция расчета, принимающая задачу
+            on_done: Callback с результатом (вызывается в потоке Tk)
+            on_error: Callback с исключением (вызывается в потоке Tk)
+            owner: Очередь, создавшая задачу
+        """
+        self.generation = generation
+        self.render = render
+        self.on_done = on_done
+        self.on_error = on_error
+        self.progress = 0.0
+        self.eta: Optional[float] = None
+        self._owner = owner
+
+    def is_cancelled(self) -> bool:
+        """Проверяет, устарела ли задача."""
+        return self._owner.generation != self.generation
+
+    def check_cancelled(self):
+        """Прерывает расчет, если задача устарела."""
+        if self.is_cancelled():
+            raise TransformCancelled()
+
+    def set_progress(self, progress: float, eta: Optional[float] = None):
+        """
+        Сохраняет прогресс расчета.
+
+        Args:
+            progress: Доля выполненной работы (0-1)
+            eta: Оценка оставшегося времени в секундах
+        """
+        self.progress = max(0.0, min(1.0, progress))
+        self.eta = eta
+
+    def progress_context(self) -> ProgressContext:
+        """Создает контекст прогресса для преобразования, связанный с задачей."""
+        return ProgressContext(on_progress=self.set_progress, is_cancelled=self.is_cancelled)
+
+
+class RenderQueue:
+    """Очередь фонового расчета с объединением запросов."""
+
+    def __init__(self, widget, debounce_ms: int = RENDER_DEBOUNCE_MS,
+                 poll_ms: int = RENDER_POLL_MS, spinner=None, progress_bar=None):
+        """
+        Инициализация очереди.
+
+        Args:
+            widget: Виджет Tk для планирования через after()
+            debounce_ms: Пауза перед запуском расчета в миллисекундах
+            poll_ms: Период опроса результатов в миллисекундах
+            spinner: LoadingSpinner, показываемый во время расчета
+            progress_bar: ProgressBar для отображения прогресса
+        """
+        self.widget = widget
+        self.debounce_ms = debounce_ms
+        self.poll_ms = poll_ms
+        self.spinner = spinner
+        self.progress_bar = progress_bar
+
+        self.generation = 0
+        self._pending_task: Optional[RenderTask] = None
+        self._current_task: Optional[RenderTask] = None
+        self._slot: Optional[RenderTask] = None
+        self._debounce_id = None
+        self._poll_id = None
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._results = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._shutdown = False
+
+    def submit(self, render: Callable[[RenderTask], Any], on_done: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None, debounce: bool = True):
+        """
+        Ставит расчет в очередь, заменяя все ранее поставленные.
+
+        Args:
+            render: Функция расчета (выполняется в рабочем потоке)
+            on_done: Callback с результатом (выполняется в потоке Tk)
+            on_error: Callback с исключением (выполняется в потоке Tk)
+            debounce: Ждать паузу в запросах перед запуском
+        """
+        self.generation += 1
+        task = RenderTask(self.generation, render, on_done, on_error, self)
+
+        if self._debounce_id is not None:
+            self.widget.after_cancel(self._debounce_id)
+            self._debounce_id = None
+
+        self._start_indicators()
+
+        if debounce and self.debounce_ms > 0:
+            self._pending_task = task
+            self._debounce_id = self.widget.after(self.debounce_ms, self._dispatch_pending)
+        else:
+            self._pending_task = None
+            self._dispatch(task)
+
+    def cancel(self):
+        """Отменяет ожидающий и выполняющийся расчет."""
+        self.generation += 1
+        if self._debounce_id is not None:
+            self.widget.after_cancel(self._debounce_id)
+            self._debounce_id = None
+        self._pending_task = None
+        self._current_task = None
+        with self._lock:
+            self._slot = None
+        self._stop_indicators()
+
+    def is_busy(self) -> bool:
+        """Проверяет, есть ли ожидающий или выполняющийся расчет."""
+        return self._pending_task is not None or self._current_task is not None
+
+    def shutdown(self):
+        """Останавливает рабочий поток."""
+        self.cancel()
+        self._shutdown = True
+        self._wakeup.set()
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+
+    def _dispatch_pending(self):
+        """Передает отложенную задачу в рабочий поток."""
+        self._debounce_id = None
+        task = self._pending_task
+        self._pending_task = None
+        if task is not None and not task.is_cancelled():
+            self._dispatch(task)
+
+    def _dispatch(self, task: RenderTask):
+        """Передает задачу в рабочий поток, вытесняя невыполненную."""
+        self._current_task = task
+        with self._lock:
+            self._slot = task
+        self._ensure_worker()
+        self._wakeup.set()
+
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def _ensure_worker(self):
+        """Запускает рабочий поток при первом обращении."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._worker_loop, name="RenderQueue", daemon=True)
+            self._worker.start()
+
+    def _worker_loop(self):
+        """Цикл рабочего потока: выполняет только последнюю задачу."""
+        while not self._shutdown:
+            self._wakeup.wait()
+            with self._lock:
+                task = self._slot
+                self._slot = None
+                self._wakeup.clear()
+
+            if task is None or task.is_cancelled():
+                continue
+
+            try:
+                result = task.render(task)
+                self._results.put((task, result, None))
+            except TransformCancelled:
+                logger.debug("Расчет поколения %d отменен", task.generation)
+            except Exception as e:
+                self._results.put((task, None, e))
+
+    def _poll(self):
+        """Забирает готовые результаты в потоке Tk."""
+        self._poll_id = None
+
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            # Устаревшие результаты отбрасываются
+            if task is not self._current_task or task.is_cancelled():
+                continue
+
+            self._current_task = None
+            if error is None:
+                task.on_done(result)
+            elif task.on_error:
+                task.on_error(error)
+            else:
+                logger.error("Ошибка фонового расчета: %s", error)
+
+        if self._current_task is not None and self.progress_bar:
+            self.progress_bar.set_progress(self._current_task.progress * 100, self._current_task.eta)
+
+        if self.is_busy():
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+        else:
+            self._stop_indicators()
+
+    def _start_indicators(self):
+        """Показывает индикаторы выполнения."""
+        if self.spinner:
+            self.spinner.start()
+        if self.progress_bar:
+            self.progress_bar.set_progress(0)
+
+    def _stop_indicators(self):
+        """Скрывает индикаторы выполнения."""
+        if self.spinner:
+            self.spinner.stop()
+        if self.progress_bar:
+            self.progress_bar.set_progress(0)
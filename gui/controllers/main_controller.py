@@ -4,7 +4,7 @@
 
 import tkinter as tk
 from tkinter import messagebox
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import logging
 
 from image_processing.interfaces.image_processor_interface import ImageProcessorInterface
@@ -16,16 +16,19 @@ logger = logging.getLogger(__name__)
 class MainController:
     """Главный контроллер приложения."""
     
-    def __init__(self, image_processor: ImageProcessorInterface, validator: ParameterValidator):
+    def __init__(self, image_processor: ImageProcessorInterface, validator: ParameterValidator,
+                 render_queue=None):
         """
         Инициализация контроллера.
         
         Args:
             image_processor: Процессор изображений
             validator: Валидатор параметров
+            render_queue: Очередь фонового расчета (RenderQueue); без нее расчет синхронный
         """
         self.image_processor = image_processor
         self.validator = validator
+        self.render_queue = render_queue
         
         # Callbacks для обновления UI
         self.on_status_update: Optional[callable] = None
@@ -45,6 +48,15 @@ class MainController:
         self.on_image_display_update = on_image_display_update
         self.on_info_update = on_info_update
     
+    def set_render_queue(self, render_queue):
+        """
+        Устанавливает очередь фонового расчета преобразований.
+        
+        Args:
+            render_queue: Очередь RenderQueue или None для синхронного расчета
+        """
+        self.render_queue = render_queue
+    
     def load_image(self, file_path: str) -> bool:
         """
         Загружает изображение.
@@ -55,6 +67,7 @@ class MainController:
         Returns:
             bool: True если изображение успешно загружено
         """
+        self._cancel_render()
         self._update_status("Загрузка изображения...")
         
         if self.image_processor.load_image(file_path):
@@ -95,11 +108,16 @@ class MainController:
         """
         Применяет преобразование с заданными параметрами.
         
+        При наличии очереди расчет выполняется в фоне без изменения состояния
+        процессора, а результат сохраняется в потоке Tk после завершения
+        расчета. Очередь передает результат, только если задача не отменена
+        и не вытеснена более новой (сброс, загрузка, новое преобразование).
+        
         Args:
             parameters: Словарь с параметрами преобразования
             
         Returns:
-            bool: True если преобразование успешно применено
+            bool: True если преобразование успешно применено или поставлено в очередь
         """
         if not self.image_processor.image_manager.has_original_image():
             messagebox.showwarning("Предупреждение", "Сначала загрузите изображение")
@@ -108,87 +126,110 @@ class MainController:
         transform_type = parameters.get('transform_type')
         self._update_status(f"Применение {transform_type.lower()} преобразования...")
         
+        transform_call = self._get_transform_call(parameters)
+        if transform_call is None:
+            return self._finish_transform(transform_type, False)
+        transform_name, kwargs = transform_call
+        
+        if self.render_queue is not None:
+            self.render_queue.submit(
+                lambda task: self.image_processor.render_transform(
+                    transform_name, task.progress_context(), **kwargs
+                ),
+                lambda result: self._commit_transform(transform_type, result),
+                self._fail_transform,
+                debounce=False
+            )
+            return True
+        
         try:
-            success = False
-            
-            if transform_type == "Логарифмическое":
-                success = self._apply_logarithmic_transform(parameters)
-            elif transform_type == "Степенное":
-                success = self._apply_power_transform(parameters)
-            elif transform_type == "Бинарное":
-                success = self._apply_binary_transform(parameters)
-            elif transform_type == "Вырезание диапазона яркостей":
-                success = self._apply_brightness_range_transform(parameters)
-            elif transform_type in ["Прямоугольный фильтр 3x3", "Прямоугольный фильтр 5x5", 
-                                  "Медианный фильтр 3x3", "Медианный фильтр 5x5"]:
-                success = self._apply_smoothing_filter(parameters)
-            
-            if success:
-                self._update_image_display()
-                self._update_info()
-                self._update_status(f"{transform_type} преобразование применено")
-            else:
-                self._update_status("Ошибка применения преобразования")
-                messagebox.showerror("Ошибка", "Не удалось применить преобразование")
-            
-            return success
-            
-        except ValueError as e:
-            self._update_status("Ошибка валидации параметров")
-            messagebox.showerror("Ошибка", str(e))
-            return False
+            result = self.image_processor.render_transform(transform_name, **kwargs)
         except Exception as e:
-            logger.error(f"Ошибка при применении преобразования: {e}")
-            self._update_status("Ошибка применения преобразования")
-            messagebox.showerror("Ошибка", f"Произошла ошибка при применении преобразования: {e}")
+            self._fail_transform(e)
             return False
-    
-    def _apply_logarithmic_transform(self, parameters: Dict[str, Any]) -> bool:
-        """Применяет логарифмическое преобразование."""
-        mode = parameters.get('mode', 'Автоматически')
-        c = parameters.get('c') if mode == "Вручную" else None
-        
-        return self.image_processor.apply_logarithmic_transform(c)
-    
-    def _apply_power_transform(self, parameters: Dict[str, Any]) -> bool:
-        """Применяет степенное преобразование."""
-        mode = parameters.get('mode', 'Автоматически')
-        gamma = parameters.get('gamma', 1.0) if mode == "Вручную" else 1.0
-        c = parameters.get('c') if mode == "Вручную" else None
-        
-        return self.image_processor.apply_power_transform(gamma, c)
-    
-    def _apply_binary_transform(self, parameters: Dict[str, Any]) -> bool:
-        """Применяет бинарное преобразование."""
-        threshold = parameters.get('threshold', 128)
         
-        return self.image_processor.apply_binary_transform(threshold)
+        return self._commit_transform(transform_type, result)
     
-    def _apply_brightness_range_transform(self, parameters: Dict[str, Any]) -> bool:
-        """Применяет вырезание диапазона яркостей."""
-        min_brightness = parameters.get('min_brightness', 0)
-        max_brightness = parameters.get('max_brightness', 255)
-        outside_mode = parameters.get('outside_mode', 'Исходное')
-        constant_value = parameters.get('constant_value')
+    def _get_transform_call(self, parameters: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Сопоставляет параметры интерфейса с названием и параметрами преобразования.
         
-        return self.image_processor.apply_brightness_range_transform(
-            min_brightness, max_brightness, outside_mode, constant_value
-        )
-    
-    def _apply_smoothing_filter(self, parameters: Dict[str, Any]) -> bool:
-        """Применяет фильтр сглаживания."""
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: Название и параметры или None для неизвестного типа
+        """
         transform_type = parameters.get('transform_type')
-        kernel_size = parameters.get('kernel_size', 3)
         
-        # Используем фабрику для создания фильтра
-        from image_processing.factories.transform_factory import TransformFactory
+        if transform_type == "Логарифмическое":
+            return transform_type, self._get_logarithmic_parameters(parameters)
+        elif transform_type == "Степенное":
+            return transform_type, self._get_power_parameters(parameters)
+        elif transform_type == "Бинарное":
+            return transform_type, {'threshold': parameters.get('threshold', 128)}
+        elif transform_type == "Вырезание диапазона яркостей":
+            return transform_type, self._get_brightness_range_parameters(parameters)
+        elif transform_type in ["Прямоугольный фильтр 3x3", "Прямоугольный фильтр 5x5", 
+                              "Медианный фильтр 3x3", "Медианный фильтр 5x5"]:
+            return transform_type, {'kernel_size': parameters.get('kernel_size', 3)}
         
+        return None
+    
+    def _commit_transform(self, transform_type: str, result) -> bool:
+        """Сохраняет рассчитанный результат и обновляет интерфейс (вызывается в потоке Tk)."""
         try:
-            filter_transform = TransformFactory.create_transform(transform_type)
-            return self.image_processor.apply_custom_transform(filter_transform, kernel_size=kernel_size)
+            self.image_processor.commit_transform(result)
         except Exception as e:
-            logger.error(f"Ошибка при применении фильтра сглаживания: {e}")
+            self._fail_transform(e)
             return False
+        return self._finish_transform(transform_type, True)
+    
+    def _finish_transform(self, transform_type: str, success: bool) -> bool:
+        """Обновляет интерфейс по результату преобразования."""
+        if success:
+            self._update_image_display()
+            self._update_info()
+            self._update_status(f"{transform_type} преобразование применено")
+        else:
+            self._update_status("Ошибка применения преобразования")
+            messagebox.showerror("Ошибка", "Не удалось применить преобразование")
+        
+        return success
+    
+    def _fail_transform(self, error: Exception):
+        """Сообщает об ошибке преобразования."""
+        if isinstance(error, ValueError):
+            self._update_status("Ошибка валидации параметров")
+            messagebox.showerror("Ошибка", str(error))
+        else:
+            logger.error(f"Ошибка при применении преобразования: {error}")
+            self._update_status("Ошибка применения преобразования")
+            messagebox.showerror("Ошибка", f"Произошла ошибка при применении преобразования: {error}")
+    
+    def _cancel_render(self):
+        """Отменяет фоновый расчет, результат которого больше не нужен."""
+        if self.render_queue is not None:
+            self.render_queue.cancel()
+    
+    def _get_logarithmic_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Параметры логарифмического преобразования."""
+        mode = parameters.get('mode', 'Автоматически')
+        return {'c': parameters.get('c') if mode == "Вручную" else None}
+    
+    def _get_power_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Параметры степенного преобразования."""
+        mode = parameters.get('mode', 'Автоматически')
+        return {
+            'gamma': parameters.get('gamma', 1.0) if mode == "Вручную" else 1.0,
+            'c': parameters.get('c') if mode == "Вручную" else None
+        }
+    
+    def _get_brightness_range_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Параметры вырезания диапазона яркостей."""
+        return {
+            'min_brightness': parameters.get('min_brightness', 0),
+            'max_brightness': parameters.get('max_brightness', 255),
+            'outside_mode': parameters.get('outside_mode', 'Исходное'),
+            'constant_value': parameters.get('constant_value')
+        }
     
     def get_image_for_display(self, image_type: str = "original"):
         """
@@ -236,6 +277,7 @@ class MainController:
             messagebox.showwarning("Предупреждение", "Нет изображения для сброса")
             return False
         
+        self._cancel_render()
         self._update_status("Сброс изображения...")
         
         # Сбрасываем обработанное изображение
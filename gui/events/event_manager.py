@@ -4,17 +4,21 @@
 """
 
 import tkinter as tk
-from constants import TRANSFORM_DESCRIPTIONS
+from constants import TRANSFORM_DESCRIPTIONS, PREVIEW_IDLE_DELAY_MS
+from image_processing.rendering import render_transform
 
 
 class EventManager:
     """Менеджер событий для обработки взаимодействий с интерфейсом."""
     
-    def __init__(self, parameter_manager, image_manager, quality_manager, update_info_callback):
+    def __init__(self, parameter_manager, image_manager, quality_manager, update_info_callback,
+                 render_queue=None):
         self.parameter_manager = parameter_manager
         self.image_manager = image_manager
         self.quality_manager = quality_manager
         self.update_info_callback = update_info_callback
+        self.render_queue = render_queue
+        self._idle_render_id = None
     
     def on_transform_change(self, transform_type, desc_text):
         """Обрабатывает изменение типа преобразования."""
@@ -29,6 +33,7 @@ class EventManager:
     
     def on_load_image(self, canvas):
         """Обрабатывает загрузку изображения."""
+        self._cancel_render()
         success, message = self.image_manager.load_image()
         
         if success:
@@ -54,6 +59,7 @@ class EventManager:
     
     def on_reset_image(self, canvas):
         """Обрабатывает сброс изображения."""
+        self._cancel_render()
         success, message = self.image_manager.reset_image()
         
         if success:
@@ -66,32 +72,127 @@ class EventManager:
         
         return success, message
     
-    def on_apply_transform(self, transform_type, canvas):
-        """Обрабатывает применение преобразования."""
+    def on_apply_transform(self, transform_type, canvas, on_complete=None):
+        """
+        Обрабатывает применение преобразования.
+        
+        При наличии очереди расчет выполняется в фоне, а on_complete(success, message)
+        вызывается в потоке Tk после его завершения.
+        """
         try:
             # Получаем параметры преобразования
             params = self.parameter_manager.get_parameters(transform_type)
             
+            if self.render_queue is not None and self.image_manager.original_image:
+                self._submit_render(transform_type, params, canvas, on_complete)
+                return True, f"Применение {transform_type.lower()} преобразования..."
+            
             # Применяем преобразование
             success, message = self.image_manager.apply_transform(transform_type, params)
             
             if success:
-                canvas.display_image(self.image_manager.processed_image)
-                
-                # Обновляем информацию о примененных параметрах
-                param_info = self.parameter_manager.format_parameters_info(params)
-                self.update_info_callback(f"Применено преобразование: {transform_type}\n{param_info}")
+                self._show_applied(transform_type, params, canvas)
             else:
-                from gui.windows.window_manager import WindowManager
-                window_manager = WindowManager(None)
-                window_manager.show_error("Ошибка", message)
+                self._show_error(message)
             
+            if on_complete:
+                on_complete(success, message)
             return success, message
         except Exception as e:
-            from gui.windows.window_manager import WindowManager
-            window_manager = WindowManager(None)
-            window_manager.show_error("Ошибка", f"Не удалось применить преобразование: {e}")
+            self._show_error(f"Не удалось применить преобразование: {e}")
+            return False, str(e)
+    
+    def _submit_render(self, transform_type, params, canvas, on_complete=None, debounce=False):
+        """
+        Ставит расчет в полном разрешении в фоновую очередь.
+        
+        При debounce расчет запускается после паузы в запросах: частые
+        изменения параметров объединяются в один расчет.
+        """
+        source_image = self.image_manager.original_image
+        # Декодируем файл в потоке Tk: PIL не допускает параллельной загрузки
+        source_image.load()
+        
+        def render(task):
+            return render_transform(source_image, transform_type, params, task.progress_context())
+        
+        def on_done(processed_image):
+            success, message = self.image_manager.set_processed_image(processed_image, transform_type)
+            self._show_applied(transform_type, params, canvas)
+            if on_complete:
+                on_complete(success, message)
+        
+        def on_error(error):
+            message = f"Не удалось применить преобразование: {error}"
+            self._show_error(message)
+            if on_complete:
+                on_complete(False, message)
+        
+        self.render_queue.submit(render, on_done, on_error, debounce=debounce)
+    
+    def _show_applied(self, transform_type, params, canvas):
+        """Отображает результат и примененные параметры."""
+        canvas.display_image(self.image_manager.processed_image)
+        
+        # Обновляем информацию о примененных параметрах
+        param_info = self.parameter_manager.format_parameters_info(params)
+        self.update_info_callback(f"Применено преобразование: {transform_type}\n{param_info}")
+    
+    def _show_error(self, message):
+        """Показывает сообщение об ошибке."""
+        from gui.windows.window_manager import WindowManager
+        window_manager = WindowManager(None)
+        window_manager.show_error("Ошибка", message)
+    
+    def _cancel_render(self):
+        """Отменяет фоновый расчет, результат которого больше не нужен."""
+        if self.render_queue is not None:
+            self.render_queue.cancel()
+    
+    def on_preview_transform(self, transform_type, canvas):
+        """
+        Обрабатывает изменение параметров: строит предпросмотр в разрешении экрана.
+        
+        Расчет в полном разрешении откладывается до паузы в изменениях:
+        при наличии очереди его объединяет сама очередь, иначе - таймер простоя.
+        """
+        if not self.image_manager.original_image:
+            return False, "Сначала загрузите изображение"
+        
+        try:
+            params = self.parameter_manager.get_parameters(transform_type)
+        except ValueError as e:
+            # Параметры еще вводятся пользователем
             return False, str(e)
+        
+        # Фоновый расчет со старыми параметрами больше не нужен
+        self._cancel_render()
+        
+        success, message = self.image_manager.preview_transform(transform_type, params)
+        if success:
+            canvas.display_image(self.image_manager.preview_image)
+            if self.render_queue is not None:
+                self._submit_render(transform_type, params, canvas, debounce=True)
+            else:
+                self._schedule_idle_render(canvas)
+        
+        return success, message
+    
+    def _schedule_idle_render(self, canvas):
+        """Планирует расчет в полном разрешении после паузы в изменениях."""
+        if self._idle_render_id is not None:
+            canvas.canvas.after_cancel(self._idle_render_id)
+        self._idle_render_id = canvas.canvas.after(PREVIEW_IDLE_DELAY_MS, lambda: self._on_idle_render(canvas))
+    
+    def _on_idle_render(self, canvas):
+        """Выполняет отложенный расчет в полном разрешении."""
+        self._idle_render_id = None
+        if not self.image_manager.pending_transform:
+            return
+        
+        success, message = self.image_manager.render_pending()
+        if success:
+            canvas.display_image(self.image_manager.processed_image)
     
     def on_analyze_quality(self):
         """Обрабатывает анализ качества."""
@@ -6,7 +6,7 @@
 import tkinter as tk
 from tkinter import ttk
 
-from constants import MESSAGES
+from constants import MESSAGES, PREVIEW_IDLE_DELAY_MS
 from gui.components.ui_factory import UIFactory
 from gui.components.base_components import BaseCanvas, BaseInfoPanel
 from gui.styles.style_manager import StyleManager
@@ -15,6 +15,8 @@ from gui.parameters.parameter_manager import ParameterManager
 from gui.quality.quality_manager import QualityManager
 from gui.image.image_manager import ImageManager
 from gui.events.event_manager import EventManager
+from gui.components.animations import LoadingSpinner, ProgressBar
+from gui.components.render_queue import RenderQueue
 
 
 class FinalMainWindow:
@@ -73,13 +75,22 @@ class FinalMainWindow:
         
         # Менеджер качества уже создан в create_interface
         
+        # Очередь фонового расчета преобразований: расчет в полном разрешении
+        # после изменения параметров запускается по паузе в изменениях
+        self.render_queue = RenderQueue(self.root, debounce_ms=PREVIEW_IDLE_DELAY_MS,
+                                        spinner=self.spinner, progress_bar=self.progress_bar)
+        
         # Создаем менеджер событий
         self.event_manager = EventManager(
             self.parameter_manager,
             self.image_manager,
             self.quality_manager,
-            self.update_info
+            self.update_info,
+            render_queue=self.render_queue
         )
+        
+        # Предпросмотр в разрешении экрана при изменении параметров
+        self.parameter_manager.set_change_callback(self.preview_transform)
     
     def create_quality_panel(self, parent):
         """Создает панель оценки качества."""
@@ -184,10 +195,19 @@ class FinalMainWindow:
         self.info_panel.pack(fill=tk.X)
         self.info_panel.update_info(f"Информация об изображении:\n{MESSAGES['no_image']}")
         
-        # Статус бар
+        # Статус бар с индикаторами фонового расчета
+        status_frame = ttk.Frame(parent, style='Modern.TFrame')
+        status_frame.pack(fill=tk.X, pady=(10, 0), padx=20)
+        
         self.status_var = tk.StringVar(value=MESSAGES['ready'])
-        status_bar = ttk.Label(parent, textvariable=self.status_var, style='Status.TLabel')
-        status_bar.pack(fill=tk.X, pady=(10, 0), padx=20)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, style='Status.TLabel')
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.progress_bar = ProgressBar(status_frame, width=160, height=16)
+        self.progress_bar.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        self.spinner = LoadingSpinner(status_frame, size=20)
+        self.spinner.canvas.pack(side=tk.RIGHT)
     
     def load_image(self):
         """Загружает изображение."""
@@ -218,12 +238,24 @@ class FinalMainWindow:
         transform_type = self.transform_combo.get()
         self.status_var.set(f"Применение {transform_type.lower()} преобразования...")
         
-        success, message = self.event_manager.on_apply_transform(transform_type, self.processed_canvas)
+        success, message = self.event_manager.on_apply_transform(
+            transform_type, self.processed_canvas, on_complete=self.on_transform_complete
+        )
+        if not success:
+            self.status_var.set("Ошибка применения преобразования")
+    
+    def on_transform_complete(self, success, message):
+        """Обновляет статус после завершения фонового расчета."""
         if success:
             self.status_var.set(message)
         else:
             self.status_var.set("Ошибка применения преобразования")
     
+    def preview_transform(self):
+        """Строит предпросмотр преобразования с текущими параметрами."""
+        transform_type = self.transform_combo.get()
+        self.event_manager.on_preview_transform(transform_type, self.processed_canvas)
+    
     def on_transform_change(self, event=None):
         """Обрабатывает изменение типа преобразования."""
         transform_type = self.transform_combo.get()
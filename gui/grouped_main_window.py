@@ -18,7 +18,10 @@ from .components.smoothing_settings import SmoothingSettings
 from .components.sharpness_settings import SharpnessSettings
 from .components.modern_image_display import ModernImageDisplay
 from .components.modern_info_panel import ModernInfoPanel
+from .components.animations import LoadingSpinner, ProgressBar
+from .components.render_queue import RenderQueue
 from .styles.modern_styles import ModernStyles
+from image_processing.rendering import render_transform
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +37,7 @@ class GroupedMainWindow:
         self.setup_window()
         self.setup_styles()
         self.create_interface()
+        self.render_queue = RenderQueue(self.root, spinner=self.spinner, progress_bar=self.progress_bar)
         
     def setup_window(self):
         """Настройка главного окна."""
@@ -261,10 +265,19 @@ class GroupedMainWindow:
         self.info_text.pack(fill=tk.X)
         self.info_text.insert(1.0, "Информация об изображении:\nИзображение не загружено")
         
-        # Статус бар
+        # Статус бар с индикаторами фонового расчета
+        status_frame = ttk.Frame(parent, style='Modern.TFrame')
+        status_frame.pack(fill=tk.X, pady=(10, 0), padx=20)
+        
         self.status_var = tk.StringVar(value="Готов к работе")
-        status_bar = ttk.Label(parent, textvariable=self.status_var, style='Status.TLabel')
-        status_bar.pack(fill=tk.X, pady=(10, 0), padx=20)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, style='Status.TLabel')
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.progress_bar = ProgressBar(status_frame, width=160, height=16)
+        self.progress_bar.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        self.spinner = LoadingSpinner(status_frame, size=20)
+        self.spinner.canvas.pack(side=tk.RIGHT)
     
     def load_image(self):
         """Загружает изображение."""
@@ -281,6 +294,7 @@ class GroupedMainWindow:
         )
         
         if file_path:
+            self.render_queue.cancel()
             try:
                 self.original_image = Image.open(file_path)
                 self.display_original_image()
@@ -347,34 +361,27 @@ class GroupedMainWindow:
         transform_type = parameters['transform_type']
         self.status_var.set(f"Применение {transform_type.lower()}...")
         
-        try:
-            # Применяем преобразование с помощью фабрики
-            from image_processing.factories.transform_factory import TransformFactory
-            
-            # Создаем преобразование
-            transform = TransformFactory.create_transform(transform_type)
-            
-            # Конвертируем изображение в numpy array
-            import numpy as np
-            image_array = np.array(self.original_image)
-            
-            # Применяем преобразование
-            processed_array = transform.apply(image_array, **parameters)
-            
-            # Конвертируем обратно в PIL Image
-            if len(processed_array.shape) == 3:
-                self.processed_image = Image.fromarray(processed_array)
-            else:
-                self.processed_image = Image.fromarray(processed_array, mode='L')
-            
+        # Декодируем файл в потоке Tk: PIL не допускает параллельной загрузки
+        source_image = self.original_image
+        source_image.load()
+        
+        def on_done(processed_image):
+            self.processed_image = processed_image
             self.display_processed_image()
             
             # Обновляем информацию
             self.update_info(f"Применено преобразование: {transform_type}")
             self.status_var.set(f"{transform_type} применено")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось применить преобразование: {e}")
+        
+        def on_error(error):
+            messagebox.showerror("Ошибка", f"Не удалось применить преобразование: {error}")
             self.status_var.set("Ошибка применения преобразования")
+        
+        # Расчет выполняется в фоне, результат возвращается через after()
+        self.render_queue.submit(
+            lambda task: render_transform(source_image, transform_type, parameters, task.progress_context()),
+            on_done, on_error, debounce=False
+        )
     
     def display_processed_image(self):
         """Отображает обработанное изображение."""
@@ -424,6 +431,7 @@ class GroupedMainWindow:
             messagebox.showwarning("Предупреждение", "Нет изображения для сброса")
             return
         
+        self.render_queue.cancel()
         self.processed_image = None
         self.processed_canvas.delete("all")
         self.processed_canvas.create_text(200, 150, text="Примените преобразование\nдля просмотра результата", 
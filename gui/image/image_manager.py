@@ -5,22 +5,35 @@
 
 import tkinter as tk
 from tkinter import filedialog
-from PIL import Image
-import numpy as np
+from PIL import Image, ImageTk
 import os
 
-from constants import FILE_TYPES, DISPLAY_IMAGE_SIZE
+from constants import FILE_TYPES, DISPLAY_IMAGE_SIZE, PREVIEW_IMAGE_SIZE
 from gui.components.base_components import BaseCanvas
 from gui.windows.window_manager import WindowManager
+from image_processing.rendering import render_transform
+from image_processing.palette import image_to_array
+from image_processing.channels import is_gray_rgb, collapse_gray
 
 
 class ImageManager:
-    """Менеджер изображений для обработки и отображения."""
+    """
+    Менеджер изображений для обработки и отображения.
+    
+    Как и image_processing.image_manager.ImageManager, хранит изображение
+    в оттенках серого, сохраненное как RGB или RGBA (R = G = B), одним
+    цветовым каналом (L или LA) и сохраняет результат снова в RGB или RGBA.
+    """
     
     def __init__(self, window_manager):
         self.window_manager = window_manager
+        # Число каналов исходного файла, если изображение сведено к одному цветовому каналу
+        self.collapsed_channels = None
         self.original_image = None
         self.processed_image = None
+        self.preview_image = None
+        self.pending_transform = None
+        self._preview_source = None
     
     def load_image(self):
         """Загружает изображение из файла."""
@@ -31,7 +44,11 @@ class ImageManager:
         
         if file_path:
             try:
-                self.original_image = Image.open(file_path)
+                self.original_image = self._collapse_gray(Image.open(file_path))
+                self.processed_image = None
+                self.preview_image = None
+                self.pending_transform = None
+                self._preview_source = None
                 return True, f"Изображение загружено: {os.path.basename(file_path)}"
             except Exception as e:
                 return False, f"Не удалось загрузить изображение: {e}"
@@ -40,6 +57,12 @@ class ImageManager:
     
     def save_image(self):
         """Сохраняет обработанное изображение."""
+        # Перед сохранением досчитываем отложенное преобразование
+        if self.pending_transform:
+            success, message = self.render_pending()
+            if not success:
+                return False, message
+        
         if not self.processed_image:
             return False, "Нет обработанного изображения для сохранения"
         
@@ -51,19 +74,43 @@ class ImageManager:
         
         if file_path:
             try:
-                self.processed_image.save(file_path)
+                self._image_for_saving().save(file_path)
                 return True, f"Изображение сохранено: {os.path.basename(file_path)}"
             except Exception as e:
                 return False, f"Не удалось сохранить изображение: {e}"
         
         return False, "Файл не выбран"
     
+    def _collapse_gray(self, image):
+        """Сводит изображение с одинаковыми каналами R, G, B к режиму L или LA."""
+        self.collapsed_channels = None
+        # Изображения с палитрой не сводятся: поточечные преобразования меняют только палитру
+        if image.mode not in ('RGB', 'RGBA'):
+            return image
+        
+        image_array = image_to_array(image)
+        if not is_gray_rgb(image_array):
+            return image
+        
+        self.collapsed_channels = image_array.shape[2]
+        return Image.fromarray(collapse_gray(image_array))
+    
+    def _image_for_saving(self):
+        """Обработанное изображение в числе каналов исходного файла."""
+        image = self.processed_image
+        if self.collapsed_channels is not None and image.mode in ('L', 'LA'):
+            # Изображение хранилось одним каналом - восстанавливаем RGB или RGBA
+            return image.convert('RGBA' if image.mode == 'LA' else 'RGB')
+        return image
+    
     def reset_image(self):
         """Сбрасывает обработанное изображение."""
         if not self.original_image:
             return False, "Нет изображения для сброса"
         
         self.processed_image = None
+        self.preview_image = None
+        self.pending_transform = None
         return True, "Изображение сброшено к исходному состоянию"
     
     def apply_transform(self, transform_type, params):
@@ -72,27 +119,62 @@ class ImageManager:
             return False, "Сначала загрузите изображение"
         
         try:
-            # Применяем преобразование с помощью фабрики
+            processed_image = render_transform(self.original_image, transform_type, params)
+            return self.set_processed_image(processed_image, transform_type)
+        except Exception as e:
+            return False, f"Не удалось применить преобразование: {e}"
+    
+    def set_processed_image(self, processed_image, transform_type):
+        """Сохраняет результат преобразования, рассчитанный render_transform (вызывается в потоке Tk)."""
+        self.processed_image = processed_image
+        self.preview_image = None
+        self.pending_transform = None
+        return True, f"{transform_type} преобразование применено"
+    
+    def preview_transform(self, transform_type, params):
+        """
+        Применяет преобразование к копии изображения в разрешении экрана.
+        
+        Преобразование полного разрешения откладывается до render_pending.
+        """
+        if not self.original_image:
+            return False, "Сначала загрузите изображение"
+        
+        try:
             from image_processing.factories.transform_factory import TransformFactory
             
-            # Создаем преобразование
             transform = TransformFactory.create_transform(transform_type)
+            proxy_array, scale = self._get_preview_source()
             
-            # Конвертируем изображение в numpy array
-            image_array = np.array(self.original_image)
+            preview_array = transform.apply_preview(proxy_array, scale, **params)
+            self.preview_image = Image.fromarray(preview_array)
+            self.pending_transform = (transform_type, dict(params))
             
-            # Применяем преобразование
-            processed_array = transform.apply(image_array, **params)
-            
-            # Конвертируем обратно в PIL Image
-            if len(processed_array.shape) == 3:
-                self.processed_image = Image.fromarray(processed_array)
-            else:
-                self.processed_image = Image.fromarray(processed_array, mode='L')
-            
-            return True, f"{transform_type} преобразование применено"
+            return True, f"Предпросмотр: {transform_type}"
         except Exception as e:
-            return False, f"Не удалось применить преобразование: {e}"
+            return False, f"Не удалось построить предпросмотр: {e}"
+    
+    def render_pending(self):
+        """Применяет отложенное преобразование в полном разрешении."""
+        if not self.pending_transform:
+            return True, "Нет отложенного преобразования"
+        
+        transform_type, params = self.pending_transform
+        return self.apply_transform(transform_type, params)
+    
+    def _get_preview_source(self):
+        """Возвращает кэшированную копию исходного изображения и ее масштаб."""
+        from image_processing.palette import image_to_array
+        from image_processing.bit_depth import thumbnail_array
+        
+        if self._preview_source is None:
+            # Массив масштабируется без PIL-режима: I;16 и F не поддерживают Ланцоша в PIL
+            source_array = image_to_array(self.original_image)
+            proxy_array = thumbnail_array(source_array, PREVIEW_IMAGE_SIZE)
+            scale = proxy_array.shape[1] / source_array.shape[1]
+            self._preview_source = (proxy_array, scale)
+        
+        return self._preview_source
     
     def get_image_info(self):
         """Возвращает информацию об изображении."""
@@ -100,7 +182,10 @@ class ImageManager:
             return "Изображение не загружено"
         
         info = f"Размер: {self.original_image.size}\n"
-        info += f"Режим: {self.original_image.mode}\n"
+        info += f"Режим: {self.original_image.mode}"
+        if self.collapsed_channels is not None:
+            info += " (файл RGB с одинаковыми каналами)"
+        info += "\n"
         info += f"Формат: {self.original_image.format}"
         
         return info
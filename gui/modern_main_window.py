@@ -16,6 +16,7 @@ from .components.modern_transform_settings import ModernTransformSettings
 from .components.modern_info_panel import ModernInfoPanel
 from .components.animations import AnimationManager, LoadingSpinner, ProgressBar
 from .styles.modern_styles import ModernStyles
+from .components.render_queue import RenderQueue
 from .controllers.main_controller import MainController
 from di.container import DIContainer
 from di.config import create_container
@@ -170,6 +171,16 @@ class ModernMainWindow:
                               style='Status.TLabel',
                               anchor='w')
         status_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0), padx=20)
+        
+        # Индикаторы фонового расчета
+        indicator_frame = ttk.Frame(bottom_frame, style='Modern.TFrame')
+        indicator_frame.grid(row=1, column=1, sticky=tk.E, pady=(5, 0), padx=(0, 20))
+        
+        self.spinner = LoadingSpinner(indicator_frame, size=20)
+        self.spinner.canvas.pack(side=tk.LEFT)
+        
+        self.progress_bar = ProgressBar(indicator_frame, width=160, height=16)
+        self.progress_bar.pack(side=tk.LEFT, padx=(10, 0))
     
     def setup_controller(self):
         """Настраивает контроллер с callbacks."""
@@ -178,6 +189,9 @@ class ModernMainWindow:
             on_image_display_update=self.update_image_display,
             on_info_update=self.update_info
         )
+        self.controller.set_render_queue(
+            RenderQueue(self.root, spinner=self.spinner, progress_bar=self.progress_bar)
+        )
     
     def load_image(self):
         """Загружает изображение из файла."""
@@ -42,6 +42,16 @@ class ParameterManager:
             'constant_value': tk.StringVar(value=str(DEFAULT_PARAMS['constant_value']))
         }
     
+    def set_change_callback(self, callback):
+        """
+        Устанавливает callback, вызываемый при изменении любого параметра.
+        
+        Args:
+            callback: Функция без аргументов
+        """
+        for variable in self.variables.values():
+            variable.trace_add('write', lambda *args: callback())
+    
     def _create_elements(self):
         """Создает элементы интерфейса для параметров."""
         # Режим
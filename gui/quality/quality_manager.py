@@ -104,8 +104,9 @@ class QualityManager:
             
             # Конвертируем изображения в numpy arrays
             import numpy as np
-            original_array = np.array(original_image)
-            processed_array = np.array(processed_image)
+            from image_processing.palette import image_to_array
+            original_array = image_to_array(original_image)
+            processed_array = image_to_array(processed_image)
             
             # Вычисляем метрики качества
             self.quality_metrics = self.quality_assessor.compute_quality_metrics(
@@ -133,8 +134,11 @@ class QualityManager:
             return
         
         try:
-            # Создаем визуализацию карты разности
-            visualization = self.quality_assessor.create_visualization_map(self.difference_map, 'hot')
+            # Создаем визуализацию карты разности сразу в разрешении отображения
+            from constants import DISPLAY_IMAGE_SIZE
+            visualization = self.quality_assessor.create_visualization_map(
+                self.difference_map, 'hot', max_size=DISPLAY_IMAGE_SIZE
+            )
             
             # Конвертируем в PIL Image
             if len(visualization.shape) == 3:
@@ -143,7 +147,6 @@ class QualityManager:
                 diff_image = Image.fromarray(visualization, mode='L')
             
             # Изменяем размер для отображения
-            from constants import DISPLAY_IMAGE_SIZE
             display_image = diff_image.copy()
             display_image.thumbnail(DISPLAY_IMAGE_SIZE, Image.Resampling.LANCZOS)
             
@@ -249,8 +252,9 @@ class QualityManager:
             # Применяем выбранные фильтры
             import numpy as np
             from image_processing.factories.transform_factory import TransformFactory
+            from image_processing.palette import image_to_array
             
-            original_array = np.array(original_image)
+            original_array = image_to_array(original_image)
             filter_results = {}
             
             for filter_name in selected:
@@ -370,7 +374,8 @@ class QualityManager:
             
             # Конвертируем изображение в numpy array
             import numpy as np
-            original_array = np.array(original_image)
+            from image_processing.palette import image_to_array
+            original_array = image_to_array(original_image)
             
             # Выполняем сравнение
             results = comparator.compare_sharpness_filters(
@@ -0,0 +1,180 @@
+"""
+Автоматический подбор параметров точечных преобразований по гистограмме.
+"""
+
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import logging
+
+from .image_statistics import HistogramStatistics
+
+logger = logging.getLogger(__name__)
+
+# Методы выбора порога бинаризации
+THRESHOLD_OTSU = "otsu"
+THRESHOLD_TRIANGLE = "triangle"
+THRESHOLD_MEAN = "mean"
+
+# Кандидаты гаммы для максимизации энтропии (логарифмическая сетка 0.2-5)
+GAMMA_CANDIDATES = np.exp(np.linspace(np.log(0.2), np.log(5.0), 65))
+
+# Число интервалов, по которым оценивается энтропия результата. Биекция уровней
+# не меняет энтропию 256-уровневой гистограммы, поэтому оценивается
+# заполненность диапазона грубыми интервалами.
+ENTROPY_BINS = 32
+
+
+class AutoParameterEngine:
+    """
+    Подбор параметров по 256-уровневой гистограмме.
+
+    Все методы работают только с гистограммой, поэтому время подбора
+    не зависит от размера изображения.
+    """
+
+    def threshold(self, statistics: HistogramStatistics, method: str = THRESHOLD_OTSU) -> float:
+        """
+        Вычисляет порог бинаризации.
+
+        Args:
+            statistics: Статистики яркости
+            method: Метод (otsu, triangle, mean)
+
+        Returns:
+            float: Порог (0-255)
+        """
+        if method == THRESHOLD_OTSU:
+            return self.otsu_threshold(statistics.histogram)
+        if method == THRESHOLD_TRIANGLE:
+            return self.triangle_threshold(statistics.histogram)
+        if method == THRESHOLD_MEAN:
+            return statistics.mean
+        raise ValueError(f"Неизвестный метод выбора порога: {method}")
+
+    def otsu_threshold(self, histogram: np.ndarray) -> float:
+        """
+        Порог Оцу: максимизирует межклассовую дисперсию.
+
+        Args:
+            histogram: Гистограмма из 256 уровней
+
+        Returns:
+            float: Порог (пиксели >= порога относятся к светлому классу)
+        """
+        histogram = histogram.astype(np.float64)
+        total = histogram.sum()
+        if total == 0:
+            return 128.0
+
+        levels = np.arange(histogram.size, dtype=np.float64)
+        # Вес и сумма темного класса для порога t (уровни 0..t-1)
+        weight_dark = np.cumsum(histogram)[:-1]
+        sum_dark = np.cumsum(histogram * levels)[:-1]
+        weight_light = total - weight_dark
+        mean_total = sum_dark[-1] + histogram[-1] * levels[-1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_dark = sum_dark / weight_dark
+            mean_light = (mean_total - sum_dark) / weight_light
+            between = weight_dark * weight_light * (mean_dark - mean_light) ** 2
+        between = np.nan_to_num(between, nan=-1.0)
+
+        if between.max() <= 0:
+            return float(np.flatnonzero(histogram)[0]) + 1.0
+        # Середина плато максимумов устойчивее первого максимума
+        best = np.flatnonzero(between == between.max())
+        return float(best[len(best) // 2]) + 1.0
+
+    def triangle_threshold(self, histogram: np.ndarray) -> float:
+        """
+        Порог треугольника (Zack): наибольшее расстояние от гистограммы
+        до прямой между пиком и дальним краем.
+
+        Подходит для гистограмм с одним выраженным пиком.
+
+        Args:
+            histogram: Гистограмма из 256 уровней
+
+        Returns:
+            float: Порог
+        """
+        nonzero = np.flatnonzero(histogram)
+        if nonzero.size == 0:
+            return 128.0
+        first, last = int(nonzero[0]), int(nonzero[-1])
+        peak = int(np.argmax(histogram))
+        if first == last:
+            return float(first) + 1.0
+
+        # Прямая строится к более дальнему от пика краю
+        flip = (peak - first) < (last - peak)
+        values = histogram[::-1].astype(np.float64) if flip else histogram.astype(np.float64)
+        size = histogram.size
+        if flip:
+            first, peak = size - 1 - last, size - 1 - peak
+
+        span = np.arange(first, peak + 1)
+        height = values[peak]
+        # Расстояние (без нормировки) от точек гистограммы до прямой (first, 0)-(peak, height)
+        distance = height * (span - first) - (peak - first) * values[span]
+        threshold = int(span[np.argmax(distance)])
+
+        if flip:
+            threshold = size - 1 - threshold
+            return float(threshold)
+        return float(threshold) + 1.0
+
+    def entropy_gamma(self, statistics: HistogramStatistics,
+                      candidates: Optional[Sequence[float]] = None) -> Tuple[float, float]:
+        """
+        Подбирает гамму, максимизирующую энтропию результата.
+
+        Для каждой гаммы уровни отображаются через таблицу из 256 значений,
+        а гистограмма результата по ENTROPY_BINS интервалам строится
+        перераспределением исходной.
+
+        Args:
+            statistics: Статистики отсчетов изображения
+            candidates: Кандидаты гаммы (по умолчанию логарифмическая сетка 0.2-5)
+
+        Returns:
+            Tuple[float, float]: Гамма и коэффициент c
+        """
+        histogram = statistics.histogram.astype(np.float64)
+        total = histogram.sum()
+        max_value = max(statistics.max_value, 1) / 255.0
+        if total == 0:
+            return 1.0, 1.0
+
+        levels = np.arange(histogram.size, dtype=np.float64) / 255.0
+        best_gamma, best_entropy = 1.0, -1.0
+        for gamma in (GAMMA_CANDIDATES if candidates is None else candidates):
+            c = 1.0 / (max_value ** gamma)
+            lut = np.clip(c * levels ** gamma * 255, 0, 255).astype(np.uint8)
+            mapped = np.bincount(lut // (256 // ENTROPY_BINS), weights=histogram, minlength=ENTROPY_BINS)
+            probabilities = mapped[mapped > 0] / total
+            entropy = -float(np.sum(probabilities * np.log2(probabilities)))
+            if entropy > best_entropy + 1e-12:
+                best_gamma, best_entropy = float(gamma), entropy
+
+        logger.debug("Гамма максимальной энтропии: %.3f (%.3f бит)", best_gamma, best_entropy)
+        return best_gamma, 1.0 / (max_value ** best_gamma)
+
+    def percentile_range(self, statistics: HistogramStatistics,
+                         low: float = 25.0, high: float = 75.0) -> Tuple[float, float]:
+        """
+        Диапазон яркостей между перцентилями.
+
+        Args:
+            statistics: Статистики яркости
+            low: Нижний перцентиль
+            high: Верхний перцентиль
+
+        Returns:
+            Tuple[float, float]: Нижняя и верхняя границы
+        """
+        return statistics.percentile(low), statistics.percentile(high)
+
+
+# Общий экземпляр для преобразований
+auto_parameters = AutoParameterEngine()
@@ -0,0 +1,199 @@
+"""
+Поддержка разрядности изображений: 8 и 16 бит, числа с плавающей точкой.
+
+Точечные преобразования описываются функцией уровней на отрезке [0, 1].
+Для целочисленных изображений функция вычисляется один раз для каждого
+уровня (таблица из 256 или 65536 значений), для изображений с плавающей
+точкой - напрямую. Результат сохраняет тип и диапазон исходного массива.
+
+Пороги и границы диапазонов в параметрах преобразований задаются в шкале
+0-255 независимо от разрядности (допускаются дробные значения).
+"""
+
+from typing import Callable, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+# Шкала параметров преобразований
+PARAMETER_SCALE = 255.0
+
+# Максимальный размер таблицы преобразования (16 бит)
+MAX_LUT_SIZE = 65536
+
+
+def dtype_max(image_array: np.ndarray) -> float:
+    """
+    Возвращает номинальный максимум значений массива.
+
+    Для целых типов - максимум типа (255, 65535). Диапазон чисел с плавающей
+    точкой определяется данными: 1.0 для нормированных изображений, иначе
+    максимум значений (например, 1000 для F-изображения TIFF), чтобы
+    преобразования не обрезали значения до фиксированной шкалы.
+
+    Args:
+        image_array: Массив изображения
+
+    Returns:
+        float: Номинальный максимум
+    """
+    if np.issubdtype(image_array.dtype, np.integer):
+        return float(np.iinfo(image_array.dtype).max)
+    if image_array.size:
+        maximum = float(np.nanmax(image_array))
+        if np.isfinite(maximum) and maximum > 1.0:
+            return maximum
+    return 1.0
+
+
+def lut_size(dtype: np.dtype) -> Optional[int]:
+    """
+    Размер таблицы преобразования для типа или None, если таблица неприменима.
+
+    Args:
+        dtype: Тип массива
+
+    Returns:
+        Optional[int]: 256 для uint8, 65536 для uint16, иначе None
+    """
+    if np.issubdtype(dtype, np.unsignedinteger) and np.iinfo(dtype).max < MAX_LUT_SIZE:
+        return int(np.iinfo(dtype).max) + 1
+    return None
+
+
+def to_parameter_scale(value: float, maximum: float) -> float:
+    """Переводит значение из шкалы массива в шкалу параметров 0-255."""
+    return value * PARAMETER_SCALE / maximum
+
+
+def from_parameter_scale(value: float, maximum: float) -> float:
+    """Переводит значение из шкалы параметров 0-255 в шкалу массива."""
+    return value * maximum / PARAMETER_SCALE
+
+
+def from_levels(levels: np.ndarray, dtype: np.dtype, maximum: float) -> np.ndarray:
+    """
+    Переводит уровни [0, 1] в тип и диапазон массива.
+
+    Целые значения отбрасывают дробную часть, как и прежнее 8-битное приведение.
+
+    Args:
+        levels: Уровни в диапазоне [0, 1]
+        dtype: Тип результата
+        maximum: Номинальный максимум результата
+
+    Returns:
+        np.ndarray: Массив в типе dtype
+    """
+    values = np.clip(levels * maximum, 0, maximum)
+    return values.astype(dtype)
+
+
+def level_lut(level_function: Callable[[np.ndarray], np.ndarray], dtype: np.dtype) -> np.ndarray:
+    """
+    Строит таблицу преобразования для целочисленного типа.
+
+    Args:
+        level_function: Функция уровней [0, 1] -> [0, 1]
+        dtype: Целочисленный тип (uint8 или uint16)
+
+    Returns:
+        np.ndarray: Таблица из 256 или 65536 значений
+    """
+    size = lut_size(dtype)
+    maximum = float(size - 1)
+    levels = np.arange(size, dtype=np.float64) / maximum
+    return from_levels(level_function(levels), dtype, maximum)
+
+
+def apply_level_function(image_array: np.ndarray,
+                         level_function: Callable[[np.ndarray], np.ndarray],
+                         maximum: Optional[float] = None) -> np.ndarray:
+    """
+    Применяет функцию уровней ко всем отсчетам изображения.
+
+    Args:
+        image_array: Массив изображения
+        level_function: Функция уровней [0, 1] -> [0, 1]
+        maximum: Номинальный максимум для чисел с плавающей точкой
+                 (по умолчанию dtype_max массива)
+
+    Returns:
+        np.ndarray: Массив того же типа и диапазона
+    """
+    if lut_size(image_array.dtype) is not None:
+        return level_lut(level_function, image_array.dtype)[image_array]
+
+    if maximum is None:
+        maximum = dtype_max(image_array)
+    levels = image_array.astype(np.float64) / maximum
+    return from_levels(level_function(levels), image_array.dtype, maximum)
+
+
+def to_histogram_levels(image_array: np.ndarray) -> np.ndarray:
+    """
+    Приводит значения к 256 уровням uint8 для гистограммы.
+
+    Args:
+        image_array: Массив изображения
+
+    Returns:
+        np.ndarray: Массив uint8
+    """
+    if image_array.dtype == np.uint8:
+        return image_array
+    if image_array.dtype == np.uint16:
+        return (image_array >> 8).astype(np.uint8)
+    maximum = dtype_max(image_array)
+    values = image_array.astype(np.float64) * (PARAMETER_SCALE / maximum)
+    return np.clip(np.rint(values), 0, 255).astype(np.uint8)
+
+
+def resize_array(image_array: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
+    """
+    Изменяет размер массива фильтром Ланцоша, сохраняя тип и разрядность.
+
+    8-битные массивы масштабируются PIL напрямую. PIL не масштабирует
+    фильтром Ланцоша 16-битные изображения и не поддерживает многоканальные
+    16-битные и float-изображения, поэтому остальные массивы масштабируются
+    по каналам в режиме 'F' (float32).
+
+    Args:
+        image_array: Массив изображения
+        size: Новый размер (ширина, высота)
+
+    Returns:
+        np.ndarray: Массив нового размера того же типа
+    """
+    if image_array.dtype == np.uint8:
+        return np.array(Image.fromarray(image_array).resize(size, Image.Resampling.LANCZOS))
+
+    channels = image_array[..., np.newaxis] if image_array.ndim == 2 else image_array
+    resized = np.stack([
+        np.asarray(Image.fromarray(channels[..., index].astype(np.float32)).resize(size, Image.Resampling.LANCZOS))
+        for index in range(channels.shape[2])
+    ], axis=2)
+    if image_array.ndim == 2:
+        resized = resized[..., 0]
+    if np.issubdtype(image_array.dtype, np.integer):
+        info = np.iinfo(image_array.dtype)
+        resized = np.clip(np.rint(resized), info.min, info.max)
+    return resized.astype(image_array.dtype)
+
+
+def thumbnail_array(image_array: np.ndarray, max_size: Tuple[int, int]) -> np.ndarray:
+    """
+    Уменьшает массив с сохранением пропорций, чтобы он помещался в max_size.
+
+    Args:
+        image_array: Массив изображения
+        max_size: Максимальный размер (ширина, высота)
+
+    Returns:
+        np.ndarray: Уменьшенный массив того же типа (исходный, если он уже помещается)
+    """
+    height, width = image_array.shape[:2]
+    scale = min(max_size[0] / width, max_size[1] / height)
+    if scale >= 1.0:
+        return image_array
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return resize_array(image_array, size)
@@ -0,0 +1,220 @@
+"""
+Роли каналов изображения: цветовые каналы и альфа-канал.
+
+Массив из np.array(Image.open(...)) для изображений LA и RGBA содержит
+2 и 4 канала, последний из которых - альфа (непрозрачность). Альфа-канал
+не является частью цвета: размывать или инвертировать маску прозрачности
+не требуется, а ее обработка добавляет 25-50% вычислений. Поэтому
+преобразования обрабатывают только цветовые каналы.
+
+Режимы обработки альфа-канала:
+- passthrough: альфа копируется без изменений;
+- premultiplied: цвет умножается на альфу, фильтр применяется ко всем
+  каналам, затем цвет делится на новую альфу. Прозрачные пиксели не вносят
+  свой цвет в соседние; альфа-канал при этом тоже фильтруется.
+
+Изображения в оттенках серого, сохраненные как RGB (R = G = B, например
+сканы документов), можно хранить одним каналом (collapse_gray), чтобы
+фильтры обрабатывали втрое меньше данных, и восстанавливать три канала
+при сохранении (expand_gray).
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+from .bit_depth import dtype_max
+
+ALPHA_PASSTHROUGH = "passthrough"
+ALPHA_PREMULTIPLIED = "premultiplied"
+
+ALPHA_MODES = (ALPHA_PASSTHROUGH, ALPHA_PREMULTIPLIED)
+
+# Число каналов изображений с альфа-каналом: LA и RGBA
+ALPHA_CHANNEL_COUNTS = (2, 4)
+
+# Проверка изображений в оттенках серого, сохраненных как RGB:
+# размер выборки пикселей и число строк в блоке полной проверки
+GRAY_SAMPLE_SIZE = 4096
+GRAY_VERIFY_ROWS = 256
+
+
+def has_alpha(image_array: np.ndarray) -> bool:
+    """
+    Проверяет, содержит ли массив альфа-канал.
+
+    Двух- и четырехканальные массивы считаются LA и RGBA (соглашение PIL);
+    формат CMYK в приложении не загружается.
+
+    Args:
+        image_array: Массив изображения
+
+    Returns:
+        bool: True для массивов LA и RGBA
+    """
+    return image_array.ndim == 3 and image_array.shape[2] in ALPHA_CHANNEL_COUNTS
+
+
+def color_channels(image_array: np.ndarray) -> np.ndarray:
+    """
+    Возвращает цветовые каналы без копирования.
+
+    Args:
+        image_array: Массив изображения
+
+    Returns:
+        np.ndarray: Цветовые каналы (для LA - двумерный массив); без альфа-канала - исходный массив
+    """
+    return split_alpha(image_array)[0]
+
+
+def split_alpha(image_array: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Разделяет цветовые каналы и альфа-канал без копирования.
+
+    Args:
+        image_array: Массив изображения
+
+    Returns:
+        Tuple[np.ndarray, Optional[np.ndarray]]: Цветовые каналы и альфа-канал (None, если его нет)
+    """
+    if not has_alpha(image_array):
+        return image_array, None
+    if image_array.shape[2] == 2:
+        return image_array[..., 0], image_array[..., 1]
+    return image_array[..., :3], image_array[..., 3]
+
+
+def merge_alpha(color: np.ndarray, alpha: Optional[np.ndarray]) -> np.ndarray:
+    """
+    Объединяет цветовые каналы с альфа-каналом.
+
+    Args:
+        color: Цветовые каналы (двумерный массив для оттенков серого)
+        alpha: Альфа-канал (None - вернуть цвет без изменений)
+
+    Returns:
+        np.ndarray: Массив LA или RGBA в типе цветовых каналов
+    """
+    if alpha is None:
+        return color
+    if color.ndim == 2:
+        color = color[..., np.newaxis]
+    merged = np.empty(color.shape[:2] + (color.shape[2] + 1,), dtype=color.dtype)
+    merged[..., :-1] = color
+    merged[..., -1] = alpha
+    return merged
+
+
+def premultiply(image_array: np.ndarray) -> np.ndarray:
+    """
+    Умножает цветовые каналы на альфу.
+
+    Целочисленный результат округляется, как в обычных 8- и 16-битных
+    представлениях с предумноженной альфой.
+
+    Args:
+        image_array: Массив LA или RGBA
+
+    Returns:
+        np.ndarray: Массив того же типа с предумноженным цветом
+    """
+    color, alpha = split_alpha(image_array)
+    # Шкала альфы: для чисел с плавающей точкой она может отличаться от шкалы цвета
+    weights = alpha.astype(np.float64) / dtype_max(alpha)
+    if color.ndim == 3:
+        weights = weights[..., np.newaxis]
+    premultiplied = color * weights
+    if np.issubdtype(image_array.dtype, np.integer):
+        premultiplied = np.rint(premultiplied)
+    return merge_alpha(premultiplied.astype(image_array.dtype), alpha)
+
+
+def unpremultiply(image_array: np.ndarray) -> np.ndarray:
+    """
+    Делит цветовые каналы на альфу; у полностью прозрачных пикселей цвет обнуляется.
+
+    Args:
+        image_array: Массив LA или RGBA с предумноженным цветом
+
+    Returns:
+        np.ndarray: Массив того же типа с обычным цветом
+    """
+    color, alpha = split_alpha(image_array)
+    alpha_maximum = dtype_max(alpha)
+    alpha = alpha.astype(np.float64)
+    if color.ndim == 3:
+        alpha = alpha[..., np.newaxis]
+    straight = np.zeros(color.shape, dtype=np.float64)
+    np.divide(color * alpha_maximum, alpha, out=straight, where=alpha > 0)
+    if np.issubdtype(image_array.dtype, np.integer):
+        straight = np.clip(np.rint(straight), 0, dtype_max(image_array))
+    else:
+        straight = np.maximum(straight, 0)
+    straight = straight.astype(image_array.dtype)
+    return merge_alpha(straight, split_alpha(image_array)[1])
+
+
+def is_gray_rgb(image_array: np.ndarray, sample_size: int = GRAY_SAMPLE_SIZE,
+                rows_per_block: int = GRAY_VERIFY_ROWS) -> bool:
+    """
+    Проверяет, совпадают ли каналы R, G и B во всех пикселях.
+
+    Сначала сравниваются sample_size равномерно выбранных пикселей: цветное
+    изображение почти всегда отклоняется на этом шаге. Затем изображение
+    проверяется целиком блоками по rows_per_block строк с выходом
+    при первом несовпадении.
+
+    Args:
+        image_array: Массив изображения
+        sample_size: Число пикселей в выборке
+        rows_per_block: Число строк в блоке полной проверки
+
+    Returns:
+        bool: True для RGB и RGBA с одинаковыми цветовыми каналами
+    """
+    if image_array.ndim != 3 or image_array.shape[2] not in (3, 4) or image_array.size == 0:
+        return False
+
+    pixels = image_array.reshape(-1, image_array.shape[2])
+    sample = pixels[::max(1, len(pixels) // sample_size)]
+    if not _equal_channels(sample):
+        return False
+
+    for start in range(0, image_array.shape[0], rows_per_block):
+        if not _equal_channels(image_array[start:start + rows_per_block]):
+            return False
+    return True
+
+
+def collapse_gray(image_array: np.ndarray) -> np.ndarray:
+    """
+    Оставляет один цветовой канал изображения с одинаковыми каналами R, G, B.
+
+    Args:
+        image_array: Массив RGB или RGBA (см. is_gray_rgb)
+
+    Returns:
+        np.ndarray: Двумерный массив для RGB, массив LA для RGBA
+    """
+    color, alpha = split_alpha(image_array)
+    return merge_alpha(np.ascontiguousarray(color[..., 0]), alpha)
+
+
+def expand_gray(image_array: np.ndarray) -> np.ndarray:
+    """
+    Восстанавливает три одинаковых цветовых канала.
+
+    Args:
+        image_array: Двумерный массив или массив LA
+
+    Returns:
+        np.ndarray: Массив RGB или RGBA
+    """
+    color, alpha = split_alpha(image_array)
+    return merge_alpha(np.repeat(color[..., np.newaxis], 3, axis=2), alpha)
+
+
+def _equal_channels(pixels: np.ndarray) -> bool:
+    """Совпадают ли первые три канала во всех переданных пикселях."""
+    return bool(np.array_equal(pixels[..., 0], pixels[..., 1]) and
+                np.array_equal(pixels[..., 0], pixels[..., 2]))
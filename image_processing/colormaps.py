@@ -0,0 +1,64 @@
+"""
+Таблицы цветовых схем для визуализации карт разности.
+
+Каждая схема - таблица 256x3 uint8, вычисляемая один раз при импорте.
+Раскраска 8-битной карты сводится к одной выборке table[values].
+"""
+
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+COLORMAP_HOT = "hot"
+COLORMAP_COOL = "cool"
+COLORMAP_GRAY = "gray"
+COLORMAP_VIRIDIS = "viridis"
+COLORMAP_MAGMA = "magma"
+
+# Опорные цвета схем с плавными переходами (равномерно по уровням 0-255)
+_VIRIDIS_ANCHORS = ((68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37))
+_MAGMA_ANCHORS = ((0, 0, 4), (81, 18, 124), (183, 55, 121), (252, 137, 97), (252, 253, 191))
+
+
+def _ramp(offset: int) -> np.ndarray:
+    """Линейный подъем 0-255 за треть диапазона, начиная с уровня offset."""
+    levels = np.arange(256, dtype=np.int32)
+    return np.clip((levels - offset) * 3, 0, 255)
+
+
+def _interpolate(anchors: Sequence[Tuple[int, int, int]]) -> np.ndarray:
+    """Таблица с линейной интерполяцией между опорными цветами."""
+    anchors = np.asarray(anchors, dtype=np.float64)
+    positions = np.linspace(0, 255, len(anchors))
+    levels = np.arange(256)
+    return np.stack([np.interp(levels, positions, anchors[:, channel]) for channel in range(3)], axis=1)
+
+
+def _table(channels: np.ndarray) -> np.ndarray:
+    """Приводит таблицу к uint8 и запрещает ее изменение."""
+    table = np.ascontiguousarray(np.rint(channels).astype(np.uint8))
+    table.flags.writeable = False
+    return table
+
+
+COLORMAPS: Dict[str, np.ndarray] = {
+    # черный -> красный -> желтый -> белый
+    COLORMAP_HOT: _table(np.stack([_ramp(0), _ramp(85), _ramp(170)], axis=1)),
+    # черный -> синий -> голубой -> белый
+    COLORMAP_COOL: _table(np.stack([_ramp(170), _ramp(85), _ramp(0)], axis=1)),
+    COLORMAP_GRAY: _table(np.repeat(np.arange(256)[:, np.newaxis], 3, axis=1)),
+    COLORMAP_VIRIDIS: _table(_interpolate(_VIRIDIS_ANCHORS)),
+    COLORMAP_MAGMA: _table(_interpolate(_MAGMA_ANCHORS)),
+}
+
+
+def get_colormap(name: str) -> np.ndarray:
+    """
+    Возвращает таблицу цветовой схемы.
+
+    Args:
+        name: Название схемы (неизвестные схемы заменяются серой)
+
+    Returns:
+        np.ndarray: Таблица 256x3 uint8 (только для чтения)
+    """
+    return COLORMAPS.get(name, COLORMAPS[COLORMAP_GRAY])
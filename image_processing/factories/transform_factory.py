@@ -2,61 +2,66 @@
 Фабрика для создания преобразований.
 """
 
-from typing import Dict, Type
+import importlib
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Type, Union
 from ..transforms.base_transform import BaseTransform
-from ..transforms.logarithmic_transform import LogarithmicTransform
-from ..transforms.power_transform import PowerTransform
-from ..transforms.binary_transform import BinaryTransform
-from ..transforms.brightness_range_transform import BrightnessRangeTransform
-from ..transforms.smoothing_filters import (
-    RectangularFilter3x3, RectangularFilter5x5,
-    MedianFilter3x3, MedianFilter5x5,
-    GaussianFilterSigma1, GaussianFilterSigma2, GaussianFilterSigma3,
-    SigmaFilterSigma1, SigmaFilterSigma2, SigmaFilterSigma3
-)
-from ..transforms.sharpness_filters import (
-    UnsharpMasking3x3Lambda05, UnsharpMasking3x3Lambda10, UnsharpMasking3x3Lambda15, UnsharpMasking3x3Lambda20,
-    UnsharpMasking5x5Lambda05, UnsharpMasking5x5Lambda10, UnsharpMasking5x5Lambda15, UnsharpMasking5x5Lambda20,
-    UnsharpMasking7x7Lambda05, UnsharpMasking7x7Lambda10, UnsharpMasking7x7Lambda15, UnsharpMasking7x7Lambda20
-)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class TransformSpec(NamedTuple):
+    """
+    Описание преобразования для ленивой загрузки.
+    
+    Модуль с классом импортируется, а экземпляр создается только при первом
+    обращении к преобразованию. Параметры передаются конструктору класса,
+    поэтому готовые наборы параметров не требуют отдельных классов.
+    """
+    module: str
+    class_name: str
+    params: Optional[Dict[str, Any]] = None
+
+
+# Пакет, относительно которого задаются модули преобразований
+TRANSFORMS_PACKAGE = __name__.rsplit('.', 2)[0] + '.transforms'
+
+# Параметрические семейства фильтров
+FAMILY_BOX = "box"
+FAMILY_MEDIAN = "median"
+FAMILY_GAUSSIAN = "gaussian"
+FAMILY_SIGMA = "sigma"
+FAMILY_UNSHARP = "unsharp"
+
+
+def _family(family: str, **params) -> TransformSpec:
+    """Описание набора параметров семейства фильтров."""
+    spec = TransformFactory.families[family]
+    return spec._replace(params=params)
+
+
 class TransformFactory:
     """Фабрика для создания преобразований."""
     
-    _transforms: Dict[str, Type[BaseTransform]] = {
-        "Логарифмическое": LogarithmicTransform,
-        "Степенное": PowerTransform,
-        "Бинарное": BinaryTransform,
-        "Вырезание диапазона яркостей": BrightnessRangeTransform,
-        "Прямоугольный фильтр 3x3": RectangularFilter3x3,
-        "Прямоугольный фильтр 5x5": RectangularFilter5x5,
-        "Медианный фильтр 3x3": MedianFilter3x3,
-        "Медианный фильтр 5x5": MedianFilter5x5,
-        "Фильтр Гаусса σ=1.0": GaussianFilterSigma1,
-        "Фильтр Гаусса σ=2.0": GaussianFilterSigma2,
-        "Фильтр Гаусса σ=3.0": GaussianFilterSigma3,
-        "Сигма-фильтр σ=1.0": SigmaFilterSigma1,
-        "Сигма-фильтр σ=2.0": SigmaFilterSigma2,
-        "Сигма-фильтр σ=3.0": SigmaFilterSigma3,
-        # Фильтры резкости (нерезкое маскирование)
-        "Нерезкое маскирование k=3, λ=0.5": UnsharpMasking3x3Lambda05,
-        "Нерезкое маскирование k=3, λ=1.0": UnsharpMasking3x3Lambda10,
-        "Нерезкое маскирование k=3, λ=1.5": UnsharpMasking3x3Lambda15,
-        "Нерезкое маскирование k=3, λ=2.0": UnsharpMasking3x3Lambda20,
-        "Нерезкое маскирование k=5, λ=0.5": UnsharpMasking5x5Lambda05,
-        "Нерезкое маскирование k=5, λ=1.0": UnsharpMasking5x5Lambda10,
-        "Нерезкое маскирование k=5, λ=1.5": UnsharpMasking5x5Lambda15,
-        "Нерезкое маскирование k=5, λ=2.0": UnsharpMasking5x5Lambda20,
-        "Нерезкое маскирование k=7, λ=0.5": UnsharpMasking7x7Lambda05,
-        "Нерезкое маскирование k=7, λ=1.0": UnsharpMasking7x7Lambda10,
-        "Нерезкое маскирование k=7, λ=1.5": UnsharpMasking7x7Lambda15,
-        "Нерезкое маскирование k=7, λ=2.0": UnsharpMasking7x7Lambda20
+    # Семейства: Box(k), Median(k), Gaussian(σ), Sigma(σ, k), Unsharp(k, λ, σ)
+    families: Dict[str, TransformSpec] = {
+        FAMILY_BOX: TransformSpec("smoothing_filters", "RectangularFilter"),
+        FAMILY_MEDIAN: TransformSpec("smoothing_filters", "MedianFilter"),
+        FAMILY_GAUSSIAN: TransformSpec("smoothing_filters", "GaussianFilter"),
+        FAMILY_SIGMA: TransformSpec("smoothing_filters", "SigmaFilter"),
+        FAMILY_UNSHARP: TransformSpec("sharpness_filters", "UnsharpMasking"),
     }
     
+    _transforms: Dict[str, Union[TransformSpec, Type[BaseTransform]]] = {
+        "Логарифмическое": TransformSpec("logarithmic_transform", "LogarithmicTransform"),
+        "Степенное": TransformSpec("power_transform", "PowerTransform"),
+        "Бинарное": TransformSpec("binary_transform", "BinaryTransform"),
+        "Вырезание диапазона яркостей": TransformSpec("brightness_range_transform", "BrightnessRangeTransform"),
+    }
+    
+    # Загруженные классы по (модуль, класс)
+    _classes: Dict[Tuple[str, str], Type[BaseTransform]] = {}
+    
     @classmethod
     def create_transform(cls, transform_name: str) -> BaseTransform:
         """
@@ -74,8 +79,55 @@ class TransformFactory:
         if transform_name not in cls._transforms:
             raise ValueError(f"Преобразование '{transform_name}' не найдено")
         
-        transform_class = cls._transforms[transform_name]
-        return transform_class()
+        entry = cls._transforms[transform_name]
+        if isinstance(entry, TransformSpec):
+            return cls._load_class(entry)(**(entry.params or {}))
+        return entry()
+    
+    @classmethod
+    def create_family(cls, family: str, **params) -> BaseTransform:
+        """
+        Создает фильтр из параметрического семейства с произвольными параметрами.
+        
+        Args:
+            family: Семейство (box, median, gaussian, sigma, unsharp)
+            **params: Параметры конструктора (kernel_size, sigma, lambda_coeff)
+            
+        Returns:
+            BaseTransform: Экземпляр фильтра
+            
+        Raises:
+            ValueError: Если семейство не найдено
+        """
+        if family not in cls.families:
+            raise ValueError(f"Семейство фильтров '{family}' не найдено")
+        return cls._load_class(cls.families[family])(**params)
+    
+    @classmethod
+    def get_transform_class(cls, transform_name: str) -> Type[BaseTransform]:
+        """
+        Возвращает класс преобразования, импортируя его модуль при первом обращении.
+        
+        Args:
+            transform_name: Название преобразования
+            
+        Returns:
+            Type[BaseTransform]: Класс преобразования
+        """
+        entry = cls._transforms[transform_name]
+        if isinstance(entry, TransformSpec):
+            return cls._load_class(entry)
+        return entry
+    
+    @classmethod
+    def _load_class(cls, spec: TransformSpec) -> Type[BaseTransform]:
+        """Импортирует модуль описания и возвращает класс."""
+        key = (spec.module, spec.class_name)
+        if key not in cls._classes:
+            module = importlib.import_module(f"{TRANSFORMS_PACKAGE}.{spec.module}")
+            cls._classes[key] = getattr(module, spec.class_name)
+            logger.debug("Загружен класс преобразования: %s", spec.class_name)
+        return cls._classes[key]
     
     @classmethod
     def get_available_transforms(cls) -> list[str]:
@@ -88,16 +140,16 @@ class TransformFactory:
         return list(cls._transforms.keys())
     
     @classmethod
-    def register_transform(cls, name: str, transform_class: Type[BaseTransform]) -> None:
+    def register_transform(cls, name: str, transform_class: Union[TransformSpec, Type[BaseTransform]]) -> None:
         """
         Регистрирует новое преобразование.
         
         Args:
             name: Название преобразования
-            transform_class: Класс преобразования
+            transform_class: Класс преобразования или его описание для ленивой загрузки
         """
         cls._transforms[name] = transform_class
-        logger.info(f"Зарегистрировано преобразование: {name}")
+        logger.info("Зарегистрировано преобразование: %s", name)
     
     @classmethod
     def unregister_transform(cls, name: str) -> None:
@@ -109,7 +161,7 @@ class TransformFactory:
         """
         if name in cls._transforms:
             del cls._transforms[name]
-            logger.info(f"Удалено преобразование: {name}")
+            logger.info("Удалено преобразование: %s", name)
     
     @classmethod
     def is_transform_available(cls, name: str) -> bool:
@@ -123,3 +175,20 @@ class TransformFactory:
             bool: True если преобразование доступно
         """
         return name in cls._transforms
+
+
+# Готовые наборы параметров фильтров, доступные по названию
+TransformFactory._transforms.update({
+    "Прямоугольный фильтр 3x3": _family(FAMILY_BOX, kernel_size=3),
+    "Прямоугольный фильтр 5x5": _family(FAMILY_BOX, kernel_size=5),
+    "Медианный фильтр 3x3": _family(FAMILY_MEDIAN, kernel_size=3),
+    "Медианный фильтр 5x5": _family(FAMILY_MEDIAN, kernel_size=5),
+    **{f"Фильтр Гаусса σ={sigma:.1f}": _family(FAMILY_GAUSSIAN, sigma=sigma)
+       for sigma in (1.0, 2.0, 3.0)},
+    **{f"Сигма-фильтр σ={sigma:.1f}": _family(FAMILY_SIGMA, sigma=sigma, kernel_size=5)
+       for sigma in (1.0, 2.0, 3.0)},
+    # Фильтры резкости (нерезкое маскирование)
+    **{f"Нерезкое маскирование k={k}, λ={lambda_coeff:.1f}":
+       _family(FAMILY_UNSHARP, kernel_size=k, lambda_coeff=lambda_coeff)
+       for k in (3, 5, 7) for lambda_coeff in (0.5, 1.0, 1.5, 2.0)},
+})
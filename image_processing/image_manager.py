@@ -7,17 +7,42 @@ import numpy as np
 from PIL import Image, ImageTk
 import logging
 
+from .image_statistics import image_statistics
+from .palette import image_to_array
+from .channels import is_gray_rgb, collapse_gray
+from .instrumentation import instrumentation, megapixels
+from .bit_depth import thumbnail_array
+
 logger = logging.getLogger(__name__)
 
 
 class ImageManager:
-    """Класс для управления изображениями."""
+    """
+    Класс для управления изображениями.
+    
+    Изображение в оттенках серого, сохраненное как RGB или RGBA (R = G = B),
+    хранится в image_array одним цветовым каналом: фильтры обрабатывают
+    втрое меньше данных. Результат обработки такого изображения сохраняется
+    в файл снова в RGB или RGBA.
+    """
     
-    def __init__(self):
-        """Инициализация менеджера изображений."""
+    def __init__(self, collapse_gray_rgb: bool = True):
+        """
+        Инициализация менеджера изображений.
+        
+        Args:
+            collapse_gray_rgb: Хранить ли изображения с R = G = B одним каналом
+        """
+        self.collapse_gray_rgb = collapse_gray_rgb
+        # Число каналов исходного массива, если он сведен к одному цветовому каналу
+        self.collapsed_channels: Optional[int] = None
         self.original_image: Optional[Image.Image] = None
         self.processed_image: Optional[Image.Image] = None
         self.image_array: Optional[np.ndarray] = None
+        # Массив результата; для результата с палитрой создается при первом обращении
+        self._processed_array: Optional[np.ndarray] = None
+        self.preview_image: Optional[Image.Image] = None
+        self._preview_cache: Optional[Tuple[Tuple[int, int], np.ndarray, float]] = None
     
     def load_image(self, file_path: str) -> bool:
         """
@@ -30,14 +55,50 @@ class ImageManager:
             bool: True если изображение успешно загружено, False иначе
         """
         try:
-            self.original_image = Image.open(file_path)
-            self.image_array = np.array(self.original_image)
-            logger.info(f"Изображение успешно загружено: {file_path}")
+            with instrumentation.measure("image.load") as measurement:
+                self.original_image = Image.open(file_path)
+                self.image_array = self._collapse_gray(self._to_array(self.original_image))
+                measurement.megapixels = megapixels(self.image_array)
+            self.processed_image = None
+            self._processed_array = None
+            self.preview_image = None
+            self._preview_cache = None
+            logger.info("Изображение успешно загружено: %s", file_path)
             return True
         except Exception as e:
             logger.error(f"Ошибка при загрузке изображения: {e}")
             return False
     
+    def _to_array(self, image: Image.Image) -> np.ndarray:
+        """
+        Преобразует изображение в массив без потери разрядности.
+        
+        16-битные изображения, открытые в режиме 'I' (int32), приводятся к uint16.
+        Изображения с палитрой преобразуются в RGB (RGBA при наличии прозрачности).
+        """
+        image_array = image_to_array(image)
+        if image.mode == 'I' and image_array.size:
+            if image_array.min() >= 0 and image_array.max() <= np.iinfo(np.uint16).max:
+                image_array = image_array.astype(np.uint16)
+        return image_array
+    
+    def _collapse_gray(self, image_array: np.ndarray) -> np.ndarray:
+        """Сводит изображение с одинаковыми каналами R, G, B к одному каналу."""
+        self.collapsed_channels = None
+        if not self.collapse_gray_rgb or not is_gray_rgb(image_array):
+            return image_array
+        
+        self.collapsed_channels = image_array.shape[2]
+        logger.debug("Каналы R, G, B совпадают: изображение хранится одним каналом")
+        return collapse_gray(image_array)
+    
+    @property
+    def processed_array(self) -> Optional[np.ndarray]:
+        """Массив обработанного изображения (None, если его нет)."""
+        if self._processed_array is None and self.processed_image is not None:
+            self._processed_array = self._to_array(self.processed_image)
+        return self._processed_array
+    
     def save_image(self, file_path: str) -> bool:
         """
         Сохраняет обработанное изображение в файл.
@@ -53,13 +114,23 @@ class ImageManager:
                 logger.warning("Нет обработанного изображения для сохранения")
                 return False
                 
-            self.processed_image.save(file_path)
-            logger.info(f"Изображение успешно сохранено: {file_path}")
+            width, height = self.processed_image.size
+            with instrumentation.measure("image.save", width * height / 1e6):
+                self._image_for_saving().save(file_path)
+            logger.info("Изображение успешно сохранено: %s", file_path)
             return True
         except Exception as e:
             logger.error(f"Ошибка при сохранении изображения: {e}")
             return False
     
+    def _image_for_saving(self) -> Image.Image:
+        """Обработанное изображение в числе каналов исходного файла."""
+        image = self.processed_image
+        if self.collapsed_channels is not None and image.mode in ('L', 'LA'):
+            # Изображение хранилось одним каналом - восстанавливаем RGB или RGBA
+            return image.convert('RGBA' if image.mode == 'LA' else 'RGB')
+        return image
+    
     def get_image_for_display(self, image: Image.Image, max_size: Tuple[int, int] = (400, 400)) -> Optional[ImageTk.PhotoImage]:
         """
         Подготавливает изображение для отображения в GUI.
@@ -73,14 +144,59 @@ class ImageManager:
         """
         try:
             # Изменяем размер изображения для отображения
-            display_image = image.copy()
-            display_image.thumbnail(max_size, Image.Resampling.LANCZOS)
+            with instrumentation.measure("display.resize", image.size[0] * image.size[1] / 1e6):
+                display_image = image.copy()
+                display_image.thumbnail(max_size, Image.Resampling.LANCZOS)
+                if display_image.mode == 'LA':
+                    # Сведенное к одному каналу RGBA восстанавливается только для уменьшенной копии
+                    display_image = display_image.convert('RGBA')
             
             return ImageTk.PhotoImage(display_image)
         except Exception as e:
             logger.error(f"Ошибка при подготовке изображения для отображения: {e}")
             return None
     
+    def get_preview_array(self, max_size: Tuple[int, int] = (400, 400)) -> Tuple[np.ndarray, float]:
+        """
+        Возвращает уменьшенную копию исходного изображения для предпросмотра.
+        
+        Копия строится один раз для каждого изображения и размера и кэшируется.
+        
+        Args:
+            max_size: Максимальный размер копии
+            
+        Returns:
+            Tuple[np.ndarray, float]: Массив копии и ее масштаб относительно исходного
+        """
+        if self.image_array is None:
+            raise ValueError("Изображение не загружено")
+        
+        cache_miss = self._preview_cache is None or self._preview_cache[0] != tuple(max_size)
+        instrumentation.record_cache("preview", not cache_miss)
+        if cache_miss:
+            height, width = self.image_array.shape[:2]
+            scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+            if scale < 1.0:
+                with instrumentation.measure("display.preview", megapixels(self.image_array)):
+                    # Массив масштабируется без PIL-режима, поэтому 16 бит и float сохраняются
+                    proxy_array = thumbnail_array(self.image_array, max_size)
+                scale = proxy_array.shape[1] / width
+            else:
+                proxy_array = self.image_array
+            self._preview_cache = (tuple(max_size), proxy_array, scale)
+            logger.debug("Создана копия для предпросмотра: %dx%d", proxy_array.shape[1], proxy_array.shape[0])
+        
+        return self._preview_cache[1], self._preview_cache[2]
+    
+    def set_preview_image(self, image_array: np.ndarray) -> None:
+        """
+        Устанавливает результат предпросмотра из массива.
+        
+        Args:
+            image_array: Массив результата предпросмотра
+        """
+        self.preview_image = Image.fromarray(image_array)
+    
     def set_processed_image(self, image_array: np.ndarray) -> None:
         """
         Устанавливает обработанное изображение из массива.
@@ -90,11 +206,26 @@ class ImageManager:
         """
         try:
             self.processed_image = Image.fromarray(image_array)
-            logger.info("Обработанное изображение установлено")
+            self._processed_array = image_array
+            logger.debug("Обработанное изображение установлено")
         except Exception as e:
             logger.error(f"Ошибка при установке обработанного изображения: {e}")
             raise
     
+    def set_processed_pil_image(self, image: Image.Image) -> None:
+        """
+        Устанавливает обработанное изображение PIL без преобразования в массив.
+        
+        Используется для результатов с палитрой: массив цветов создается
+        только при обращении к processed_array.
+        
+        Args:
+            image: Обработанное изображение
+        """
+        self.processed_image = image
+        self._processed_array = None
+        logger.debug("Обработанное изображение установлено (%s)", image.mode)
+    
     def get_image_info(self) -> dict:
         """
         Возвращает информацию об изображении.
@@ -105,12 +236,20 @@ class ImageManager:
         if self.original_image is None:
             return {}
         
-        return {
+        info = {
             'size': self.original_image.size,
             'mode': self.original_image.mode,
             'format': self.original_image.format,
-            'has_processed': self.processed_image is not None
+            'has_processed': self.processed_image is not None,
+            'gray_collapsed': self.collapsed_channels is not None
         }
+        
+        # Статистики текущего результата (или исходного изображения) из кэша гистограмм
+        statistics_array = self.processed_array if self.processed_array is not None else self.image_array
+        if statistics_array is not None:
+            info.update(image_statistics.luma(statistics_array).to_dict())
+        
+        return info
     
     def has_original_image(self) -> bool:
         """Проверяет, загружено ли исходное изображение."""
@@ -123,4 +262,6 @@ class ImageManager:
     def clear_processed_image(self) -> None:
         """Очищает обработанное изображение."""
         self.processed_image = None
-        logger.info("Обработанное изображение очищено")
+        self._processed_array = None
+        self.preview_image = None
+        logger.debug("Обработанное изображение очищено")
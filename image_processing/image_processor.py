@@ -3,14 +3,22 @@
 Содержит класс ImageProcessor для работы с изображениями.
 """
 
-from typing import Tuple, Optional
+from typing import Tuple, Optional, Dict, Any, Union
+import numpy as np
+from PIL import Image
 import logging
 
 from .image_manager import ImageManager
+from .palette import is_palette_image, apply_to_palette
 from .transform_manager import TransformManager
+from .transforms.progress import ProgressContext, TransformCancelled
+from .instrumentation import instrumentation
 
 logger = logging.getLogger(__name__)
 
+# Результат расчета: изображение с новой палитрой или массив пикселей
+TransformOutput = Union[Image.Image, np.ndarray]
+
 
 class ImageProcessor:
     """Класс для обработки изображений."""
@@ -19,6 +27,8 @@ class ImageProcessor:
         """Инициализация процессора изображений."""
         self.image_manager = ImageManager()
         self.transform_manager = TransformManager()
+        # Отложенное преобразование полного разрешения после предпросмотра
+        self.pending_transform: Optional[Tuple[str, Dict[str, Any]]] = None
     
     def load_image(self, file_path: str) -> bool:
         """
@@ -30,6 +40,7 @@ class ImageProcessor:
         Returns:
             bool: True если изображение успешно загружено, False иначе
         """
+        self.pending_transform = None
         return self.image_manager.load_image(file_path)
     
     def save_image(self, file_path: str) -> bool:
@@ -42,6 +53,9 @@ class ImageProcessor:
         Returns:
             bool: True если изображение успешно сохранено, False иначе
         """
+        # Перед сохранением досчитываем отложенное преобразование
+        if self.has_pending_transform() and not self.render_pending_transform():
+            return False
         return self.image_manager.save_image(file_path)
     
     def get_image_for_display(self, image, max_size: Tuple[int, int] = (400, 400)):
@@ -73,15 +87,12 @@ class ImageProcessor:
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем преобразование
-            processed_array = self.transform_manager.apply_transform(
-                "Логарифмическое", 
-                self.image_manager.image_array, 
+            # Применяем преобразование и устанавливаем обработанное изображение
+            self._apply_named_transform(
+                "Логарифмическое",
                 c=c
             )
-            
-            # Устанавливаем обработанное изображение
-            self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
@@ -106,15 +117,12 @@ class ImageProcessor:
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем преобразование
-            processed_array = self.transform_manager.apply_transform(
-                "Степенное", 
-                self.image_manager.image_array, 
+            # Применяем преобразование и устанавливаем обработанное изображение
+            self._apply_named_transform(
+                "Степенное",
                 gamma=gamma, c=c
             )
-            
-            # Устанавливаем обработанное изображение
-            self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
@@ -137,15 +145,12 @@ class ImageProcessor:
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем преобразование
-            processed_array = self.transform_manager.apply_transform(
-                "Бинарное", 
-                self.image_manager.image_array, 
+            # Применяем преобразование и устанавливаем обработанное изображение
+            self._apply_named_transform(
+                "Бинарное",
                 threshold=threshold
             )
-            
-            # Устанавливаем обработанное изображение
-            self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
@@ -172,18 +177,15 @@ class ImageProcessor:
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем преобразование
-            processed_array = self.transform_manager.apply_transform(
-                "Вырезание диапазона яркостей", 
-                self.image_manager.image_array, 
+            # Применяем преобразование и устанавливаем обработанное изображение
+            self._apply_named_transform(
+                "Вырезание диапазона яркостей",
                 min_brightness=min_brightness,
                 max_brightness=max_brightness,
                 outside_mode=outside_mode,
                 constant_value=constant_value
             )
-            
-            # Устанавливаем обработанное изображение
-            self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
@@ -191,62 +193,191 @@ class ImageProcessor:
             logger.error(f"Ошибка при применении вырезания диапазона яркостей: {e}")
             return False
     
-    def apply_transform(self, transform_name: str, **kwargs) -> bool:
+    def apply_transform(self, transform_name: str, progress: Optional[ProgressContext] = None, **kwargs) -> bool:
         """
         Применяет указанное преобразование к изображению.
         
         Args:
             transform_name: Название преобразования
+            progress: Контекст прогресса и отмены (необязательно)
             **kwargs: Параметры преобразования
             
         Returns:
             bool: True если преобразование успешно применено, False иначе
+            
+        Raises:
+            TransformCancelled: Если выполнение отменено через контекст
         """
         try:
             if not self.image_manager.has_original_image():
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем преобразование
-            processed_array = self.transform_manager.apply_transform(
-                transform_name, 
-                self.image_manager.image_array, 
+            # Применяем преобразование и устанавливаем обработанное изображение
+            self._apply_named_transform(
+                transform_name,
+                progress=progress,
                 **kwargs
             )
-            
-            # Устанавливаем обработанное изображение
-            self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
+        except TransformCancelled:
+            raise
         except Exception as e:
             logger.error(f"Ошибка при применении преобразования {transform_name}: {e}")
             return False
     
-    def apply_custom_transform(self, transform, **kwargs) -> bool:
+    def preview_transform(self, transform_name: str, max_size: Tuple[int, int] = (400, 400), **kwargs) -> bool:
+        """
+        Применяет преобразование к копии изображения в разрешении экрана.
+        
+        Результат сохраняется в image_manager.preview_image, а преобразование
+        полного разрешения откладывается до render_pending_transform
+        (вызывается при сохранении или в простое интерфейса).
+        
+        Args:
+            transform_name: Название преобразования
+            max_size: Максимальный размер копии для предпросмотра
+            **kwargs: Параметры преобразования
+            
+        Returns:
+            bool: True если предпросмотр успешно построен, False иначе
+        """
+        try:
+            if not self.image_manager.has_original_image():
+                logger.error("Изображение не загружено")
+                return False
+            
+            proxy_array, scale = self.image_manager.get_preview_array(max_size)
+            preview_array = self.transform_manager.apply_transform_preview(
+                transform_name, proxy_array, scale, **kwargs
+            )
+            
+            self.image_manager.set_preview_image(preview_array)
+            self.pending_transform = (transform_name, kwargs.copy())
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Ошибка при предпросмотре преобразования {transform_name}: {e}")
+            return False
+    
+    def _apply_named_transform(self, transform_name: str, progress: Optional[ProgressContext] = None,
+                               **kwargs) -> None:
+        """
+        Применяет преобразование к исходному изображению и сохраняет результат.
+        
+        Args:
+            transform_name: Название преобразования
+            progress: Контекст прогресса и отмены (необязательно)
+            **kwargs: Параметры преобразования
+        """
+        self.commit_transform(self.render_transform(transform_name, progress, **kwargs))
+    
+    def render_transform(self, transform_name: str, progress: Optional[ProgressContext] = None,
+                         **kwargs) -> TransformOutput:
+        """
+        Рассчитывает преобразование исходного изображения, не изменяя состояние процессора.
+        
+        Допускается вызов из рабочего потока: результат сохраняется
+        commit_transform в потоке интерфейса, если он еще актуален.
+        Поточечные преобразования изображения с палитрой применяются
+        к палитре (см. palette.py), остальные - к массиву цветов.
+        
+        Args:
+            transform_name: Название преобразования
+            progress: Контекст прогресса и отмены (необязательно)
+            **kwargs: Параметры преобразования
+            
+        Returns:
+            TransformOutput: Изображение с палитрой или массив результата
+            
+        Raises:
+            ValueError: Если изображение не загружено или параметры невалидны
+            TransformCancelled: Если выполнение отменено через контекст
+        """
+        # Исходные данные читаются один раз: загрузка нового изображения
+        # в потоке интерфейса не смешивается с уже начатым расчетом
+        original_image = self.image_manager.original_image
+        image_array = self.image_manager.image_array
+        if original_image is None:
+            raise ValueError("Изображение не загружено")
+        
+        if is_palette_image(original_image) and self.transform_manager.get_transform(transform_name).pointwise:
+            return apply_to_palette(
+                original_image,
+                lambda colors: self.transform_manager.apply_transform(
+                    transform_name, colors, progress=progress, **kwargs
+                )
+            )
+        
+        return self.transform_manager.apply_transform(
+            transform_name, image_array, progress=progress, **kwargs
+        )
+    
+    def commit_transform(self, result: TransformOutput) -> None:
+        """
+        Сохраняет результат render_transform как обработанное изображение.
+        
+        Args:
+            result: Изображение с палитрой или массив результата
+        """
+        if isinstance(result, Image.Image):
+            self.image_manager.set_processed_pil_image(result)
+        else:
+            self.image_manager.set_processed_image(result)
+        self.pending_transform = None
+    
+    def has_pending_transform(self) -> bool:
+        """Проверяет, есть ли отложенное преобразование полного разрешения."""
+        return self.pending_transform is not None
+    
+    def render_pending_transform(self) -> bool:
+        """
+        Применяет отложенное после предпросмотра преобразование в полном разрешении.
+        
+        Returns:
+            bool: True если преобразование применено или его не было, False при ошибке
+        """
+        if self.pending_transform is None:
+            return True
+        
+        transform_name, kwargs = self.pending_transform
+        return self.apply_transform(transform_name, **kwargs)
+    
+    def apply_custom_transform(self, transform, progress: Optional[ProgressContext] = None, **kwargs) -> bool:
         """
         Применяет пользовательское преобразование к изображению.
         
         Args:
             transform: Объект преобразования
+            progress: Контекст прогресса и отмены (необязательно)
             **kwargs: Параметры преобразования
             
         Returns:
             bool: True если преобразование успешно применено, False иначе
+            
+        Raises:
+            TransformCancelled: Если выполнение отменено через контекст
         """
         try:
             if not self.image_manager.has_original_image():
                 logger.error("Изображение не загружено")
                 return False
             
-            # Применяем пользовательское преобразование
-            processed_array = transform.apply(self.image_manager.image_array, **kwargs)
+            # Применяем пользовательское преобразование на копии, не изменяя переданный объект
+            processed_array = transform.execute(self.image_manager.image_array, progress, **kwargs).image
             
             # Устанавливаем обработанное изображение
             self.image_manager.set_processed_image(processed_array)
+            self.pending_transform = None
             
             return True
             
+        except TransformCancelled:
+            raise
         except Exception as e:
             logger.error(f"Ошибка при применении пользовательского преобразования: {e}")
             return False
@@ -265,6 +396,9 @@ class ImageProcessor:
         if transform_info:
             info.update(transform_info)
         
+        # Сводка показателей производительности
+        info['instrumentation'] = instrumentation.summary()
+        
         return info
     
     # Свойства для обратной совместимости
@@ -0,0 +1,213 @@
+"""
+Сервис статистик изображения на основе кэшируемых гистограмм.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+import numpy as np
+import logging
+
+from .luma import luma_provider
+from .channels import color_channels
+from .bit_depth import dtype_max, to_histogram_levels
+from .instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+
+class HistogramStatistics:
+    """
+    Статистики, вычисляемые по 256-уровневой гистограмме.
+
+    Все величины выводятся из гистограммы за O(256) без повторного
+    прохода по изображению.
+    """
+
+    def __init__(self, histogram: np.ndarray):
+        """
+        Инициализация статистик.
+
+        Args:
+            histogram: Гистограмма из 256 уровней
+        """
+        self.histogram = histogram
+        self.total = int(histogram.sum())
+        self._cdf = np.cumsum(histogram)
+        self._levels = np.arange(histogram.size, dtype=np.float64)
+
+    @property
+    def mean(self) -> float:
+        """Среднее значение."""
+        if self.total == 0:
+            return 0.0
+        return float(np.dot(self._levels, self.histogram) / self.total)
+
+    @property
+    def std(self) -> float:
+        """Стандартное отклонение (RMS-контраст)."""
+        if self.total == 0:
+            return 0.0
+        mean = self.mean
+        variance = np.dot((self._levels - mean) ** 2, self.histogram) / self.total
+        return float(np.sqrt(variance))
+
+    @property
+    def contrast(self) -> float:
+        """Контрастность как стандартное отклонение яркости."""
+        return self.std
+
+    @property
+    def min_value(self) -> int:
+        """Минимальное значение."""
+        nonzero = np.flatnonzero(self.histogram)
+        return int(nonzero[0]) if nonzero.size else 0
+
+    @property
+    def max_value(self) -> int:
+        """Максимальное значение."""
+        nonzero = np.flatnonzero(self.histogram)
+        return int(nonzero[-1]) if nonzero.size else 0
+
+    def percentile(self, q: float) -> float:
+        """
+        Вычисляет перцентиль с линейной интерполяцией, как np.percentile.
+
+        Args:
+            q: Перцентиль (0-100)
+
+        Returns:
+            float: Значение перцентиля
+        """
+        if self.total == 0:
+            return 0.0
+        position = q / 100.0 * (self.total - 1)
+        lower_rank = int(np.floor(position))
+        upper_rank = int(np.ceil(position))
+        lower = float(np.searchsorted(self._cdf, lower_rank, side='right'))
+        upper = float(np.searchsorted(self._cdf, upper_rank, side='right'))
+        return lower + (upper - lower) * (position - lower_rank)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает статистики для информационной панели.
+
+        Returns:
+            Dict[str, Any]: Средняя яркость, контрастность и гистограмма
+        """
+        return {
+            'avg_brightness': round(self.mean, 1),
+            'contrast': round(self.contrast, 1),
+            'histogram': self.histogram.tolist()
+        }
+
+
+class ImageStatistics:
+    """
+    Сервис статистик изображения.
+
+    Гистограмма каждого массива (в 256 уровнях шкалы 0-255 для любой
+    разрядности) вычисляется один раз через np.bincount
+    и кэшируется до тех пор, пока существует массив. Массивы изображений
+    в приложении не изменяются на месте, поэтому новый массив означает
+    новую версию изображения.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        """
+        Инициализация сервиса.
+
+        Args:
+            max_entries: Максимальное число кэшированных гистограмм
+        """
+        self.max_entries = max_entries
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def luma(self, image_array: np.ndarray) -> HistogramStatistics:
+        """
+        Статистики яркости (для цветного изображения - по взвешенной сумме каналов).
+
+        Args:
+            image_array: Массив изображения
+
+        Returns:
+            HistogramStatistics: Статистики яркости
+        """
+        return self._get(image_array, 'luma')
+
+    def samples(self, image_array: np.ndarray) -> HistogramStatistics:
+        """
+        Статистики по всем отсчетам цветовых каналов (альфа-канал не учитывается).
+
+        Args:
+            image_array: Массив изображения
+
+        Returns:
+            HistogramStatistics: Статистики отсчетов
+        """
+        return self._get(image_array, 'samples')
+
+    def normalized_max(self, image_array: np.ndarray) -> float:
+        """
+        Максимум отсчетов в долях номинального максимума типа (0-1).
+
+        Для 8-битных изображений берется из кэшированной гистограммы, для
+        остальных вычисляется точно, так как гистограмма огрубляет значения.
+
+        Args:
+            image_array: Массив изображения
+
+        Returns:
+            float: Нормированный максимум
+        """
+        if image_array.dtype == np.uint8:
+            return self.samples(image_array).max_value / 255.0
+        if image_array.size == 0:
+            return 0.0
+        return float(color_channels(image_array).max()) / dtype_max(image_array)
+
+    def invalidate(self, image_array: Optional[np.ndarray] = None):
+        """
+        Сбрасывает кэш для массива или целиком.
+
+        Args:
+            image_array: Массив, статистики которого устарели (None - весь кэш)
+        """
+        with self._lock:
+            if image_array is None:
+                self._cache.clear()
+                return
+            for kind in ('luma', 'samples'):
+                self._cache.pop((id(image_array), kind), None)
+
+    def _get(self, image_array: np.ndarray, kind: str) -> HistogramStatistics:
+        """Возвращает статистики из кэша или вычисляет их (гистограмма строится вне блокировки)."""
+        key = (id(image_array), kind)
+        with self._lock:
+            cached = self._cache.get(key)
+            hit = cached is not None and cached[0]() is image_array
+            if hit:
+                self._cache.move_to_end(key)
+        instrumentation.record_cache("histogram", hit)
+        if hit:
+            return cached[1]
+
+        statistics = HistogramStatistics(self._compute_histogram(image_array, kind))
+        with self._lock:
+            self._cache[key] = (weakref.ref(image_array), statistics)
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        logger.debug("Вычислена гистограмма (%s) для массива %s", kind, image_array.shape)
+        return statistics
+
+    def _compute_histogram(self, image_array: np.ndarray, kind: str) -> np.ndarray:
+        """Вычисляет 256-уровневую гистограмму через np.bincount."""
+        values = luma_provider.get(image_array) if kind == 'luma' else color_channels(image_array)
+        return np.bincount(to_histogram_levels(values).ravel(), minlength=256)
+
+
+# Общий экземпляр сервиса для преобразований и процессора
+image_statistics = ImageStatistics()
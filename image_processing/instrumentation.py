@@ -0,0 +1,278 @@
+"""
+Инструментирование горячих путей: время, память, пропускная способность и кэши.
+
+Операции (применение преобразования, загрузка и сохранение изображения,
+масштабирование для отображения, оценка качества) замеряются через
+instrumentation.measure(), попадания в кэши отмечаются через
+instrumentation.record_cache(). Накопленные значения доступны в виде словаря,
+JSON или текстового формата Prometheus.
+"""
+
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, Optional
+import numpy as np
+import logging
+
+from utils.profiling import TracedPeak
+
+logger = logging.getLogger(__name__)
+
+# Префикс имен метрик в формате Prometheus
+METRIC_PREFIX = "image_processing"
+
+
+def megapixels(image_array: Optional[np.ndarray]) -> float:
+    """
+    Размер изображения в мегапикселях.
+
+    Args:
+        image_array: Массив изображения (None - 0)
+
+    Returns:
+        float: Число мегапикселей
+    """
+    if image_array is None or image_array.ndim < 2:
+        return 0.0
+    return image_array.shape[0] * image_array.shape[1] / 1e6
+
+
+class Measurement:
+    """Замер одного вызова; размер входа можно указать внутри блока."""
+
+    __slots__ = ('megapixels',)
+
+    def __init__(self, megapixels: float = 0.0):
+        self.megapixels = megapixels
+
+
+class OperationStats:
+    """Накопленные показатели одной операции."""
+
+    def __init__(self):
+        """Инициализация показателей."""
+        self.calls = 0
+        self.errors = 0
+        self.wall_time = 0.0
+        self.max_wall_time = 0.0
+        self.cpu_time = 0.0
+        self.megapixels = 0.0
+        self.allocated_bytes = 0
+        self.max_allocated_bytes = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает показатели в виде словаря.
+
+        Returns:
+            Dict[str, Any]: Показатели и производные величины (среднее время, Мп/с)
+        """
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'wall_time': self.wall_time,
+            'max_wall_time': self.max_wall_time,
+            'mean_wall_time': self.wall_time / self.calls if self.calls else 0.0,
+            'cpu_time': self.cpu_time,
+            'megapixels': self.megapixels,
+            'megapixels_per_second': self.megapixels / self.wall_time if self.wall_time > 0 else 0.0,
+            'allocated_bytes': self.allocated_bytes,
+            'max_allocated_bytes': self.max_allocated_bytes,
+        }
+
+
+class InstrumentationRegistry:
+    """
+    Реестр показателей в пределах процесса.
+
+    Время и число вызовов собираются всегда: замер стоит два вызова таймера.
+    Учет выделенной памяти через tracemalloc включается отдельно
+    (enable_allocation_tracking), так как замедляет выполнение. Учитывается
+    пик памяти сверх уровня на начало операции. Вложенные замеры не сбрасывают
+    пик внешних (см. utils.profiling.TracedPeak), но при одновременных замерах
+    в нескольких потоках учитываются выделения всех потоков.
+    """
+
+    def __init__(self):
+        """Инициализация реестра."""
+        self._lock = threading.Lock()
+        self._operations: Dict[str, OperationStats] = {}
+        self._cache_hits: Dict[str, int] = {}
+        self._cache_misses: Dict[str, int] = {}
+        self.track_allocations = False
+        self._started_tracemalloc = False
+
+    def enable_allocation_tracking(self) -> None:
+        """Включает учет выделенной памяти (запускает tracemalloc при необходимости)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.track_allocations = True
+
+    def disable_allocation_tracking(self) -> None:
+        """Выключает учет выделенной памяти."""
+        self.track_allocations = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def measure(self, operation: str, megapixels: float = 0.0) -> Iterator[Measurement]:
+        """
+        Замеряет выполнение блока кода.
+
+        Args:
+            operation: Название операции (например, "transform.GaussianFilter")
+            megapixels: Размер входа в мегапикселях
+
+        Yields:
+            Measurement: Замер; его megapixels можно уточнить внутри блока
+        """
+        measurement = Measurement(megapixels)
+        track_allocations = self.track_allocations and tracemalloc.is_tracing()
+        traced_peak = TracedPeak() if track_allocations else nullcontext()
+        if track_allocations:
+            start_memory = tracemalloc.get_traced_memory()[0]
+
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        failed = False
+        try:
+            with traced_peak:
+                yield measurement
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            wall_time = time.perf_counter() - start_wall
+            cpu_time = time.thread_time() - start_cpu
+            allocated = 0
+            if track_allocations:
+                allocated = max(0, traced_peak.peak - start_memory)
+            self._record(operation, wall_time, cpu_time, measurement.megapixels, allocated, failed)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """
+        Отмечает обращение к кэшу.
+
+        Args:
+            cache: Название кэша
+            hit: True при попадании
+        """
+        counters = self._cache_hits if hit else self._cache_misses
+        with self._lock:
+            counters[cache] = counters.get(cache, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Возвращает копию всех показателей.
+
+        Returns:
+            Dict[str, Any]: Показатели операций и счетчики кэшей
+        """
+        with self._lock:
+            operations = {name: stats.to_dict() for name, stats in self._operations.items()}
+            caches = {
+                cache: {'hits': self._cache_hits.get(cache, 0), 'misses': self._cache_misses.get(cache, 0)}
+                for cache in sorted(set(self._cache_hits) | set(self._cache_misses))
+            }
+        return {'operations': operations, 'caches': caches}
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Краткая сводка для информации об изображении.
+
+        Returns:
+            Dict[str, Any]: Число вызовов, среднее время (мс) и Мп/с по операциям,
+            доля попаданий по кэшам
+        """
+        snapshot = self.snapshot()
+        operations = {
+            name: {
+                'calls': stats['calls'],
+                'mean_ms': round(stats['mean_wall_time'] * 1000, 3),
+                'megapixels_per_second': round(stats['megapixels_per_second'], 3),
+            }
+            for name, stats in snapshot['operations'].items()
+        }
+        caches = {}
+        for cache, counters in snapshot['caches'].items():
+            total = counters['hits'] + counters['misses']
+            caches[cache] = round(counters['hits'] / total, 3) if total else 0.0
+        return {'operations': operations, 'cache_hit_rate': caches}
+
+    def to_json(self) -> str:
+        """
+        Экспортирует показатели в JSON.
+
+        Returns:
+            str: JSON-документ
+        """
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Экспортирует показатели в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст метрик
+        """
+        snapshot = self.snapshot()
+        metrics = [
+            ('operation_calls_total', 'counter', 'Число вызовов операции', 'calls'),
+            ('operation_errors_total', 'counter', 'Число вызовов, завершившихся исключением', 'errors'),
+            ('operation_wall_seconds_total', 'counter', 'Суммарное время выполнения', 'wall_time'),
+            ('operation_cpu_seconds_total', 'counter', 'Суммарное процессорное время потока', 'cpu_time'),
+            ('operation_megapixels_total', 'counter', 'Суммарный размер входа в мегапикселях', 'megapixels'),
+            ('operation_allocated_bytes_total', 'counter', 'Суммарный пик выделенной памяти', 'allocated_bytes'),
+        ]
+
+        lines = []
+        for metric, metric_type, description, field in metrics:
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for operation, stats in sorted(snapshot['operations'].items()):
+                lines.append(f'{name}{{operation="{_escape_label(operation)}"}} {stats[field]}')
+
+        for metric, key in (('cache_hits_total', 'hits'), ('cache_misses_total', 'misses')):
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# TYPE {name} counter")
+            for cache, counters in snapshot['caches'].items():
+                lines.append(f'{name}{{cache="{_escape_label(cache)}"}} {counters[key]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Сбрасывает все показатели."""
+        with self._lock:
+            self._operations.clear()
+            self._cache_hits.clear()
+            self._cache_misses.clear()
+
+    def _record(self, operation: str, wall_time: float, cpu_time: float,
+                megapixels: float, allocated: int, failed: bool) -> None:
+        """Добавляет результат замера к показателям операции."""
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = OperationStats()
+            stats.calls += 1
+            stats.errors += int(failed)
+            stats.wall_time += wall_time
+            stats.max_wall_time = max(stats.max_wall_time, wall_time)
+            stats.cpu_time += cpu_time
+            stats.megapixels += megapixels
+            stats.allocated_bytes += allocated
+            stats.max_allocated_bytes = max(stats.max_allocated_bytes, allocated)
+
+
+def _escape_label(value: str) -> str:
+    """Экранирует значение метки Prometheus."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Общий реестр для всего приложения
+instrumentation = InstrumentationRegistry()
@@ -0,0 +1,131 @@
+"""
+Кэшируемое преобразование изображения в яркость (grayscale).
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+import numpy as np
+import logging
+
+from .instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Стандарты коэффициентов яркости
+LUMA_BT601 = "bt601"
+LUMA_BT709 = "bt709"
+
+LUMA_COEFFICIENTS = {
+    LUMA_BT601: (0.299, 0.587, 0.114),
+    LUMA_BT709: (0.2126, 0.7152, 0.0722),
+}
+
+# Целочисленные веса с фиксированной точкой (сумма 256, сдвиг на 8 бит).
+# Максимум 255 * 256 + 128 помещается в uint16.
+LUMA_SHIFT = 8
+LUMA_FIXED_WEIGHTS = {
+    LUMA_BT601: (77, 150, 29),
+    LUMA_BT709: (54, 183, 19),
+}
+
+
+class LumaProvider:
+    """
+    Поставщик яркости изображения.
+
+    Яркость uint8-изображения вычисляется в целых числах (умножение в uint16
+    и сдвиг, для uint16-изображений - в uint32) один раз для каждого массива и стандарта и кэшируется, пока
+    массив существует. Возвращаемый массив общий, его нельзя изменять на месте.
+    Кэш защищен блокировкой; яркость вычисляется вне нее.
+    """
+
+    def __init__(self, standard: str = LUMA_BT601, max_entries: int = 4):
+        """
+        Инициализация поставщика.
+
+        Args:
+            standard: Стандарт коэффициентов по умолчанию (bt601, bt709)
+            max_entries: Максимальное число кэшированных массивов яркости
+        """
+        if standard not in LUMA_COEFFICIENTS:
+            raise ValueError(f"Неизвестный стандарт яркости: {standard}")
+        self.standard = standard
+        self.max_entries = max_entries
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, image_array: np.ndarray, standard: Optional[str] = None) -> np.ndarray:
+        """
+        Возвращает яркость изображения.
+
+        Args:
+            image_array: Массив изображения (цветной или в оттенках серого)
+            standard: Стандарт коэффициентов (None - стандарт по умолчанию)
+
+        Returns:
+            np.ndarray: Двумерный массив яркости (того же типа для uint8 и uint16)
+        """
+        if image_array.ndim < 3:
+            return image_array
+        if image_array.shape[2] < 3:
+            # Оттенки серого с альфа-каналом (LA): яркость - первый канал
+            return image_array[..., 0]
+
+        standard = standard or self.standard
+        key = (id(image_array), standard)
+        with self._lock:
+            cached = self._cache.get(key)
+            hit = cached is not None and cached[0]() is image_array
+            if hit:
+                self._cache.move_to_end(key)
+        instrumentation.record_cache("luma", hit)
+        if hit:
+            return cached[1]
+
+        luma = self._compute(image_array, standard)
+        luma.flags.writeable = False
+        with self._lock:
+            self._cache[key] = (weakref.ref(image_array), luma)
+            if len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        logger.debug("Вычислена яркость (%s) для массива %s", standard, image_array.shape)
+        return luma
+
+    def invalidate(self, image_array: Optional[np.ndarray] = None):
+        """
+        Сбрасывает кэш для массива или целиком.
+
+        Args:
+            image_array: Массив, яркость которого устарела (None - весь кэш)
+        """
+        with self._lock:
+            if image_array is None:
+                self._cache.clear()
+                return
+            for key in [key for key in self._cache if key[0] == id(image_array)]:
+                del self._cache[key]
+
+    def _compute(self, image_array: np.ndarray, standard: str) -> np.ndarray:
+        """Вычисляет яркость."""
+        if standard not in LUMA_COEFFICIENTS:
+            raise ValueError(f"Неизвестный стандарт яркости: {standard}")
+
+        if image_array.dtype not in (np.uint8, np.uint16):
+            return np.dot(image_array[..., :3], LUMA_COEFFICIENTS[standard])
+
+        # Для 16-битных изображений сумма произведений накапливается в uint32
+        accumulator = np.uint16 if image_array.dtype == np.uint8 else np.uint32
+        weight_r, weight_g, weight_b = LUMA_FIXED_WEIGHTS[standard]
+        luma = image_array[..., 0].astype(accumulator) * weight_r
+        luma += image_array[..., 1].astype(accumulator) * weight_g
+        luma += image_array[..., 2].astype(accumulator) * weight_b
+        luma += 1 << (LUMA_SHIFT - 1)
+        luma >>= LUMA_SHIFT
+        return luma.astype(image_array.dtype)
+
+
+# Общий экземпляр для преобразований и статистик
+luma_provider = LumaProvider()
@@ -0,0 +1,120 @@
+"""
+Изображения с палитрой (режим 'P').
+
+np.array() для изображения с палитрой возвращает индексы палитры, а не
+цвета, поэтому обрабатывать такой массив напрямую нельзя. Поточечные
+преобразования (результат пикселя зависит только от его значения) вместо
+этого применяются к палитре из не более чем 256 записей: изображение не
+перебирается, кроме подсчета используемых индексов гистограммой PIL.
+Фильтрам, смешивающим соседние пиксели, изображение передается явно
+преобразованным в RGB (или RGBA при наличии прозрачности).
+"""
+
+from typing import Callable, Tuple
+import numpy as np
+from PIL import Image
+import logging
+
+logger = logging.getLogger(__name__)
+
+PALETTE_MODE = 'P'
+
+
+def is_palette_image(image: Image.Image) -> bool:
+    """
+    Проверяет, хранится ли изображение как индексы палитры.
+
+    Args:
+        image: Изображение PIL
+
+    Returns:
+        bool: True для режима 'P'
+    """
+    return image.mode == PALETTE_MODE
+
+
+def palette_conversion_mode(image: Image.Image) -> str:
+    """
+    Режим, в который изображение с палитрой преобразуется для фильтров.
+
+    Args:
+        image: Изображение с палитрой
+
+    Returns:
+        str: 'RGBA' при наличии прозрачности, иначе 'RGB'
+    """
+    has_transparency = 'transparency' in image.info or (
+        image.palette is not None and image.palette.mode == 'RGBA'
+    )
+    return 'RGBA' if has_transparency else 'RGB'
+
+
+def image_to_array(image: Image.Image) -> np.ndarray:
+    """
+    Преобразует изображение в массив цветов.
+
+    Изображение с палитрой явно преобразуется в RGB или RGBA,
+    остальные режимы передаются в np.array() без изменений.
+
+    Args:
+        image: Изображение PIL
+
+    Returns:
+        np.ndarray: Массив изображения
+    """
+    if is_palette_image(image):
+        return np.array(image.convert(palette_conversion_mode(image)))
+    return np.array(image)
+
+
+def palette_rawmode(image: Image.Image) -> str:
+    """Формат записей палитры: 'RGBA', если прозрачность хранится в палитре, иначе 'RGB'."""
+    return 'RGBA' if image.palette is not None and image.palette.mode == 'RGBA' else 'RGB'
+
+
+def palette_entries(image: Image.Image) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Возвращает палитру и индексы используемых записей.
+
+    Args:
+        image: Изображение с палитрой
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Палитра (N x 3 или N x 4, uint8) и индексы используемых записей
+    """
+    rawmode = palette_rawmode(image)
+    palette = np.array(image.getpalette(rawmode) or [], dtype=np.uint8).reshape(-1, len(rawmode))
+    # Гистограмма изображения 'P' - число пикселей для каждого индекса
+    counts = np.asarray(image.histogram()[:len(palette)])
+    return palette, np.flatnonzero(counts)
+
+
+def apply_to_palette(image: Image.Image, apply: Callable[[np.ndarray], np.ndarray]) -> Image.Image:
+    """
+    Применяет поточечное преобразование к палитре изображения.
+
+    Преобразованию передается массив 1 x K x 3 из цветов используемых
+    записей палитры: автоматические параметры, зависящие от максимума
+    уровней, вычисляются по цветам, которые есть в изображении.
+    Неиспользуемые записи и прозрачность сохраняются. Результат в оттенках
+    серого (бинарное преобразование) записывается во все три канала.
+
+    Args:
+        image: Изображение с палитрой
+        apply: Функция, преобразующая массив цветов
+
+    Returns:
+        Image.Image: Изображение с теми же индексами и новой палитрой
+    """
+    palette, used = palette_entries(image)
+    new_palette = palette.copy()
+    if used.size:
+        colors = apply(np.ascontiguousarray(palette[used, :3][np.newaxis]))
+        if colors.ndim == 2:
+            colors = np.repeat(colors[..., np.newaxis], 3, axis=2)
+        new_palette[used, :3] = colors.reshape(-1, 3)
+
+    result = image.copy()
+    result.putpalette(new_palette.ravel().tobytes(), palette_rawmode(image))
+    logger.debug("Преобразована палитра: %d из %d записей", used.size, len(palette))
+    return result
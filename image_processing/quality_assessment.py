@@ -3,9 +3,15 @@
 """
 
 import numpy as np
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 import logging
 
+from .bit_depth import dtype_max
+from .channels import color_channels
+from .colormaps import get_colormap
+from .instrumentation import instrumentation, megapixels
+from utils.profiling import profiled
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +26,8 @@ class QualityAssessment:
         """
         Вычисляет карту абсолютной разности между исходным и обработанным изображениями.
         
+        Альфа-канал (LA, RGBA) не сравнивается: карта строится по цветовым каналам.
+        
         Args:
             original: Исходное изображение
             processed: Обработанное изображение
@@ -32,18 +40,21 @@ class QualityAssessment:
             if original.shape != processed.shape:
                 raise ValueError("Изображения должны иметь одинаковые размеры")
             
-            # Вычисляем абсолютную разность
-            if len(original.shape) == 3:
-                # Цветное изображение - вычисляем разность для каждого канала
-                diff_map = np.zeros_like(original, dtype=np.float64)
-                for channel in range(original.shape[2]):
-                    diff_map[:, :, channel] = np.abs(original[:, :, channel].astype(np.float64) - 
-                                                    processed[:, :, channel].astype(np.float64))
-            else:
-                # Оттенки серого
-                diff_map = np.abs(original.astype(np.float64) - processed.astype(np.float64))
+            original = color_channels(original)
+            processed = color_channels(processed)
+            
+            # Вычисляем абсолютную разность за один проход по всем каналам
+            if original.dtype == np.uint8 and processed.dtype == np.uint8:
+                # Разность 8-битных значений помещается в int16
+                diff_map = original.astype(np.int16)
+                diff_map -= processed
+                np.abs(diff_map, out=diff_map)
+                return diff_map.astype(np.uint8)
             
-            return diff_map.astype(np.uint8)
+            # Другие типы: разность в шкале 0-255
+            maximum = max(dtype_max(original), dtype_max(processed))
+            diff_map = np.abs(original.astype(np.float64) - processed.astype(np.float64))
+            return np.clip(diff_map * (255.0 / maximum), 0, 255).astype(np.uint8)
             
         except Exception as e:
             logger.error(f"Ошибка при вычислении карты разности: {e}")
@@ -61,112 +72,125 @@ class QualityAssessment:
             Dict[str, Any]: Словарь с метриками качества
         """
         try:
-            # Вычисляем карту разности
-            diff_map = self.compute_absolute_difference_map(original, processed)
-            
-            # Базовые метрики
-            metrics = {
-                'mean_difference': float(np.mean(diff_map)),
-                'max_difference': int(np.max(diff_map)),
-                'std_difference': float(np.std(diff_map)),
-                'total_pixels': int(diff_map.size),
-                'high_difference_pixels': int(np.sum(diff_map > 50)),  # Пиксели с большой разностью
-                'medium_difference_pixels': int(np.sum((diff_map > 20) & (diff_map <= 50))),
-                'low_difference_pixels': int(np.sum(diff_map <= 20))
-            }
-            
-            # Процентные метрики
-            total_pixels = metrics['total_pixels']
-            metrics['high_difference_percent'] = (metrics['high_difference_pixels'] / total_pixels) * 100
-            metrics['medium_difference_percent'] = (metrics['medium_difference_pixels'] / total_pixels) * 100
-            metrics['low_difference_percent'] = (metrics['low_difference_pixels'] / total_pixels) * 100
-            
-            # Оценка качества (чем меньше разность, тем лучше)
-            # Числовая оценка для математических операций (0-100)
-            if metrics['mean_difference'] < 10:
-                metrics['quality_rating'] = 90.0  # Отличное
-                metrics['quality_label'] = "Отличное"
-            elif metrics['mean_difference'] < 25:
-                metrics['quality_rating'] = 75.0  # Хорошее
-                metrics['quality_label'] = "Хорошее"
-            elif metrics['mean_difference'] < 50:
-                metrics['quality_rating'] = 60.0  # Удовлетворительное
-                metrics['quality_label'] = "Удовлетворительное"
-            else:
-                metrics['quality_rating'] = 30.0  # Плохое
-                metrics['quality_label'] = "Плохое"
-            
-            return metrics
+            with instrumentation.measure("quality.metrics", megapixels(original)):
+                # Вычисляем карту разности
+                diff_map = self.compute_absolute_difference_map(original, processed)
+                
+                # Базовые метрики
+                metrics = {
+                    'mean_difference': float(np.mean(diff_map)),
+                    'max_difference': int(np.max(diff_map)),
+                    'std_difference': float(np.std(diff_map)),
+                    'total_pixels': int(diff_map.size),
+                    'high_difference_pixels': int(np.sum(diff_map > 50)),  # Пиксели с большой разностью
+                    'medium_difference_pixels': int(np.sum((diff_map > 20) & (diff_map <= 50))),
+                    'low_difference_pixels': int(np.sum(diff_map <= 20))
+                }
+                
+                # Процентные метрики
+                total_pixels = metrics['total_pixels']
+                metrics['high_difference_percent'] = (metrics['high_difference_pixels'] / total_pixels) * 100
+                metrics['medium_difference_percent'] = (metrics['medium_difference_pixels'] / total_pixels) * 100
+                metrics['low_difference_percent'] = (metrics['low_difference_pixels'] / total_pixels) * 100
+                
+                # Оценка качества (чем меньше разность, тем лучше)
+                # Числовая оценка для математических операций (0-100)
+                if metrics['mean_difference'] < 10:
+                    metrics['quality_rating'] = 90.0  # Отличное
+                    metrics['quality_label'] = "Отличное"
+                elif metrics['mean_difference'] < 25:
+                    metrics['quality_rating'] = 75.0  # Хорошее
+                    metrics['quality_label'] = "Хорошее"
+                elif metrics['mean_difference'] < 50:
+                    metrics['quality_rating'] = 60.0  # Удовлетворительное
+                    metrics['quality_label'] = "Удовлетворительное"
+                else:
+                    metrics['quality_rating'] = 30.0  # Плохое
+                    metrics['quality_label'] = "Плохое"
+                
+                return metrics
             
         except Exception as e:
             logger.error(f"Ошибка при вычислении метрик качества: {e}")
             raise
     
-    def create_visualization_map(self, diff_map: np.ndarray, colormap: str = 'hot') -> np.ndarray:
+    def create_visualization_map(self, diff_map: np.ndarray, colormap: str = 'hot',
+                                 max_size: Optional[Tuple[int, int]] = None) -> np.ndarray:
         """
         Создает визуализацию карты разности с цветовой схемой.
         
+        Нормализация к максимуму и раскраска объединяются в одну таблицу
+        256x3, которая применяется одной выборкой по индексам.
+        
         Args:
-            diff_map: Карта абсолютной разности
-            colormap: Цветовая схема ('hot', 'cool', 'gray')
+            diff_map: Карта абсолютной разности (uint8)
+            colormap: Цветовая схема ('hot', 'cool', 'gray', 'viridis', 'magma')
+            max_size: Максимальный размер (ширина, высота) для отображения;
+                      карта уменьшается до раскраски (None - полное разрешение)
             
         Returns:
             np.ndarray: Визуализированная карта
         """
         try:
-            # Нормализуем карту к диапазону 0-255
-            if np.max(diff_map) > 0:
-                normalized_map = (diff_map.astype(np.float64) / np.max(diff_map) * 255).astype(np.uint8)
-            else:
-                normalized_map = diff_map.copy()
+            if diff_map.dtype != np.uint8:
+                diff_map = np.clip(diff_map, 0, 255).astype(np.uint8)
+            if max_size is not None:
+                diff_map = self._reduce_for_display(diff_map, max_size)
             
-            if colormap == 'hot':
-                # Горячая цветовая схема (черный -> красный -> желтый -> белый)
-                return self._apply_hot_colormap(normalized_map)
-            elif colormap == 'cool':
-                # Холодная цветовая схема (черный -> синий -> голубой -> белый)
-                return self._apply_cool_colormap(normalized_map)
+            # Таблица нормализации к диапазону 0-255
+            maximum = int(diff_map.max()) if diff_map.size else 0
+            levels = np.arange(256, dtype=np.int32)
+            if maximum > 0:
+                scale = np.minimum(levels * 255 // maximum, 255).astype(np.uint8)
             else:
-                # Серая схема
-                return np.stack([normalized_map] * 3, axis=-1) if len(normalized_map.shape) == 2 else normalized_map
+                scale = levels.astype(np.uint8)
+            
+            if diff_map.ndim == 3:
+                # Цветная карта разности нормализуется без раскраски
+                return scale[diff_map]
+            return get_colormap(colormap)[scale][diff_map]
                 
         except Exception as e:
             logger.error(f"Ошибка при создании визуализации: {e}")
             raise
     
-    def _apply_hot_colormap(self, normalized_map: np.ndarray) -> np.ndarray:
-        """Применяет горячую цветовую схему."""
-        if len(normalized_map.shape) == 2:
-            # Оттенки серого -> RGB
-            result = np.zeros((*normalized_map.shape, 3), dtype=np.uint8)
-            
-            # Красный канал
-            result[:, :, 0] = np.clip(normalized_map * 3, 0, 255)
-            # Зеленый канал  
-            result[:, :, 1] = np.clip((normalized_map - 85) * 3, 0, 255)
-            # Синий канал
-            result[:, :, 2] = np.clip((normalized_map - 170) * 3, 0, 255)
+    def compute_difference_preview(self, original: np.ndarray, processed: np.ndarray,
+                                   max_size: Tuple[int, int], colormap: str = 'hot') -> np.ndarray:
+        """
+        Вычисляет и раскрашивает карту разности сразу в разрешении отображения.
+        
+        Args:
+            original: Исходное изображение
+            processed: Обработанное изображение
+            max_size: Максимальный размер (ширина, высота)
+            colormap: Цветовая схема
             
-            return result
-        else:
-            return normalized_map
+        Returns:
+            np.ndarray: Визуализированная карта не больше max_size
+        """
+        diff_map = self.compute_absolute_difference_map(original, processed)
+        return self.create_visualization_map(diff_map, colormap, max_size)
     
-    def _apply_cool_colormap(self, normalized_map: np.ndarray) -> np.ndarray:
-        """Применяет холодную цветовую схему."""
-        if len(normalized_map.shape) == 2:
-            # Оттенки серого -> RGB
-            result = np.zeros((*normalized_map.shape, 3), dtype=np.uint8)
-            
-            # Синий канал
-            result[:, :, 2] = np.clip(normalized_map * 3, 0, 255)
-            # Зеленый канал
-            result[:, :, 1] = np.clip((normalized_map - 85) * 3, 0, 255)
-            # Красный канал
-            result[:, :, 0] = np.clip((normalized_map - 170) * 3, 0, 255)
-            
-            return result
-        else:
-            return normalized_map
+    def _reduce_for_display(self, diff_map: np.ndarray, max_size: Tuple[int, int]) -> np.ndarray:
+        """
+        Уменьшает карту разности целым шагом, беря максимум в каждом блоке.
+        
+        Максимум, в отличие от усреднения, сохраняет заметными
+        небольшие области с большой разностью.
+        """
+        height, width = diff_map.shape[:2]
+        step = max(-(-width // max_size[0]), -(-height // max_size[1]), 1)
+        if step == 1:
+            return diff_map
+        
+        # Неполные блоки у правого и нижнего краев дополняются нулями
+        pad_height, pad_width = -height % step, -width % step
+        if pad_height or pad_width:
+            padding = ((0, pad_height), (0, pad_width)) + ((0, 0),) * (diff_map.ndim - 2)
+            diff_map = np.pad(diff_map, padding)
+        blocks = diff_map.reshape(diff_map.shape[0] // step, step, diff_map.shape[1] // step, step,
+                                  *diff_map.shape[2:])
+        return blocks.max(axis=(1, 3))
     
     def format_quality_report(self, metrics: Dict[str, Any]) -> str:
         """
@@ -203,6 +227,7 @@ class FilterQualityComparator:
         self.quality_assessor = QualityAssessment()
         self.comparison_results = {}
     
+    @profiled("quality.compare_filters")
     def compare_filters(self, original: np.ndarray, filter_results: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
         """
         Сравнивает качество различных фильтров.
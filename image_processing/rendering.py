@@ -0,0 +1,49 @@
+"""
+Расчет преобразования изображения PIL без изменения состояния приложения.
+
+Используется окнами GUI для фонового расчета: функция не обращается к Tk
+и не изменяет общих объектов, поэтому может выполняться в рабочем потоке,
+а результат сохраняется в потоке Tk после завершения расчета.
+"""
+
+from typing import Any, Dict, Optional
+import numpy as np
+from PIL import Image
+
+from .factories.transform_factory import TransformFactory
+from .palette import is_palette_image, apply_to_palette, image_to_array
+from .transforms.progress import ProgressContext
+
+
+def render_transform(source_image: Image.Image, transform_type: str, params: Dict[str, Any],
+                     progress: Optional[ProgressContext] = None) -> Image.Image:
+    """
+    Рассчитывает преобразование изображения.
+
+    Поточечные преобразования изображения с палитрой меняют только палитру,
+    остальные применяются к массиву цветов.
+
+    Args:
+        source_image: Исходное изображение (должно быть загружено заранее:
+                      PIL не допускает параллельного декодирования файла)
+        transform_type: Название преобразования
+        params: Параметры преобразования
+        progress: Контекст прогресса и отмены (необязательно)
+
+    Returns:
+        Image.Image: Обработанное изображение
+
+    Raises:
+        TransformCancelled: Если выполнение отменено через контекст
+    """
+    transform = TransformFactory.create_transform(transform_type)
+
+    if is_palette_image(source_image) and transform.pointwise:
+        return apply_to_palette(source_image, lambda colors: transform.execute(colors, progress, **params).image)
+
+    processed_array = transform.execute(image_to_array(source_image), progress, **params).image
+
+    if len(processed_array.shape) == 3 or processed_array.dtype != np.uint8:
+        # 16-битный результат в оттенках серого сохраняет режим I;16
+        return Image.fromarray(processed_array)
+    return Image.fromarray(processed_array, mode='L')
@@ -2,15 +2,23 @@
 Модуль для сравнения фильтров резкости с различными параметрами.
 """
 
+import math
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
+from .bit_depth import dtype_max, thumbnail_array
 from .transforms.sharpness_filters import UnsharpMasking
+from .transforms.kernels import gaussian_kernel_size
 from .quality_assessment import QualityAssessment
+from utils.profiling import profiled
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Отношение золотого сечения для поиска λ
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+
+
 class SharpnessComparator:
     """Класс для сравнения различных фильтров резкости."""
     
@@ -19,9 +27,11 @@ class SharpnessComparator:
         self.quality_assessor = QualityAssessment()
         self.comparison_results = {}
     
+    @profiled("sharpness.compare_sharpness_filters")
     def compare_sharpness_filters(self, original_image: np.ndarray, 
                                  kernel_sizes: List[int] = [3, 5, 7], 
-                                 lambda_values: List[float] = [0.5, 1.0, 1.5, 2.0]) -> Dict[str, Any]:
+                                 lambda_values: List[float] = [0.5, 1.0, 1.5, 2.0],
+                                 search_mode: str = "grid") -> Dict[str, Any]:
         """
         Сравнивает фильтры резкости с различными параметрами.
         
@@ -29,11 +39,25 @@ class SharpnessComparator:
             original_image: Исходное изображение
             kernel_sizes: Список размеров ядер для сравнения
             lambda_values: Список значений λ для сравнения
+            search_mode: Режим поиска ("grid" - полная сетка,
+                         "coarse_to_fine" - поиск от грубого к точному;
+                         диапазон σ берется из размеров ядра по правилу 3σ)
             
         Returns:
             Dict[str, Any]: Результаты сравнения
         """
-        logger.info(f"Начинаем сравнение фильтров резкости для {len(kernel_sizes)} размеров ядра и {len(lambda_values)} значений λ")
+        if search_mode == "coarse_to_fine":
+            # Окно k по правилу 3σ соответствует σ = (k - 1) / 6
+            return self.optimize_sharpness_parameters(
+                original_image,
+                sigma_range=((min(kernel_sizes) - 1) / 6, (max(kernel_sizes) - 1) / 6),
+                lambda_range=(min(lambda_values), max(lambda_values))
+            )
+        if search_mode != "grid":
+            raise ValueError(f"Неизвестный режим поиска: {search_mode}")
+        
+        logger.info("Начинаем сравнение фильтров резкости для %d размеров ядра и %d значений λ",
+                    len(kernel_sizes), len(lambda_values))
         
         results = {
             'original_image': original_image,
@@ -64,7 +88,7 @@ class SharpnessComparator:
                     results['filter_results'][filter_name] = sharpened_image
                     results['quality_metrics'][filter_name] = quality_metrics
                     
-                    logger.info(f"Обработан фильтр {filter_name}: качество = {quality_metrics['quality_rating']}")
+                    logger.debug("Обработан фильтр %s: качество = %s", filter_name, quality_metrics['quality_rating'])
                     
                 except Exception as e:
                     logger.error(f"Ошибка при применении фильтра {filter_name}: {e}")
@@ -79,6 +103,244 @@ class SharpnessComparator:
         self.comparison_results = results
         return results
     
+    def optimize_sharpness_parameters(self, original_image: np.ndarray,
+                                      sigma_range: Tuple[float, float] = (0.5, 3.0),
+                                      lambda_range: Tuple[float, float] = (0.1, 3.0),
+                                      sigma_steps: int = 6,
+                                      proxy_size: int = 128,
+                                      top_candidates: int = 3,
+                                      lambda_tolerance: float = 0.05,
+                                      clip_penalty: float = 10.0) -> Dict[str, Any]:
+        """
+        Ищет оптимальные параметры нерезкого маскирования от грубого к точному.
+        
+        Размытие нерезкой маски определяется только σ (окно строится по
+        правилу 3σ), поэтому поиск ведется по σ и λ. λ ищется непрерывно
+        методом золотого сечения, значения σ из геометрической сетки отбираются
+        последовательным делением пополам (successive halving). Промежуточные
+        оценки выполняются на уменьшенной копии изображения с σ, уменьшенным
+        в том же масштабе. Лучшие кандидаты подтверждаются на полном
+        разрешении, и для лучшего из них λ уточняется на полном разрешении.
+        
+        Args:
+            original_image: Исходное изображение
+            sigma_range: Диапазон σ размытия (включительно)
+            lambda_range: Диапазон значений λ
+            sigma_steps: Количество значений σ в сетке
+            proxy_size: Максимальная сторона уменьшенной копии
+            top_candidates: Количество кандидатов для проверки на полном разрешении
+            lambda_tolerance: Точность поиска λ
+            clip_penalty: Вес штрафа за пересвеченные/провалившиеся пиксели
+            
+        Returns:
+            Dict[str, Any]: Результаты поиска в формате compare_sharpness_filters
+        """
+        sigma_min, sigma_max = sigma_range
+        lambda_min, lambda_max = lambda_range
+        if sigma_min <= 0 or sigma_min > sigma_max or lambda_min > lambda_max or sigma_steps < 1:
+            raise ValueError("Неверные границы диапазона поиска")
+        
+        sigmas = sorted({round(float(sigma), 6) for sigma in np.geomspace(sigma_min, sigma_max, sigma_steps)})
+        
+        proxy_image = self._create_proxy_image(original_image, proxy_size)
+        proxy_scale = proxy_image.shape[1] / original_image.shape[1]
+        logger.info("Поиск параметров резкости: σ=%s, λ∈[%s, %s], копия %dx%d",
+                    sigmas, lambda_min, lambda_max, proxy_image.shape[1], proxy_image.shape[0])
+        
+        # Кэш оценок на уменьшенной копии: (σ, λ) -> оценка
+        proxy_scores: Dict[Tuple[float, float], float] = {}
+        
+        def evaluate_proxy(sigma: float, lambda_coeff: float) -> float:
+            key = (sigma, round(lambda_coeff, 6))
+            if key not in proxy_scores:
+                sharpened = self._unsharp_masking(proxy_image, sigma * proxy_scale, lambda_coeff)
+                proxy_scores[key] = self._sharpness_score(proxy_image, sharpened, clip_penalty)
+            return proxy_scores[key]
+        
+        # Successive halving: на каждом раунде точность поиска λ растет,
+        # а в следующий раунд проходит лучшая половина значений σ
+        survivors = list(sigmas)
+        iterations = 2
+        while True:
+            round_best = {}
+            for sigma in survivors:
+                round_best[sigma] = self._golden_section_search(
+                    lambda x: evaluate_proxy(sigma, x), lambda_min, lambda_max,
+                    lambda_tolerance, max_iterations=iterations
+                )
+            survivors.sort(key=lambda sigma: round_best[sigma][1], reverse=True)
+            if len(survivors) == 1:
+                break
+            survivors = survivors[:max(1, len(survivors) // 2)]
+            iterations *= 2
+        
+        # Подтверждаем на полном разрешении лучшие λ для лучших значений σ
+        best_per_sigma: Dict[float, Tuple[float, float]] = {}
+        for (sigma, lambda_coeff), score in proxy_scores.items():
+            if sigma not in best_per_sigma or score > best_per_sigma[sigma][1]:
+                best_per_sigma[sigma] = (lambda_coeff, score)
+        ranked = sorted(best_per_sigma.items(), key=lambda item: item[1][1], reverse=True)
+        candidates = [(sigma, lambda_coeff) for sigma, (lambda_coeff, _) in ranked[:max(1, top_candidates)]]
+        
+        results = {
+            'original_image': original_image,
+            'filter_results': {},
+            'quality_metrics': {},
+            'best_filters': {},
+            'comparison_summary': {},
+            'search_mode': 'coarse_to_fine',
+            'proxy_evaluations': len(proxy_scores),
+            'full_evaluations': 0,
+            'candidate_scores': {}
+        }
+        
+        def evaluate_full(sigma: float, lambda_coeff: float) -> Tuple[np.ndarray, float]:
+            sharpened = self._unsharp_masking(original_image, sigma, lambda_coeff)
+            results['full_evaluations'] += 1
+            return sharpened, self._sharpness_score(original_image, sharpened, clip_penalty)
+        
+        best_name = None
+        best_score = -np.inf
+        
+        def record(sigma: float, lambda_coeff: float, sharpened_image: np.ndarray, score: float):
+            nonlocal best_name, best_score
+            filter_name = f"σ={sigma:.2f}, λ={lambda_coeff:.2f}"
+            results['filter_results'][filter_name] = sharpened_image
+            results['quality_metrics'][filter_name] = self.quality_assessor.compute_quality_metrics(
+                original_image, sharpened_image
+            )
+            results['candidate_scores'][filter_name] = score
+            
+            if score > best_score:
+                best_score = score
+                best_name = filter_name
+                results['best_parameters'] = {
+                    'sigma': sigma,
+                    'lambda_coeff': lambda_coeff,
+                    'kernel_size': gaussian_kernel_size(sigma)
+                }
+        
+        for sigma, lambda_coeff in candidates:
+            try:
+                record(sigma, lambda_coeff, *evaluate_full(sigma, lambda_coeff))
+            except Exception as e:
+                logger.error(f"Ошибка при проверке кандидата σ={sigma:.2f}, λ={lambda_coeff:.2f}: {e}")
+                continue
+        
+        # Насыщение на копии и на исходном изображении наступает при разных λ,
+        # поэтому для лучшего σ λ уточняется на полном разрешении
+        if best_name is not None:
+            sigma = results['best_parameters']['sigma']
+            lambda_coeff, score = self._golden_section_search(
+                lambda x: evaluate_full(sigma, x)[1], lambda_min, lambda_max, lambda_tolerance
+            )
+            if score > best_score:
+                record(sigma, lambda_coeff, *evaluate_full(sigma, lambda_coeff))
+        
+        results['best_filters'] = self._find_best_filters(results['quality_metrics'])
+        if best_name is not None:
+            results['best_filters']['best_score'] = best_name
+        results['comparison_summary'] = self._create_comparison_summary(results)
+        
+        logger.info("Поиск завершен: %d оценок на копии, %d на полном разрешении, лучший: %s",
+                    results['proxy_evaluations'], results['full_evaluations'], best_name)
+        
+        self.comparison_results = results
+        return results
+    
+    def _golden_section_search(self, objective, low: float, high: float, tolerance: float,
+                               max_iterations: Optional[int] = None) -> Tuple[float, float]:
+        """
+        Ищет максимум унимодальной функции методом золотого сечения.
+        
+        Args:
+            objective: Целевая функция одного аргумента
+            low: Нижняя граница поиска
+            high: Верхняя граница поиска
+            tolerance: Ширина интервала, при которой поиск останавливается
+            max_iterations: Максимальное число сужений интервала
+            
+        Returns:
+            Tuple[float, float]: Лучшая точка и значение функции в ней
+        """
+        x1 = high - GOLDEN_RATIO * (high - low)
+        x2 = low + GOLDEN_RATIO * (high - low)
+        f1, f2 = objective(x1), objective(x2)
+        
+        iteration = 0
+        while high - low > tolerance and (max_iterations is None or iteration < max_iterations):
+            if f1 >= f2:
+                high, x2, f2 = x2, x1, f1
+                x1 = high - GOLDEN_RATIO * (high - low)
+                f1 = objective(x1)
+            else:
+                low, x1, f1 = x1, x2, f2
+                x2 = low + GOLDEN_RATIO * (high - low)
+                f2 = objective(x2)
+            iteration += 1
+        
+        return (x1, f1) if f1 >= f2 else (x2, f2)
+    
+    def _create_proxy_image(self, image: np.ndarray, max_size: int) -> np.ndarray:
+        """
+        Создает уменьшенную копию изображения для грубой оценки параметров.
+        
+        Args:
+            image: Исходное изображение
+            max_size: Максимальная сторона копии
+            
+        Returns:
+            np.ndarray: Уменьшенная копия того же типа (или исходное изображение, если оно меньше)
+        """
+        return thumbnail_array(image, (max_size, max_size))
+    
+    def _unsharp_masking(self, image: np.ndarray, sigma: float, lambda_coeff: float) -> np.ndarray:
+        """
+        Применяет нерезкое маскирование с окном по правилу 3σ.
+        
+        Args:
+            image: Массив изображения
+            sigma: Стандартное отклонение размытия
+            lambda_coeff: Коэффициент усиления резкости (λ)
+            
+        Returns:
+            np.ndarray: Изображение с повышенной резкостью
+        """
+        return UnsharpMasking(
+            kernel_size=gaussian_kernel_size(sigma), lambda_coeff=lambda_coeff, sigma=sigma
+        ).apply(image)
+    
+    def _sharpness_score(self, original: np.ndarray, sharpened: np.ndarray, clip_penalty: float) -> float:
+        """
+        Оценивает результат повышения резкости.
+        
+        Оценка растет с усилением перепадов яркости (логарифм отношения средних
+        градиентов) и уменьшается пропорционально доле пикселей, которые
+        фильтр увел в насыщение (0 или максимум диапазона изображения).
+        
+        Args:
+            original: Исходное изображение
+            sharpened: Изображение после повышения резкости
+            clip_penalty: Вес штрафа за насыщение
+            
+        Returns:
+            float: Оценка (чем больше, тем лучше)
+        """
+        def gradient_energy(image: np.ndarray) -> float:
+            image = image.astype(np.float32)
+            return float(np.mean(np.abs(np.diff(image, axis=0))) + np.mean(np.abs(np.diff(image, axis=1))))
+        
+        original_energy = gradient_energy(original)
+        if original_energy == 0:
+            return 0.0
+        gain = gradient_energy(sharpened) / original_energy
+        
+        maximum = dtype_max(original)
+        clipped = ((sharpened <= 0) | (sharpened >= maximum)) & (original > 0) & (original < maximum)
+        clipped_fraction = float(np.mean(clipped))
+        
+        return math.log(max(gain, 1e-6)) - clip_penalty * clipped_fraction
+    
     def _find_best_filters(self, quality_metrics: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
         """
         Находит лучшие фильтры по различным критериям.
@@ -231,7 +493,8 @@ class SharpnessComparator:
                 criterion_name = {
                     'best_overall': 'Общее качество',
                     'best_difference': 'Минимальная разность',
-                    'best_psnr': 'Максимальный PSNR'
+                    'best_psnr': 'Максимальный PSNR',
+                    'best_score': 'Оптимальная оценка резкости'
                 }.get(criterion, criterion)
                 recommendations.append(f"   • {criterion_name}: {filter_name}")
         
@@ -2,28 +2,73 @@
 Менеджер для управления преобразованиями изображений.
 """
 
-from typing import Dict, Any, Optional, Type
+from typing import Dict, Any, NamedTuple, Optional, Type
 import numpy as np
 import logging
 
 from .transforms.base_transform import BaseTransform
+from .transforms.progress import ProgressContext
 from .factories.transform_factory import TransformFactory
+from utils.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
 
+class TransformCall(NamedTuple):
+    """Запись о завершенном применении преобразования."""
+    transform_name: str
+    parameters: Dict[str, Any]
+    # Параметры, сохраненные самим преобразованием в этом вызове
+    detailed_parameters: Optional[Dict[str, Any]]
+
+
 class TransformManager:
-    """Класс для управления преобразованиями изображений."""
+    """
+    Класс для управления преобразованиями изображений.
+    
+    Преобразования применяются через BaseTransform.execute, поэтому общий
+    экземпляр для каждого названия можно использовать из нескольких потоков.
+    Запись о последнем вызове заменяется целиком одним присваиванием.
+    """
     
     def __init__(self):
         """Инициализация менеджера преобразований."""
+        # Экземпляры создаются при первом обращении (см. get_transform)
         self.transforms: Dict[str, BaseTransform] = {}
-        self.last_transform_name: Optional[str] = None
-        self.last_parameters: Optional[Dict[str, Any]] = None
+        self.last_call: Optional[TransformCall] = None
+    
+    @property
+    def last_transform_name(self) -> Optional[str]:
+        """Название последнего примененного преобразования."""
+        last_call = self.last_call
+        return last_call.transform_name if last_call else None
+    
+    @property
+    def last_parameters(self) -> Optional[Dict[str, Any]]:
+        """Параметры последнего примененного преобразования."""
+        last_call = self.last_call
+        return last_call.parameters if last_call else None
+    
+    def get_transform(self, transform_name: str) -> BaseTransform:
+        """
+        Возвращает экземпляр преобразования, создавая его при первом обращении.
         
-        # Инициализируем доступные преобразования
-        for transform_name in TransformFactory.get_available_transforms():
-            self.transforms[transform_name] = TransformFactory.create_transform(transform_name)
+        Args:
+            transform_name: Название преобразования
+            
+        Returns:
+            BaseTransform: Экземпляр преобразования
+            
+        Raises:
+            ValueError: Если преобразование не найдено
+        """
+        transform = self.transforms.get(transform_name)
+        if transform is None:
+            # При одновременном первом обращении сохраняется один экземпляр
+            transform = self.transforms.setdefault(
+                transform_name, TransformFactory.create_transform(transform_name)
+            )
+        return transform
     
     def get_available_transforms(self) -> list[str]:
         """
@@ -34,13 +79,16 @@ class TransformManager:
         """
         return TransformFactory.get_available_transforms()
     
-    def apply_transform(self, transform_name: str, image_array: np.ndarray, **kwargs) -> np.ndarray:
+    @profiled("transform_manager.apply_transform")
+    def apply_transform(self, transform_name: str, image_array: np.ndarray,
+                        progress: Optional[ProgressContext] = None, **kwargs) -> np.ndarray:
         """
         Применяет указанное преобразование к изображению.
         
         Args:
             transform_name: Название преобразования
             image_array: Массив изображения
+            progress: Контекст прогресса и отмены (необязательно)
             **kwargs: Параметры преобразования
             
         Returns:
@@ -48,22 +96,47 @@ class TransformManager:
             
         Raises:
             ValueError: Если преобразование не найдено или параметры невалидны
+            TransformCancelled: Если выполнение отменено через контекст
         """
-        if transform_name not in self.transforms:
-            raise ValueError(f"Преобразование '{transform_name}' не найдено")
-        
-        transform = self.transforms[transform_name]
+        transform = self.get_transform(transform_name)
         
         # Валидируем параметры
         if not transform.validate_parameters(**kwargs):
             raise ValueError(f"Невалидные параметры для преобразования '{transform_name}'")
         
+        # Применяем преобразование на копии, не изменяя общий экземпляр
+        result = transform.execute(image_array, progress, **kwargs)
+        
         # Сохраняем информацию о последнем преобразовании
-        self.last_transform_name = transform_name
-        self.last_parameters = kwargs.copy()
+        self.last_call = TransformCall(transform_name, kwargs.copy(), result.parameters)
+        return result.image
+    
+    def apply_transform_preview(self, transform_name: str, image_array: np.ndarray,
+                                scale: float, **kwargs) -> np.ndarray:
+        """
+        Применяет преобразование к уменьшенной копии изображения для предпросмотра.
+        
+        В отличие от apply_transform не изменяет информацию о последнем
+        преобразовании: предпросмотр не является результатом обработки.
         
-        # Применяем преобразование
-        return transform.apply(image_array, **kwargs)
+        Args:
+            transform_name: Название преобразования
+            image_array: Массив уменьшенной копии изображения
+            scale: Масштаб копии относительно исходного изображения
+            **kwargs: Параметры преобразования для исходного изображения
+            
+        Returns:
+            np.ndarray: Преобразованный массив уменьшенной копии
+            
+        Raises:
+            ValueError: Если преобразование не найдено или параметры невалидны
+        """
+        transform = self.get_transform(transform_name)
+        
+        if not transform.validate_parameters(**kwargs):
+            raise ValueError(f"Невалидные параметры для преобразования '{transform_name}'")
+        
+        return transform.apply_preview(image_array, scale, **kwargs)
     
     def get_optimal_parameters(self, transform_name: str, image_array: np.ndarray) -> Dict[str, Any]:
         """
@@ -79,10 +152,7 @@ class TransformManager:
         Raises:
             ValueError: Если преобразование не найдено
         """
-        if transform_name not in self.transforms:
-            raise ValueError(f"Преобразование '{transform_name}' не найдено")
-        
-        transform = self.transforms[transform_name]
+        transform = self.get_transform(transform_name)
         return transform.get_optimal_parameters(image_array)
     
     def get_last_transform_info(self) -> Dict[str, Any]:
@@ -94,15 +164,14 @@ class TransformManager:
         """
         info = {}
         
-        if self.last_transform_name:
-            info['transform_name'] = self.last_transform_name
-            info['parameters'] = self.last_parameters
+        last_call = self.last_call
+        if last_call:
+            info['transform_name'] = last_call.transform_name
+            info['parameters'] = last_call.parameters
             
-            # Получаем детальную информацию от самого преобразования
-            transform = self.transforms[self.last_transform_name]
-            last_params = transform.get_last_parameters()
-            if last_params:
-                info['detailed_parameters'] = last_params
+            # Детальная информация, сохраненная преобразованием в этом вызове
+            if last_call.detailed_parameters:
+                info['detailed_parameters'] = last_call.detailed_parameters
         
         return info
     
@@ -115,8 +184,8 @@ class TransformManager:
             transform_class: Класс преобразования
         """
         TransformFactory.register_transform(name, transform_class)
-        self.transforms[name] = TransformFactory.create_transform(name)
-        logger.info(f"Зарегистрировано преобразование: {name}")
+        self.transforms.pop(name, None)
+        logger.info("Зарегистрировано преобразование: %s", name)
     
     def get_transform_info(self, transform_name: str) -> Dict[str, Any]:
         """
@@ -131,11 +200,14 @@ class TransformManager:
         Raises:
             ValueError: Если преобразование не найдено
         """
-        if transform_name not in self.transforms:
-            raise ValueError(f"Преобразование '{transform_name}' не найдено")
-        
-        transform = self.transforms[transform_name]
+        transform = self.get_transform(transform_name)
+        # execute() не изменяет общий экземпляр, параметры хранятся в записи о вызове
+        last_call = self.last_call
+        if last_call is not None and last_call.transform_name == transform_name:
+            last_parameters = last_call.parameters
+        else:
+            last_parameters = transform.get_last_parameters()
         return {
             'name': transform.get_name(),
-            'last_parameters': transform.get_last_parameters()
+            'last_parameters': last_parameters
         }
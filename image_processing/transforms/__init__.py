@@ -2,7 +2,11 @@
 Модуль для алгоритмов преобразования изображений.
 """
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, TransformResult, alpha_aware
+from .progress import ProgressContext, TransformCancelled
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACE_YCBCR, COLOR_SPACE_HSV
+from ..channels import ALPHA_PASSTHROUGH, ALPHA_PREMULTIPLIED
+from .borders import BORDER_EDGE, BORDER_REFLECT, BORDER_WRAP, BORDER_CONSTANT
 from .logarithmic_transform import LogarithmicTransform
 from .power_transform import PowerTransform
 from .binary_transform import BinaryTransform
@@ -11,6 +15,19 @@ from .negative_transform import NegativeTransform
 
 __all__ = [
     'BaseTransform',
+    'TransformResult',
+    'alpha_aware',
+    'ProgressContext',
+    'TransformCancelled',
+    'COLOR_SPACE_RGB',
+    'COLOR_SPACE_YCBCR',
+    'COLOR_SPACE_HSV',
+    'ALPHA_PASSTHROUGH',
+    'ALPHA_PREMULTIPLIED',
+    'BORDER_EDGE',
+    'BORDER_REFLECT',
+    'BORDER_WRAP',
+    'BORDER_CONSTANT',
     'LogarithmicTransform', 
     'PowerTransform',
     'BinaryTransform',
@@ -2,17 +2,90 @@
 Базовый класс для алгоритмов преобразования изображений.
 """
 
+import copy
+import functools
 from abc import ABC, abstractmethod
-from typing import Optional, Any, Dict
+from typing import Callable, Optional, Any, Dict, NamedTuple
 import numpy as np
 from PIL import Image
 import logging
 
+from .progress import ProgressContext, NULL_PROGRESS
+from .borders import BORDER_EDGE, RegionFilter, filter_with_border, region_row_count, validate_border_mode
+from ..bit_depth import dtype_max, from_parameter_scale
+from ..channels import (
+    ALPHA_PASSTHROUGH, ALPHA_PREMULTIPLIED, ALPHA_MODES,
+    has_alpha, split_alpha, merge_alpha, premultiply, unpremultiply
+)
+from ..instrumentation import instrumentation, megapixels
+
 logger = logging.getLogger(__name__)
 
 
+class TransformResult(NamedTuple):
+    """Результат одного вызова преобразования."""
+    image: np.ndarray
+    # Параметры, сохраненные преобразованием в этом вызове (или None)
+    parameters: Optional[Dict[str, Any]]
+
+
+def alpha_aware(spatial: bool = False) -> Callable:
+    """
+    Декоратор apply(): преобразование применяется только к цветовым каналам.
+    
+    Декорированный apply() принимает необязательный параметр alpha_mode
+    (по умолчанию - атрибут alpha_mode объекта). В режиме passthrough
+    альфа-канал отделяется до вызова и возвращается без изменений. Режим
+    premultiplied действует только для пространственных фильтров (spatial):
+    точечное преобразование не смешивает соседние пиксели, и для него
+    режимы совпадают.
+    
+    Args:
+        spatial: Смешивает ли преобразование соседние пиксели
+        
+    Returns:
+        Callable: Декоратор
+    """
+    def decorator(apply: Callable) -> Callable:
+        @functools.wraps(apply)
+        def wrapper(self, image_array: np.ndarray, *args, alpha_mode: Optional[str] = None, **kwargs):
+            alpha_mode = alpha_mode or self.alpha_mode
+            if alpha_mode not in ALPHA_MODES:
+                raise ValueError(f"Неизвестный режим альфа-канала: {alpha_mode}")
+            if not has_alpha(image_array):
+                return apply(self, image_array, *args, **kwargs)
+            
+            if spatial and alpha_mode == ALPHA_PREMULTIPLIED:
+                return unpremultiply(apply(self, premultiply(image_array), *args, **kwargs))
+            
+            color, alpha = split_alpha(image_array)
+            return merge_alpha(apply(self, color, *args, **kwargs), alpha)
+        return wrapper
+    return decorator
+
+
 class BaseTransform(ABC):
-    """Базовый класс для всех алгоритмов преобразования изображений."""
+    """
+    Базовый класс для всех алгоритмов преобразования изображений.
+    
+    apply() может изменять состояние объекта (размер ядра, σ, последние
+    параметры). Для одновременного использования одного объекта из нескольких
+    потоков служит execute(): каждый вызов выполняется на собственной копии.
+    """
+    
+    # Контекст прогресса текущего вызова; долгие фильтры сообщают в него о каждой строке
+    progress: ProgressContext = NULL_PROGRESS
+    
+    # Обработка альфа-канала по умолчанию (см. alpha_aware)
+    alpha_mode: str = ALPHA_PASSTHROUGH
+    
+    # Результат пикселя зависит только от его значения: преобразование
+    # изображения с палитрой можно применить к самой палитре (см. palette.py)
+    pointwise: bool = False
+    
+    # Обработка краев фильтрами с окном (см. borders.py); значение - в шкале 0-255
+    border_mode: str = BORDER_EDGE
+    border_value: float = 0.0
     
     def __init__(self):
         """Инициализация базового преобразования."""
@@ -66,6 +139,168 @@ class BaseTransform(ABC):
         """
         return {}
     
+    def execute(self, image_array: np.ndarray, progress: Optional[ProgressContext] = None,
+                **kwargs) -> TransformResult:
+        """
+        Реентерабельно применяет преобразование.
+        
+        Параметры вызова, ядра и контекст прогресса хранятся в поверхностной
+        копии объекта (плане выполнения), поэтому исходный объект (включая
+        last_parameters) не изменяется и может одновременно использоваться
+        из нескольких потоков. Ядра берутся
+        из общего кэша и доступны только для чтения, поэтому копия дешевая.
+        
+        Args:
+            image_array: Массив изображения
+            progress: Контекст прогресса и отмены (необязательно)
+            **kwargs: Параметры преобразования
+            
+        Returns:
+            TransformResult: Результат и параметры этого вызова
+            
+        Raises:
+            TransformCancelled: Если выполнение отменено через контекст
+        """
+        plan = copy.copy(self)
+        plan.last_parameters = None
+        if progress is not None:
+            # Поточечные преобразования не проверяют отмену, поэтому устаревший
+            # расчет прерывается до начала работы
+            progress.check_cancelled()
+            plan.progress = progress
+        with instrumentation.measure(f"transform.{type(self).__name__}", megapixels(image_array)):
+            image = plan.apply(image_array, **kwargs)
+        
+        # Параметры возвращаются вместе с результатом: запись в общий объект
+        # из рабочих потоков гонялась бы с другими вызовами
+        return TransformResult(image, plan.last_parameters)
+    
+    def apply_with_progress(self, image_array: np.ndarray, progress: ProgressContext, **kwargs) -> np.ndarray:
+        """
+        Применяет преобразование с отчетом о прогрессе и возможностью отмены.
+        
+        Args:
+            image_array: Массив изображения
+            progress: Контекст прогресса и отмены
+            **kwargs: Параметры преобразования
+            
+        Returns:
+            np.ndarray: Преобразованный массив изображения
+            
+        Raises:
+            TransformCancelled: Если выполнение отменено через контекст
+        """
+        return self.execute(image_array, progress, **kwargs).image
+    
+    def _begin_row_progress(self, image: np.ndarray, radius: int, halo: Optional[int] = None) -> None:
+        """
+        Объявляет объем построчной работы: по шагу на строку каждой области каждого канала.
+        
+        Args:
+            image: Исходное изображение (без дополнения)
+            radius: Радиус окна фильтра
+            halo: Ширина дополнения краев (по умолчанию radius)
+        """
+        channels = image.shape[2] if len(image.shape) == 3 else 1
+        self.progress.begin(channels * region_row_count(image.shape[0], image.shape[1], radius, halo))
+    
+    def _update_border_parameters(self, kwargs: Dict[str, Any]) -> None:
+        """
+        Обновляет режим обработки краев из параметров вызова.
+        
+        Args:
+            kwargs: Параметры вызова (border_mode, border_value)
+            
+        Raises:
+            ValueError: Если режим неизвестен
+        """
+        if 'border_mode' in kwargs:
+            self.border_mode = validate_border_mode(kwargs['border_mode'])
+        if 'border_value' in kwargs:
+            self.border_value = kwargs['border_value']
+    
+    def _filter_with_border(self, image: np.ndarray, region_filter: RegionFilter, radius: int,
+                            halo: Optional[int] = None) -> np.ndarray:
+        """
+        Применяет фильтр с окном к каждому каналу с обработкой краев.
+        
+        Внутренняя область вычисляется по исходному массиву, дополняются
+        только полосы вдоль краев (см. borders.py).
+        
+        Args:
+            image: Исходное изображение
+            region_filter: Функция области для одного канала
+            radius: Радиус окна фильтра
+            halo: Ширина дополнения краев (по умолчанию radius)
+            
+        Returns:
+            np.ndarray: Результат в float64 той же формы, что и изображение
+        """
+        self._begin_row_progress(image, radius, halo)
+        value = from_parameter_scale(self.border_value, dtype_max(image))
+        
+        if len(image.shape) == 3:
+            # Цветное изображение
+            result = np.empty(image.shape, dtype=np.float64)
+            for channel in range(image.shape[2]):
+                result[:, :, channel] = filter_with_border(
+                    image[:, :, channel], region_filter, radius, self.border_mode, value, halo
+                )
+            return result
+        # Оттенки серого
+        return filter_with_border(image, region_filter, radius, self.border_mode, value, halo)
+    
+    def _to_source_range(self, result: np.ndarray, image_array: np.ndarray) -> np.ndarray:
+        """
+        Ограничивает результат диапазоном исходного изображения и приводит к его типу.
+        
+        Args:
+            result: Результат вычислений (обычно float64)
+            image_array: Исходный массив изображения (uint8, uint16 или float)
+            
+        Returns:
+            np.ndarray: Результат в типе исходного массива
+        """
+        return np.clip(result, 0, dtype_max(image_array)).astype(image_array.dtype)
+    
+    def get_preview_parameters(self, scale: float, **kwargs) -> Optional[Dict[str, Any]]:
+        """
+        Пересчитывает параметры для изображения, уменьшенного в масштабе scale.
+        
+        Точечные преобразования не зависят от масштаба, поэтому по умолчанию
+        параметры возвращаются без изменений. Фильтры с пространственным ядром
+        переопределяют метод и масштабируют размер ядра.
+        
+        Args:
+            scale: Масштаб уменьшенной копии относительно исходного изображения (0-1]
+            **kwargs: Параметры преобразования
+            
+        Returns:
+            Optional[Dict[str, Any]]: Параметры для уменьшенной копии или None,
+            если на этом масштабе преобразование вырождается в тождественное
+        """
+        return dict(kwargs)
+    
+    def apply_preview(self, image_array: np.ndarray, scale: float, **kwargs) -> np.ndarray:
+        """
+        Применяет преобразование к уменьшенной копии изображения для предпросмотра.
+        
+        Преобразование применяется к копии объекта, чтобы масштабированные
+        параметры не изменили состояние, используемое для полного разрешения.
+        
+        Args:
+            image_array: Массив уменьшенной копии изображения
+            scale: Масштаб копии относительно исходного изображения (0-1]
+            **kwargs: Параметры преобразования для исходного изображения
+            
+        Returns:
+            np.ndarray: Преобразованный массив уменьшенной копии
+        """
+        preview_parameters = self.get_preview_parameters(scale, **kwargs)
+        if preview_parameters is None:
+            return image_array.copy()
+        return copy.copy(self).apply(image_array, **preview_parameters)
+    
     def save_parameters(self, **kwargs) -> None:
         """
         Сохраняет использованные параметры.
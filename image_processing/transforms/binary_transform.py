@@ -6,7 +6,12 @@ import numpy as np
 from typing import Dict, Any
 import logging
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, alpha_aware
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACES, apply_levels, is_luminance_mode
+from ..bit_depth import PARAMETER_SCALE, dtype_max, from_parameter_scale
+from ..image_statistics import image_statistics
+from ..luma import luma_provider
+from ..auto_parameters import auto_parameters, THRESHOLD_OTSU
 
 logger = logging.getLogger(__name__)
 
@@ -14,13 +19,21 @@ logger = logging.getLogger(__name__)
 class BinaryTransform(BaseTransform):
     """Класс для бинарного преобразования изображений."""
     
-    def apply(self, image_array: np.ndarray, threshold: float, **kwargs) -> np.ndarray:
+    pointwise = True
+    
+    @alpha_aware()
+    def apply(self, image_array: np.ndarray, threshold: float,
+              color_space: str = COLOR_SPACE_RGB, **kwargs) -> np.ndarray:
         """
         Применяет бинарное преобразование к изображению.
         
+        В режиме RGB результат - изображение в оттенках серого. В режимах
+        YCbCr и HSV порог применяется к яркостному каналу, а цветность сохраняется.
+        
         Args:
             image_array: Массив изображения
-            threshold: Пороговое значение для бинарного преобразования (0-255)
+            threshold: Пороговое значение в шкале 0-255 при любой разрядности
+            color_space: Режим цветового пространства (rgb, ycbcr, hsv)
             **kwargs: Дополнительные параметры
             
         Returns:
@@ -28,22 +41,28 @@ class BinaryTransform(BaseTransform):
         """
         try:
             # Сохраняем параметры
-            self.save_parameters(threshold=threshold)
+            self.save_parameters(threshold=threshold, color_space=color_space)
             
-            logger.info(f"Применение бинарного преобразования с порогом = {threshold}")
+            logger.debug("Применение бинарного преобразования с порогом = %s", threshold)
             
-            # Конвертируем в grayscale если изображение цветное
-            if len(image_array.shape) == 3:
-                # Используем формулу для конвертации RGB в grayscale
-                gray_array = np.dot(image_array[...,:3], [0.2989, 0.5870, 0.1140])
-            else:
-                gray_array = image_array.copy()
+            if is_luminance_mode(image_array, color_space):
+                return apply_levels(
+                    image_array,
+                    lambda levels: (levels * PARAMETER_SCALE >= threshold).astype(np.float64),
+                    color_space
+                )
+            
+            # Яркость вычисляется один раз для изображения и берется из кэша
+            gray_array = luma_provider.get(image_array)
+            maximum = dtype_max(image_array)
             
             # Применяем бинарное преобразование
-            # Все пиксели выше порога становятся 255 (белые), ниже - 0 (черные)
-            binary_array = np.where(gray_array >= threshold, 255, 0).astype(np.uint8)
+            # Все пиксели выше порога становятся белыми (максимум типа), ниже - черными
+            binary_array = np.where(
+                gray_array >= from_parameter_scale(threshold, maximum), maximum, 0
+            ).astype(image_array.dtype)
             
-            logger.info("Бинарное преобразование успешно применено")
+            logger.debug("Бинарное преобразование успешно применено")
             return binary_array
             
         except Exception as e:
@@ -57,17 +76,19 @@ class BinaryTransform(BaseTransform):
     def validate_parameters(self, **kwargs) -> bool:
         """Валидирует параметры бинарного преобразования."""
         threshold = kwargs.get('threshold')
-        if threshold is not None and (threshold < 0 or threshold > 255):
+        if threshold is not None and (threshold < 0 or threshold > PARAMETER_SCALE):
+            return False
+        if kwargs.get('color_space', COLOR_SPACE_RGB) not in COLOR_SPACES:
             return False
         return True
     
-    def get_optimal_parameters(self, image_array: np.ndarray) -> Dict[str, Any]:
-        """Вычисляет оптимальные параметры для бинарного преобразования."""
-        # Используем среднее значение как оптимальный порог
-        if len(image_array.shape) == 3:
-            gray_array = np.dot(image_array[...,:3], [0.2989, 0.5870, 0.1140])
-        else:
-            gray_array = image_array.copy()
+    def get_optimal_parameters(self, image_array: np.ndarray, method: str = THRESHOLD_OTSU) -> Dict[str, Any]:
+        """
+        Вычисляет оптимальный порог по гистограмме яркости.
         
-        threshold = float(np.mean(gray_array))
+        Args:
+            image_array: Массив изображения
+            method: Метод выбора порога (otsu, triangle, mean)
+        """
+        threshold = auto_parameters.threshold(image_statistics.luma(image_array), method)
         return {'threshold': threshold}
@@ -0,0 +1,211 @@
+"""
+Обработка краев изображения для фильтров с окном.
+
+Вместо дополнения всего изображения (np.pad создает полную копию) результат
+собирается из областей:
+- внутренняя область, окна которой целиком лежат в изображении, вычисляется
+  прямо по исходному массиву без копирования;
+- четыре полосы вдоль краев шириной в радиус окна вычисляются по небольшим
+  массивам, в которых недостающие пиксели за краем (ореол) синтезированы
+  по выбранному режиму.
+
+Режимы дополнения (совпадают с одноименными режимами np.pad):
+- edge: повторение крайнего пикселя;
+- reflect: отражение относительно крайнего пикселя без его повторения;
+- wrap: периодическое продолжение с противоположного края;
+- constant: постоянное значение.
+
+Функция области region_filter(region) получает двумерный массив и
+возвращает массив той же формы, в котором заполнены позиции, чье окно
+радиуса radius целиком лежит внутри region.
+"""
+
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple, Union
+import numpy as np
+
+BORDER_EDGE = "edge"
+BORDER_REFLECT = "reflect"
+BORDER_WRAP = "wrap"
+BORDER_CONSTANT = "constant"
+
+BORDER_MODES = (BORDER_EDGE, BORDER_REFLECT, BORDER_WRAP, BORDER_CONSTANT)
+
+RegionFilter = Callable[[np.ndarray], np.ndarray]
+
+
+class _Tile(NamedTuple):
+    """Область результата и соответствующая ей область входа (координаты изображения)."""
+    rows: Tuple[int, int]
+    cols: Tuple[int, int]
+    input_rows: Tuple[int, int]
+    input_cols: Tuple[int, int]
+
+
+def validate_border_mode(mode: str) -> str:
+    """
+    Проверяет режим дополнения краев.
+
+    Args:
+        mode: Режим дополнения
+
+    Returns:
+        str: Тот же режим
+
+    Raises:
+        ValueError: Если режим неизвестен
+    """
+    if mode not in BORDER_MODES:
+        raise ValueError(f"Неизвестный режим обработки краев: {mode}")
+    return mode
+
+
+def border_indices(start: int, stop: int, size: int, mode: str) -> Tuple[Union[slice, np.ndarray], np.ndarray]:
+    """
+    Отображает координаты [start, stop) на индексы исходной оси.
+
+    Args:
+        start: Первая координата (может быть отрицательной)
+        stop: Координата за последней (может превышать size)
+        size: Размер исходной оси
+        mode: Режим дополнения
+
+    Returns:
+        Tuple: Индексы (срез, если координаты внутри оси) и маска координат внутри оси
+    """
+    coordinates = np.arange(start, stop)
+    inside = (coordinates >= 0) & (coordinates < size)
+    if start >= 0 and stop <= size:
+        return slice(start, stop), inside
+
+    if mode == BORDER_WRAP:
+        indices = np.mod(coordinates, size)
+    elif mode == BORDER_REFLECT and size > 1:
+        period = 2 * (size - 1)
+        indices = np.mod(coordinates, period)
+        indices = np.where(indices >= size, period - indices, indices)
+    else:
+        # edge; для constant значения за краем заменяются после выборки
+        indices = np.clip(coordinates, 0, size - 1)
+    return indices, inside
+
+
+def border_region(channel: np.ndarray, rows: Tuple[int, int], cols: Tuple[int, int],
+                  mode: str, value: float = 0) -> np.ndarray:
+    """
+    Возвращает область дополненного изображения.
+
+    Область внутри изображения возвращается как представление без копирования,
+    область с ореолом синтезируется выборкой по индексам.
+
+    Args:
+        channel: Двумерный массив канала
+        rows: Строки области [начало, конец) в координатах изображения
+        cols: Столбцы области [начало, конец) в координатах изображения
+        mode: Режим дополнения
+        value: Значение за краем для режима constant (в единицах массива)
+
+    Returns:
+        np.ndarray: Область размера (rows[1] - rows[0]) x (cols[1] - cols[0])
+    """
+    row_indices, rows_inside = border_indices(rows[0], rows[1], channel.shape[0], mode)
+    col_indices, cols_inside = border_indices(cols[0], cols[1], channel.shape[1], mode)
+    if isinstance(row_indices, slice) and isinstance(col_indices, slice):
+        return channel[row_indices, col_indices]
+
+    # Хотя бы по одной оси выборка по индексам, поэтому region - копия
+    region = channel[row_indices][:, col_indices]
+
+    if mode == BORDER_CONSTANT:
+        region[~rows_inside, :] = value
+        region[:, ~cols_inside] = value
+    return region
+
+
+def filter_with_border(channel: np.ndarray, region_filter: RegionFilter, radius: int,
+                       mode: str = BORDER_EDGE, value: float = 0,
+                       halo: Optional[int] = None) -> np.ndarray:
+    """
+    Применяет фильтр с окном к каналу с обработкой краев.
+
+    Args:
+        channel: Двумерный массив канала
+        region_filter: Функция области (см. описание модуля)
+        radius: Радиус окна фильтра
+        mode: Режим дополнения
+        value: Значение за краем для режима constant (в единицах массива)
+        halo: Ширина ореола (по умолчанию radius). Если она меньше радиуса,
+              позиции, окно которых выходит за ореол, остаются незаполненными
+              функцией области, как при дополнении np.pad на halo пикселей
+
+    Returns:
+        np.ndarray: Результат размера канала
+    """
+    validate_border_mode(mode)
+    height, width = channel.shape
+    halo = radius if halo is None else halo
+
+    result = None
+    for tile in _tiles(height, width, radius, halo):
+        region = border_region(channel, tile.input_rows, tile.input_cols, mode, value)
+        filtered = region_filter(region)
+        if result is None and tile.input_rows == (0, height) and tile.input_cols == (0, width):
+            # Внутренняя область: результат по исходному массиву становится общим результатом,
+            # значения у краев в нем перезаписываются полосами
+            result = filtered
+            continue
+
+        if result is None:
+            result = np.zeros((height, width), dtype=filtered.dtype)
+        row_offset, col_offset = tile.input_rows[0], tile.input_cols[0]
+        result[tile.rows[0]:tile.rows[1], tile.cols[0]:tile.cols[1]] = filtered[
+            tile.rows[0] - row_offset:tile.rows[1] - row_offset,
+            tile.cols[0] - col_offset:tile.cols[1] - col_offset
+        ]
+
+    if result is None:
+        # Пустое изображение
+        return np.zeros((height, width), dtype=np.float64)
+    return result
+
+
+def region_row_count(height: int, width: int, radius: int, halo: Optional[int] = None) -> int:
+    """
+    Число строк, которые функции областей обрабатывают для одного канала.
+
+    Используется для объявления объема работы в контексте прогресса:
+    функция области отмечает шаг после каждой строки с полными окнами.
+
+    Args:
+        height: Высота изображения
+        width: Ширина изображения
+        radius: Радиус окна фильтра
+        halo: Ширина ореола (по умолчанию radius)
+
+    Returns:
+        int: Число строк
+    """
+    halo = radius if halo is None else halo
+    return sum(max(0, tile.input_rows[1] - tile.input_rows[0] - 2 * radius)
+               for tile in _tiles(height, width, radius, halo))
+
+
+def _tiles(height: int, width: int, radius: int, halo: int) -> Iterator[_Tile]:
+    """Делит результат на внутреннюю область и полосы вдоль краев."""
+    def expand(start: int, stop: int, size: int) -> Tuple[int, int]:
+        return max(start - radius, -halo), min(stop + radius, size + halo)
+
+    def tile(rows: Tuple[int, int], cols: Tuple[int, int]) -> _Tile:
+        return _Tile(rows, cols, expand(*rows, height), expand(*cols, width))
+
+    if height == 0 or width == 0:
+        return
+    if radius == 0 or height <= 2 * radius or width <= 2 * radius:
+        # Маленькое изображение: одна область с ореолом со всех сторон
+        yield tile((0, height), (0, width))
+        return
+
+    yield tile((radius, height - radius), (radius, width - radius))
+    yield tile((0, radius), (0, width))
+    yield tile((height - radius, height), (0, width))
+    yield tile((radius, height - radius), (0, radius))
+    yield tile((radius, height - radius), (width - radius, width))
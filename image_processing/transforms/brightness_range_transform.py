@@ -6,7 +6,12 @@ import numpy as np
 from typing import Dict, Any, Optional
 import logging
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, alpha_aware
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACES, apply_levels, is_luminance_mode
+from ..bit_depth import PARAMETER_SCALE, dtype_max, from_parameter_scale
+from ..image_statistics import image_statistics
+from ..luma import luma_provider
+from ..auto_parameters import auto_parameters
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +19,25 @@ logger = logging.getLogger(__name__)
 class BrightnessRangeTransform(BaseTransform):
     """Класс для вырезания диапазона яркостей изображений."""
     
+    pointwise = True
+    
+    @alpha_aware()
     def apply(self, image_array: np.ndarray, min_brightness: float, max_brightness: float, 
-              outside_mode: str, constant_value: Optional[float] = None, **kwargs) -> np.ndarray:
+              outside_mode: str, constant_value: Optional[float] = None,
+              color_space: str = COLOR_SPACE_RGB, **kwargs) -> np.ndarray:
         """
         Применяет вырезание диапазона яркостей к изображению.
         
+        В режиме RGB результат - изображение в оттенках серого. В режимах
+        YCbCr и HSV изменяется только яркостный канал, а цветность сохраняется.
+        
         Args:
             image_array: Массив изображения
-            min_brightness: Минимальная яркость диапазона (0-255)
-            max_brightness: Максимальная яркость диапазона (0-255)
+            min_brightness: Минимальная яркость диапазона (шкала 0-255 при любой разрядности)
+            max_brightness: Максимальная яркость диапазона (шкала 0-255 при любой разрядности)
             outside_mode: Режим обработки пикселей вне диапазона ("Константа" или "Исходное")
-            constant_value: Константное значение для пикселей вне диапазона
+            constant_value: Константное значение для пикселей вне диапазона (шкала 0-255)
+            color_space: Режим цветового пространства (rgb, ycbcr, hsv)
             **kwargs: Дополнительные параметры
             
         Returns:
@@ -36,42 +49,59 @@ class BrightnessRangeTransform(BaseTransform):
                 min_brightness=min_brightness,
                 max_brightness=max_brightness,
                 outside_mode=outside_mode,
-                constant_value=constant_value
+                constant_value=constant_value,
+                color_space=color_space
             )
             
-            logger.info(f"Применение вырезания диапазона яркостей: {min_brightness}-{max_brightness}, режим: {outside_mode}")
+            logger.debug("Применение вырезания диапазона яркостей: %s-%s, режим: %s",
+                         min_brightness, max_brightness, outside_mode)
+            
+            if is_luminance_mode(image_array, color_space):
+                return apply_levels(
+                    image_array,
+                    lambda levels: self._range_levels(levels, min_brightness, max_brightness,
+                                                      outside_mode, constant_value),
+                    color_space
+                )
             
-            # Конвертируем в grayscale если изображение цветное
-            if len(image_array.shape) == 3:
-                # Используем формулу для конвертации RGB в grayscale
-                gray_array = np.dot(image_array[...,:3], [0.2989, 0.5870, 0.1140])
-            else:
-                gray_array = image_array.copy()
+            # Яркость вычисляется один раз для изображения и берется из кэша
+            gray_array = luma_provider.get(image_array)
+            maximum = dtype_max(image_array)
             
             # Создаем маску для пикселей в диапазоне
-            in_range_mask = (gray_array >= min_brightness) & (gray_array <= max_brightness)
+            in_range_mask = ((gray_array >= from_parameter_scale(min_brightness, maximum)) &
+                             (gray_array <= from_parameter_scale(max_brightness, maximum)))
             
             # Создаем результирующий массив
             result_array = gray_array.copy()
             
             if outside_mode == "Константа":
                 # Пиксели вне диапазона заменяем на константное значение
-                result_array[~in_range_mask] = constant_value
+                result_array[~in_range_mask] = from_parameter_scale(constant_value, maximum)
             else:  # "Исходное"
                 # Пиксели вне диапазона остаются в исходном виде
                 # Пиксели в диапазоне остаются без изменений
                 pass  # result_array уже содержит исходные значения
             
-            # Конвертируем в uint8
-            result_array = result_array.astype(np.uint8)
+            # Конвертируем в тип исходного изображения
+            result_array = result_array.astype(image_array.dtype)
             
-            logger.info("Вырезание диапазона яркостей успешно применено")
+            logger.debug("Вырезание диапазона яркостей успешно применено")
             return result_array
             
         except Exception as e:
             logger.error(f"Ошибка при применении вырезания диапазона яркостей: {e}")
             raise
     
+    def _range_levels(self, levels: np.ndarray, min_brightness: float, max_brightness: float,
+                      outside_mode: str, constant_value: Optional[float]) -> np.ndarray:
+        """Функция уровней [0, 1] для режима яркостного канала."""
+        if outside_mode != "Константа":
+            return levels
+        scaled = levels * PARAMETER_SCALE
+        outside = (scaled < min_brightness) | (scaled > max_brightness)
+        return np.where(outside, constant_value / PARAMETER_SCALE, levels)
+    
     def get_name(self) -> str:
         """Возвращает название преобразования."""
         return "Вырезание диапазона яркостей"
@@ -83,28 +113,32 @@ class BrightnessRangeTransform(BaseTransform):
         outside_mode = kwargs.get('outside_mode')
         constant_value = kwargs.get('constant_value')
         
-        if min_brightness is not None and (min_brightness < 0 or min_brightness > 255):
+        if min_brightness is not None and (min_brightness < 0 or min_brightness > PARAMETER_SCALE):
             return False
-        if max_brightness is not None and (max_brightness < 0 or max_brightness > 255):
+        if max_brightness is not None and (max_brightness < 0 or max_brightness > PARAMETER_SCALE):
             return False
         if min_brightness is not None and max_brightness is not None and min_brightness >= max_brightness:
             return False
         if outside_mode == "Константа" and constant_value is not None:
-            if constant_value < 0 or constant_value > 255:
+            if constant_value < 0 or constant_value > PARAMETER_SCALE:
                 return False
+        if kwargs.get('color_space', COLOR_SPACE_RGB) not in COLOR_SPACES:
+            return False
         return True
     
-    def get_optimal_parameters(self, image_array: np.ndarray) -> Dict[str, Any]:
-        """Вычисляет оптимальные параметры для вырезания диапазона яркостей."""
-        # Конвертируем в grayscale если изображение цветное
-        if len(image_array.shape) == 3:
-            gray_array = np.dot(image_array[...,:3], [0.2989, 0.5870, 0.1140])
-        else:
-            gray_array = image_array.copy()
+    def get_optimal_parameters(self, image_array: np.ndarray, low_percentile: float = 25.0,
+                               high_percentile: float = 75.0) -> Dict[str, Any]:
+        """
+        Вычисляет диапазон яркостей между перцентилями гистограммы яркости.
         
-        # Используем квантили для определения диапазона
-        min_brightness = float(np.percentile(gray_array, 25))  # 25-й перцентиль
-        max_brightness = float(np.percentile(gray_array, 75))  # 75-й перцентиль
+        Args:
+            image_array: Массив изображения
+            low_percentile: Нижний перцентиль
+            high_percentile: Верхний перцентиль
+        """
+        min_brightness, max_brightness = auto_parameters.percentile_range(
+            image_statistics.luma(image_array), low_percentile, high_percentile
+        )
         
         return {
             'min_brightness': min_brightness,
@@ -0,0 +1,162 @@
+"""
+Режимы цветового пространства для точечных преобразований.
+
+Точечное преобразование задается функцией уровней для одного канала. В режиме
+RGB она применяется к каждому каналу, в режимах YCbCr и HSV - только
+к яркостному каналу (Y или V), что сохраняет цветовой тон и втрое сокращает
+число обрабатываемых отсчетов.
+"""
+
+from typing import Callable
+import numpy as np
+
+from ..luma import luma_provider, LUMA_BT601
+from ..bit_depth import apply_level_function, dtype_max, lut_size
+
+COLOR_SPACE_RGB = "rgb"
+COLOR_SPACE_YCBCR = "ycbcr"
+COLOR_SPACE_HSV = "hsv"
+
+COLOR_SPACES = (COLOR_SPACE_RGB, COLOR_SPACE_YCBCR, COLOR_SPACE_HSV)
+
+
+def is_luminance_mode(image_array: np.ndarray, color_space: str) -> bool:
+    """
+    Проверяет, обрабатывается ли только яркостный канал.
+
+    Args:
+        image_array: Массив изображения
+        color_space: Режим цветового пространства
+
+    Returns:
+        bool: True для цветного изображения в режиме YCbCr или HSV
+    """
+    if color_space not in COLOR_SPACES:
+        raise ValueError(f"Неизвестное цветовое пространство: {color_space}")
+    return color_space != COLOR_SPACE_RGB and image_array.ndim == 3 and image_array.shape[2] >= 3
+
+
+def luminance_channel(image_array: np.ndarray, color_space: str) -> np.ndarray:
+    """
+    Возвращает яркостный канал: Y для YCbCr, V = max(R, G, B) для HSV.
+
+    Args:
+        image_array: Цветной массив изображения
+        color_space: Режим цветового пространства (ycbcr, hsv)
+
+    Returns:
+        np.ndarray: Двумерный массив яркостного канала
+    """
+    if color_space == COLOR_SPACE_HSV:
+        return image_array[..., :3].max(axis=2)
+    # Y совпадает с яркостью BT.601
+    return luma_provider.get(image_array, LUMA_BT601)
+
+
+def apply_levels(image_array: np.ndarray, level_function: Callable[[np.ndarray], np.ndarray],
+                 color_space: str = COLOR_SPACE_RGB) -> np.ndarray:
+    """
+    Применяет функцию уровней [0, 1] -> [0, 1] в выбранном режиме.
+
+    Для 8- и 16-битных изображений функция вычисляется через таблицу
+    из 256 или 65536 значений.
+
+    Args:
+        image_array: Массив изображения
+        level_function: Функция уровней
+        color_space: Режим цветового пространства
+
+    Returns:
+        np.ndarray: Массив того же типа и диапазона
+    """
+    if not is_luminance_mode(image_array, color_space):
+        return apply_level_function(image_array, level_function)
+
+    channel = luminance_channel(image_array, color_space)
+    # Диапазон яркостного канала - диапазон всего изображения, а не максимум яркости
+    new_channel = apply_level_function(channel, level_function, dtype_max(image_array))
+    return _replace_luminance(image_array, channel, new_channel, color_space)
+
+
+def apply_lut(image_array: np.ndarray, lut: np.ndarray, color_space: str = COLOR_SPACE_RGB) -> np.ndarray:
+    """
+    Применяет готовую таблицу преобразования к целочисленному изображению.
+
+    Args:
+        image_array: Массив изображения uint8 или uint16
+        lut: Таблица из 256 или 65536 значений того же типа
+        color_space: Режим цветового пространства
+
+    Returns:
+        np.ndarray: Преобразованный массив изображения
+    """
+    if lut_size(image_array.dtype) != lut.size:
+        raise ValueError(f"Размер таблицы {lut.size} не соответствует типу {image_array.dtype}")
+    if not is_luminance_mode(image_array, color_space):
+        return lut[image_array]
+
+    channel = luminance_channel(image_array, color_space)
+    return _replace_luminance(image_array, channel, lut[channel], color_space)
+
+
+def _replace_luminance(image_array: np.ndarray, channel: np.ndarray, new_channel: np.ndarray,
+                       color_space: str) -> np.ndarray:
+    """Заменяет яркостный канал, сохраняя цветность, и возвращает массив исходного типа."""
+    maximum = dtype_max(image_array)
+    if color_space == COLOR_SPACE_HSV:
+        rgb = _apply_value(image_array[..., :3], channel, new_channel)
+    else:
+        rgb = _apply_luma(image_array, new_channel)
+    result = np.clip(rgb, 0, maximum).astype(image_array.dtype)
+
+    if image_array.shape[2] > 3:
+        # Альфа-канал и прочие каналы не изменяются
+        result = np.concatenate([result, image_array[..., 3:]], axis=2)
+    return result
+
+
+def _apply_luma(image_array: np.ndarray, y_new: np.ndarray) -> np.ndarray:
+    """Обратное преобразование YCbCr (JPEG, BT.601) с новым Y."""
+    if not np.issubdtype(image_array.dtype, np.integer):
+        r, g, b = (image_array[..., i].astype(np.float64) for i in range(3))
+        y_old = 0.299 * r + 0.587 * g + 0.114 * b
+        y_new = y_new.astype(np.float64)
+        r_new = r - y_old + y_new
+        b_new = b - y_old + y_new
+        g_new = (y_new - 0.299 * r_new - 0.114 * b_new) / 0.587
+        return np.stack([r_new, g_new, b_new], axis=2)
+
+    # Целочисленные коэффициенты со сдвигом на 8 бит; int64 вмещает 16-битные значения
+    r = image_array[..., 0].astype(np.int64)
+    g = image_array[..., 1].astype(np.int64)
+    b = image_array[..., 2].astype(np.int64)
+    cb = (-43 * r - 85 * g + 128 * b + 128) >> 8
+    cr = (128 * r - 107 * g - 21 * b + 128) >> 8
+
+    y_new = y_new.astype(np.int64)
+    rgb = np.empty(image_array.shape[:2] + (3,), dtype=np.int64)
+    rgb[..., 0] = y_new + ((359 * cr + 128) >> 8)
+    rgb[..., 1] = y_new - ((88 * cb + 183 * cr + 128) >> 8)
+    rgb[..., 2] = y_new + ((454 * cb + 128) >> 8)
+    return rgb
+
+
+def _apply_value(rgb: np.ndarray, value: np.ndarray, value_new: np.ndarray) -> np.ndarray:
+    """
+    Обратное преобразование HSV с новым V.
+
+    При неизменных H и S все каналы пропорциональны V, поэтому обратное
+    преобразование сводится к масштабированию каналов (целочисленному
+    для целых типов). Черные пиксели (V = 0) становятся серыми с новой яркостью.
+    """
+    if not np.issubdtype(rgb.dtype, np.integer):
+        value = value.astype(np.float64)[..., np.newaxis]
+        value_new = value_new.astype(np.float64)[..., np.newaxis]
+        scaled = rgb * (value_new / np.maximum(value, np.finfo(np.float64).tiny))
+        return np.where(value == 0, value_new, scaled)
+
+    value = value.astype(np.int64)[..., np.newaxis]
+    value_new = value_new.astype(np.int64)[..., np.newaxis]
+    safe_value = np.maximum(value, 1)
+    scaled = (rgb.astype(np.int64) * value_new + safe_value // 2) // safe_value
+    return np.where(value == 0, value_new, scaled)
@@ -0,0 +1,211 @@
+"""
+Дифференциальная проверка фильтров относительно эталонных реализаций.
+
+Проверяемая реализация (backend) - функция backend(image_array, **parameters),
+возвращающая отфильтрованный массив. Она сравнивается с эталоном из
+reference_filters.py на случайных изображениях с фиксированным зерном:
+нечетные и вырожденные размеры, 1/3/4 канала, предельные значения.
+
+Допуски (максимальная абсолютная разность в уровнях исходного типа):
+- box, median, sigma: 0 - рабочие фильтры вычисляют окно теми же
+  операциями numpy и с тем же ядром, что и эталон;
+- gaussian, unsharp: 1 - рабочее ядро Гаусса строится как внешнее
+  произведение нормированных одномерных ядер (см. kernels.py), а эталонное -
+  поэлементно по двумерной формуле. Ядра отличаются в последнем разряде,
+  и если точное значение пикселя целое, отбрасывание дробной части дает ±1.
+
+Эталоны фильтруют все каналы, а рабочие фильтры не изменяют альфа-канал
+(см. channels.py), поэтому для RGBA эталон применяется к цветовым каналам.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+import logging
+
+from .reference_filters import REFERENCE_FILTERS
+from ..channels import split_alpha, merge_alpha
+from ..factories.transform_factory import (
+    TransformFactory, FAMILY_BOX, FAMILY_MEDIAN, FAMILY_GAUSSIAN, FAMILY_SIGMA, FAMILY_UNSHARP
+)
+
+logger = logging.getLogger(__name__)
+
+Backend = Callable[..., np.ndarray]
+
+# Допустимая максимальная абсолютная разность с эталоном
+FILTER_TOLERANCES: Dict[str, float] = {
+    FAMILY_BOX: 0,
+    FAMILY_MEDIAN: 0,
+    FAMILY_GAUSSIAN: 1,
+    FAMILY_SIGMA: 0,
+    FAMILY_UNSHARP: 1,
+}
+
+# Наборы параметров, на которых проводится проверка
+FILTER_PARAMETERS: Dict[str, List[Dict[str, Any]]] = {
+    FAMILY_BOX: [{'kernel_size': 3}, {'kernel_size': 5}],
+    FAMILY_MEDIAN: [{'kernel_size': 3}, {'kernel_size': 5}],
+    FAMILY_GAUSSIAN: [{'sigma': 0.5}, {'sigma': 1.0}],
+    FAMILY_SIGMA: [{'sigma': 1.0, 'kernel_size': 5}, {'sigma': 2.0, 'kernel_size': 3}],
+    FAMILY_UNSHARP: [{'kernel_size': 3, 'lambda_coeff': 1.5},
+                     {'kernel_size': 7, 'lambda_coeff': 0.5, 'sigma': 0.5}],
+}
+
+# Размеры изображений: вырожденные, узкие и нечетные
+TEST_SHAPES = ((1, 1), (2, 7), (7, 2), (9, 11), (13, 5))
+
+# Число каналов: оттенки серого, RGB, RGBA
+TEST_CHANNELS = (1, 3, 4)
+
+
+class EquivalenceCase(NamedTuple):
+    """Входное изображение проверки."""
+    description: str
+    image: np.ndarray
+
+
+class Mismatch(NamedTuple):
+    """Расхождение проверяемой реализации с эталоном."""
+    family: str
+    parameters: Dict[str, Any]
+    case: str
+    max_difference: float
+    tolerance: float
+
+
+def production_backend(family: str) -> Backend:
+    """
+    Рабочая реализация семейства фильтров из фабрики.
+
+    Args:
+        family: Семейство фильтров
+
+    Returns:
+        Backend: Функция backend(image_array, **parameters)
+    """
+    return lambda image_array, **parameters: \
+        TransformFactory.create_family(family, **parameters).apply(image_array)
+
+
+def random_cases(seed: int = 0) -> Iterator[EquivalenceCase]:
+    """
+    Генерирует входные изображения проверки.
+
+    Для каждого размера и числа каналов создается случайное изображение uint8,
+    а также изображения с предельными значениями: черное, белое, шахматная
+    доска 0/255 и импульсный шум. Дополнительно проверяется uint16.
+
+    Args:
+        seed: Зерно генератора
+
+    Returns:
+        Iterator[EquivalenceCase]: Входные изображения
+    """
+    rng = np.random.default_rng(seed)
+    for height, width in TEST_SHAPES:
+        for channels in TEST_CHANNELS:
+            shape = (height, width) if channels == 1 else (height, width, channels)
+            name = f"{height}x{width}x{channels}"
+
+            yield EquivalenceCase(f"{name} random", rng.integers(0, 256, shape, dtype=np.uint8))
+            yield EquivalenceCase(f"{name} black", np.zeros(shape, dtype=np.uint8))
+            yield EquivalenceCase(f"{name} white", np.full(shape, 255, dtype=np.uint8))
+
+            checkerboard = (np.indices(shape[:2]).sum(axis=0) % 2 * 255).astype(np.uint8)
+            if channels > 1:
+                checkerboard = np.repeat(checkerboard[..., np.newaxis], channels, axis=2)
+            yield EquivalenceCase(f"{name} checkerboard", checkerboard)
+
+            impulses = rng.choice(np.array([0, 255], dtype=np.uint8), size=shape)
+            yield EquivalenceCase(f"{name} salt-and-pepper", impulses)
+
+    yield EquivalenceCase("9x11x3 uint16 random", rng.integers(0, 65536, (9, 11, 3), dtype=np.uint16))
+
+
+class EquivalenceHarness:
+    """Сравнение реализаций фильтров с эталонными."""
+
+    def __init__(self, seed: int = 0, tolerances: Optional[Dict[str, float]] = None):
+        """
+        Инициализация проверки.
+
+        Args:
+            seed: Зерно генератора входных изображений
+            tolerances: Допуски по семействам (по умолчанию FILTER_TOLERANCES)
+        """
+        self.seed = seed
+        self.tolerances = dict(FILTER_TOLERANCES)
+        if tolerances:
+            self.tolerances.update(tolerances)
+
+    def compare(self, family: str, backend: Optional[Backend] = None,
+                parameter_sets: Optional[List[Dict[str, Any]]] = None) -> List[Mismatch]:
+        """
+        Сравнивает реализацию семейства с эталоном на всех входных изображениях.
+
+        Args:
+            family: Семейство фильтров
+            backend: Проверяемая реализация (по умолчанию рабочая из фабрики)
+            parameter_sets: Наборы параметров (по умолчанию FILTER_PARAMETERS)
+
+        Returns:
+            List[Mismatch]: Расхождения сверх допуска (пустой список - реализации эквивалентны)
+        """
+        if family not in REFERENCE_FILTERS:
+            raise ValueError(f"Нет эталона для семейства фильтров '{family}'")
+
+        backend = backend or production_backend(family)
+        reference = REFERENCE_FILTERS[family]
+        tolerance = self.tolerances[family]
+        mismatches = []
+
+        for parameters in parameter_sets or FILTER_PARAMETERS[family]:
+            for case in random_cases(self.seed):
+                color, alpha = split_alpha(case.image)
+                expected = merge_alpha(reference(color, **parameters), alpha)
+                actual = backend(case.image, **parameters)
+                difference = self._max_difference(expected, actual)
+                if difference > tolerance:
+                    mismatches.append(Mismatch(family, parameters, case.description, difference, tolerance))
+
+        if mismatches:
+            logger.warning("Семейство %s: %d расхождений с эталоном", family, len(mismatches))
+        return mismatches
+
+    def compare_all(self, backends: Optional[Dict[str, Backend]] = None) -> Dict[str, List[Mismatch]]:
+        """
+        Сравнивает все семейства фильтров.
+
+        Args:
+            backends: Проверяемые реализации по семействам (остальные - рабочие)
+
+        Returns:
+            Dict[str, List[Mismatch]]: Расхождения по семействам
+        """
+        backends = backends or {}
+        return {family: self.compare(family, backends.get(family)) for family in REFERENCE_FILTERS}
+
+    @staticmethod
+    def _max_difference(expected: np.ndarray, actual: np.ndarray) -> float:
+        """Максимальная абсолютная разность; несовпадение формы или типа - бесконечность."""
+        if expected.shape != actual.shape or expected.dtype != actual.dtype:
+            return float('inf')
+        if expected.size == 0:
+            return 0.0
+        return float(np.max(np.abs(expected.astype(np.float64) - actual.astype(np.float64))))
+
+
+def format_mismatches(mismatches: List[Mismatch]) -> str:
+    """
+    Форматирует расхождения для отчета.
+
+    Args:
+        mismatches: Расхождения
+
+    Returns:
+        str: Текст отчета
+    """
+    return "\n".join(
+        f"{m.family} {m.parameters} [{m.case}]: разность {m.max_difference:g} > {m.tolerance:g}"
+        for m in mismatches
+    )
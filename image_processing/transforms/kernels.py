@@ -0,0 +1,147 @@
+"""
+Фабрика ядер свертки с общим кэшем для семейств фильтров.
+
+Ядра строятся векторно (двумерное ядро Гаусса - внешнее произведение
+одномерных) и хранятся в ограниченном LRU-кэше по ключу
+(вид, σ, размер, тип). Возвращаемые ядра общие и доступны только для чтения.
+Кэш защищен блокировкой, ядра строятся вне нее.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+import logging
+
+from ..instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Максимальное число ядер в кэше
+MAX_CACHED_KERNELS = 64
+
+# Ядра по ключу параметров: одинаковые ядра строятся один раз для всех фильтров
+_kernel_cache: OrderedDict = OrderedDict()
+_kernel_cache_lock = threading.Lock()
+
+
+def gaussian_kernel_size(sigma: float) -> int:
+    """
+    Размер ядра Гаусса по правилу 3σ (всегда нечетный).
+
+    Args:
+        sigma: Стандартное отклонение
+
+    Returns:
+        int: Размер ядра
+    """
+    kernel_size = int(2 * 3 * sigma) + 1
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    return kernel_size
+
+
+def box_kernel(kernel_size: int, dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    Возвращает ядро прямоугольного фильтра.
+
+    Args:
+        kernel_size: Размер ядра
+        dtype: Тип значений ядра
+
+    Returns:
+        np.ndarray: Ядро (только для чтения)
+    """
+    dtype = np.dtype(dtype)
+    key = ('box', kernel_size, dtype.str)
+    kernel = _lookup(key)
+    if kernel is None:
+        kernel_value = 1.0 / (kernel_size * kernel_size)
+        kernel = _store(key, np.full((kernel_size, kernel_size), kernel_value, dtype=dtype))
+    return kernel
+
+
+def gaussian_kernel_1d(sigma: float, kernel_size: Optional[int] = None,
+                       dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    Возвращает нормированное одномерное ядро Гаусса.
+
+    Args:
+        sigma: Стандартное отклонение
+        kernel_size: Размер ядра (по умолчанию по правилу 3σ)
+        dtype: Тип значений ядра
+
+    Returns:
+        np.ndarray: Ядро (только для чтения)
+    """
+    if kernel_size is None:
+        kernel_size = gaussian_kernel_size(sigma)
+    dtype = np.dtype(dtype)
+    key = ('gaussian_1d', float(sigma), kernel_size, dtype.str)
+    kernel = _lookup(key)
+    if kernel is None:
+        kernel = _store(key, _build_gaussian_1d(sigma, kernel_size).astype(dtype))
+    return kernel
+
+
+def gaussian_kernel(sigma: float, kernel_size: Optional[int] = None,
+                    dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    Возвращает нормированное двумерное ядро Гаусса.
+
+    Args:
+        sigma: Стандартное отклонение
+        kernel_size: Размер ядра (по умолчанию по правилу 3σ)
+        dtype: Тип значений ядра
+
+    Returns:
+        np.ndarray: Ядро (только для чтения)
+    """
+    if kernel_size is None:
+        kernel_size = gaussian_kernel_size(sigma)
+    dtype = np.dtype(dtype)
+    key = ('gaussian', float(sigma), kernel_size, dtype.str)
+    kernel = _lookup(key)
+    if kernel is None:
+        # G(x, y) = g(x) * g(y): сумма внешнего произведения нормированных ядер равна 1
+        profile = _build_gaussian_1d(sigma, kernel_size)
+        kernel = _store(key, np.outer(profile, profile).astype(dtype))
+    return kernel
+
+
+def clear_kernel_cache():
+    """Очищает кэш ядер."""
+    with _kernel_cache_lock:
+        _kernel_cache.clear()
+
+
+def _build_gaussian_1d(sigma: float, kernel_size: int) -> np.ndarray:
+    """Строит нормированное одномерное ядро Гаусса в float64."""
+    offsets = np.arange(kernel_size, dtype=np.float64) - kernel_size // 2
+    profile = np.exp(-(offsets * offsets) / (2 * sigma * sigma))
+    profile_sum = profile.sum()
+    if profile_sum > 0:
+        return profile / profile_sum
+    # Если сумма равна 0, создаем равномерное ядро
+    return np.full(kernel_size, 1.0 / kernel_size)
+
+
+def _lookup(key: Tuple) -> Optional[np.ndarray]:
+    """Возвращает ядро из кэша, отмечая его как недавно использованное."""
+    with _kernel_cache_lock:
+        kernel = _kernel_cache.get(key)
+        if kernel is not None:
+            _kernel_cache.move_to_end(key)
+    instrumentation.record_cache("kernel", kernel is not None)
+    return kernel
+
+
+def _store(key: Tuple, kernel: np.ndarray) -> np.ndarray:
+    """Сохраняет ядро в кэше, запрещая его изменение."""
+    kernel.flags.writeable = False
+    with _kernel_cache_lock:
+        _kernel_cache[key] = kernel
+        if len(_kernel_cache) > MAX_CACHED_KERNELS:
+            _kernel_cache.popitem(last=False)
+    logger.debug("Построено ядро %s", key)
+    return kernel
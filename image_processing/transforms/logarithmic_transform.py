@@ -7,7 +7,9 @@ import numpy as np
 from typing import Dict, Any, Optional
 import logging
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, alpha_aware
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACES, apply_levels, is_luminance_mode, luminance_channel
+from ..image_statistics import image_statistics
 
 logger = logging.getLogger(__name__)
 
@@ -15,50 +17,50 @@ logger = logging.getLogger(__name__)
 class LogarithmicTransform(BaseTransform):
     """Класс для логарифмического преобразования изображений."""
     
-    def apply(self, image_array: np.ndarray, c: Optional[float] = None, **kwargs) -> np.ndarray:
+    pointwise = True
+    
+    @alpha_aware()
+    def apply(self, image_array: np.ndarray, c: Optional[float] = None,
+              color_space: str = COLOR_SPACE_RGB, **kwargs) -> np.ndarray:
         """
         Применяет логарифмическое преобразование к изображению.
         
         Args:
             image_array: Массив изображения
             c: Коэффициент для логарифмического преобразования
+            color_space: Режим цветового пространства (rgb, ycbcr, hsv)
             **kwargs: Дополнительные параметры
             
         Returns:
             np.ndarray: Преобразованный массив изображения
         """
         try:
-            # Конвертируем в float для точных вычислений
-            image_float = image_array.astype(np.float64)
-            
-            # Нормализуем значения в диапазон [0, 1]
-            if image_float.max() > 1.0:
-                image_float = image_float / 255.0
-            
             # Вычисляем коэффициент c если не задан
             if c is None:
-                c = self._calculate_optimal_c(image_float)
+                c = self._calculate_optimal_c(self._normalized_max(image_array, color_space))
             
             # Сохраняем параметры
-            self.save_parameters(c=c)
+            self.save_parameters(c=c, color_space=color_space)
             
-            logger.info(f"Применение логарифмического преобразования с коэффициентом c = {c}")
+            logger.debug("Применение логарифмического преобразования с коэффициентом c = %s", c)
             
-            # Применяем логарифмическое преобразование
+            # Применяем логарифмическое преобразование к уровням [0, 1]
             # Формула: s = c * log(1 + r), где r - исходное значение, s - результат
-            processed_array = c * np.log(1 + image_float)
+            processed_array = apply_levels(image_array, lambda levels: c * np.log(1 + levels), color_space)
             
-            # Нормализуем результат обратно в диапазон [0, 255]
-            processed_array = np.clip(processed_array * 255, 0, 255)
-            processed_array = processed_array.astype(np.uint8)
-            
-            logger.info("Логарифмическое преобразование успешно применено")
+            logger.debug("Логарифмическое преобразование успешно применено")
             return processed_array
             
         except Exception as e:
             logger.error(f"Ошибка при применении логарифмического преобразования: {e}")
             raise
     
+    def _normalized_max(self, image_array: np.ndarray, color_space: str) -> float:
+        """Нормированный максимум канала, к которому применяется преобразование."""
+        if is_luminance_mode(image_array, color_space):
+            return image_statistics.normalized_max(luminance_channel(image_array, color_space))
+        return image_statistics.normalized_max(image_array)
+    
     def get_name(self) -> str:
         """Возвращает название преобразования."""
         return "Логарифмическое"
@@ -68,46 +70,38 @@ class LogarithmicTransform(BaseTransform):
         c = kwargs.get('c')
         if c is not None and c <= 0:
             return False
+        if kwargs.get('color_space', COLOR_SPACE_RGB) not in COLOR_SPACES:
+            return False
         return True
     
     def get_optimal_parameters(self, image_array: np.ndarray) -> Dict[str, Any]:
         """Вычисляет оптимальный коэффициент c."""
         try:
-            # Конвертируем в float для точных вычислений
-            image_float = image_array.astype(np.float64)
-            
-            # Нормализуем значения в диапазон [0, 1]
-            if image_float.max() > 1.0:
-                image_float = image_float / 255.0
-            
-            c = self._calculate_optimal_c(image_float)
+            c = self._calculate_optimal_c(image_statistics.normalized_max(image_array))
             return {'c': c}
             
         except Exception as e:
             logger.error(f"Ошибка при вычислении оптимальных параметров: {e}")
             return {'c': 1.0}
     
-    def _calculate_optimal_c(self, image_array: np.ndarray) -> float:
+    def _calculate_optimal_c(self, max_value: float) -> float:
         """
         Вычисляет оптимальный коэффициент c для логарифмического преобразования.
         
         Args:
-            image_array: Массив изображения в формате float [0, 1]
+            max_value: Максимальное значение изображения в диапазоне [0, 1]
             
         Returns:
             float: Оптимальный коэффициент c
         """
         try:
-            # Находим максимальное значение в изображении
-            max_value = np.max(image_array)
-            
             # Вычисляем коэффициент c так, чтобы максимальное значение
             # после преобразования было равно 1.0
             # c * log(1 + max_value) = 1.0
             # c = 1.0 / log(1 + max_value)
             c = 1.0 / math.log(1 + max_value)
             
-            logger.info(f"Вычислен оптимальный коэффициент c = {c}")
+            logger.debug("Вычислен оптимальный коэффициент c = %s", c)
             return c
             
         except Exception as e:
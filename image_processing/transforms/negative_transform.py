@@ -6,7 +6,9 @@ import numpy as np
 from typing import Dict, Any
 import logging
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, alpha_aware
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACES, apply_levels, apply_lut, is_luminance_mode
+from ..bit_depth import dtype_max, lut_size
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +16,16 @@ logger = logging.getLogger(__name__)
 class NegativeTransform(BaseTransform):
     """Класс для негативного преобразования изображений."""
     
-    def apply(self, image_array: np.ndarray, **kwargs) -> np.ndarray:
+    pointwise = True
+    
+    @alpha_aware()
+    def apply(self, image_array: np.ndarray, color_space: str = COLOR_SPACE_RGB, **kwargs) -> np.ndarray:
         """
         Применяет негативное преобразование к изображению.
         
         Args:
             image_array: Массив изображения
+            color_space: Режим цветового пространства (rgb, ycbcr, hsv)
             **kwargs: Дополнительные параметры
             
         Returns:
@@ -27,15 +33,25 @@ class NegativeTransform(BaseTransform):
         """
         try:
             # Сохраняем параметры
-            self.save_parameters()
+            self.save_parameters(color_space=color_space)
+            
+            logger.debug("Применение негативного преобразования")
             
-            logger.info("Применение негативного преобразования")
+            maximum = dtype_max(image_array)
+            
+            if is_luminance_mode(image_array, color_space):
+                # Инвертируется только яркость, цветовой тон сохраняется
+                size = lut_size(image_array.dtype)
+                if size is None:
+                    return apply_levels(image_array, lambda levels: 1.0 - levels, color_space)
+                lut = (size - 1 - np.arange(size)).astype(image_array.dtype)
+                return apply_lut(image_array, lut, color_space)
             
             # Применяем негативное преобразование
-            # Формула: s = 255 - r, где r - исходное значение, s - результат
-            negative_array = 255 - image_array
+            # Формула: s = max - r, где r - исходное значение, s - результат, max - максимум типа
+            negative_array = image_array.dtype.type(maximum) - image_array
             
-            logger.info("Негативное преобразование успешно применено")
+            logger.debug("Негативное преобразование успешно применено")
             return negative_array
             
         except Exception as e:
@@ -48,8 +64,8 @@ class NegativeTransform(BaseTransform):
     
     def validate_parameters(self, **kwargs) -> bool:
         """Валидирует параметры негативного преобразования."""
-        # Негативное преобразование не требует параметров
-        return True
+        # Негативное преобразование не требует параметров, кроме режима цветового пространства
+        return kwargs.get('color_space', COLOR_SPACE_RGB) in COLOR_SPACES
     
     def get_optimal_parameters(self, image_array: np.ndarray) -> Dict[str, Any]:
         """Вычисляет оптимальные параметры для негативного преобразования."""
@@ -6,7 +6,10 @@ import numpy as np
 from typing import Dict, Any, Optional
 import logging
 
-from .base_transform import BaseTransform
+from .base_transform import BaseTransform, alpha_aware
+from .color_space import COLOR_SPACE_RGB, COLOR_SPACES, apply_levels, is_luminance_mode, luminance_channel
+from ..image_statistics import image_statistics
+from ..auto_parameters import auto_parameters
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +17,11 @@ logger = logging.getLogger(__name__)
 class PowerTransform(BaseTransform):
     """Класс для степенного преобразования изображений."""
     
-    def apply(self, image_array: np.ndarray, gamma: float, c: Optional[float] = None, **kwargs) -> np.ndarray:
+    pointwise = True
+    
+    @alpha_aware()
+    def apply(self, image_array: np.ndarray, gamma: float, c: Optional[float] = None,
+              color_space: str = COLOR_SPACE_RGB, **kwargs) -> np.ndarray:
         """
         Применяет степенное преобразование к изображению.
         
@@ -22,43 +29,39 @@ class PowerTransform(BaseTransform):
             image_array: Массив изображения
             gamma: Значение гаммы для степенного преобразования
             c: Коэффициент для степенного преобразования
+            color_space: Режим цветового пространства (rgb, ycbcr, hsv)
             **kwargs: Дополнительные параметры
             
         Returns:
             np.ndarray: Преобразованный массив изображения
         """
         try:
-            # Конвертируем в float для точных вычислений
-            image_float = image_array.astype(np.float64)
-            
-            # Нормализуем значения в диапазон [0, 1]
-            if image_float.max() > 1.0:
-                image_float = image_float / 255.0
-            
             # Вычисляем коэффициент c если не задан
             if c is None:
-                c = self._calculate_optimal_c(image_float, gamma)
+                c = self._calculate_optimal_c(self._normalized_max(image_array, color_space), gamma)
             
             # Сохраняем параметры
-            self.save_parameters(gamma=gamma, c=c)
+            self.save_parameters(gamma=gamma, c=c, color_space=color_space)
             
-            logger.info(f"Применение степенного преобразования с гаммой γ = {gamma} и коэффициентом c = {c}")
+            logger.debug("Применение степенного преобразования с гаммой γ = %s и коэффициентом c = %s", gamma, c)
             
-            # Применяем степенное преобразование
+            # Применяем степенное преобразование к уровням [0, 1]
             # Формула: s = c * r^γ, где r - исходное значение, s - результат, γ - гамма
-            processed_array = c * np.power(image_float, gamma)
+            processed_array = apply_levels(image_array, lambda levels: c * np.power(levels, gamma), color_space)
             
-            # Нормализуем результат обратно в диапазон [0, 255]
-            processed_array = np.clip(processed_array * 255, 0, 255)
-            processed_array = processed_array.astype(np.uint8)
-            
-            logger.info("Степенное преобразование успешно применено")
+            logger.debug("Степенное преобразование успешно применено")
             return processed_array
             
         except Exception as e:
             logger.error(f"Ошибка при применении степенного преобразования: {e}")
             raise
     
+    def _normalized_max(self, image_array: np.ndarray, color_space: str) -> float:
+        """Нормированный максимум канала, к которому применяется преобразование."""
+        if is_luminance_mode(image_array, color_space):
+            return image_statistics.normalized_max(luminance_channel(image_array, color_space))
+        return image_statistics.normalized_max(image_array)
+    
     def get_name(self) -> str:
         """Возвращает название преобразования."""
         return "Степенное"
@@ -72,49 +75,39 @@ class PowerTransform(BaseTransform):
             return False
         if c is not None and c <= 0:
             return False
+        if kwargs.get('color_space', COLOR_SPACE_RGB) not in COLOR_SPACES:
+            return False
         return True
     
     def get_optimal_parameters(self, image_array: np.ndarray) -> Dict[str, Any]:
-        """Вычисляет оптимальные параметры для степенного преобразования."""
+        """Подбирает гамму, максимизирующую энтропию результата, по гистограмме отсчетов."""
         try:
-            # Конвертируем в float для точных вычислений
-            image_float = image_array.astype(np.float64)
-            
-            # Нормализуем значения в диапазон [0, 1]
-            if image_float.max() > 1.0:
-                image_float = image_float / 255.0
-            
-            # Используем гамму по умолчанию
-            gamma = 1.0
-            c = self._calculate_optimal_c(image_float, gamma)
+            gamma, c = auto_parameters.entropy_gamma(image_statistics.samples(image_array))
             return {'gamma': gamma, 'c': c}
             
         except Exception as e:
             logger.error(f"Ошибка при вычислении оптимальных параметров: {e}")
             return {'gamma': 1.0, 'c': 1.0}
     
-    def _calculate_optimal_c(self, image_array: np.ndarray, gamma: float) -> float:
+    def _calculate_optimal_c(self, max_value: float, gamma: float) -> float:
         """
         Вычисляет оптимальный коэффициент c для степенного преобразования.
         
         Args:
-            image_array: Массив изображения в формате float [0, 1]
+            max_value: Максимальное значение изображения в диапазоне [0, 1]
             gamma: Значение гаммы для степенного преобразования
             
         Returns:
             float: Оптимальный коэффициент c
         """
         try:
-            # Находим максимальное значение в изображении
-            max_value = np.max(image_array)
-            
             # Вычисляем коэффициент c так, чтобы максимальное значение
             # после преобразования было равно 1.0
             # c * max_value^γ = 1.0
             # c = 1.0 / (max_value^γ)
             c = 1.0 / (max_value ** gamma)
             
-            logger.info(f"Вычислен оптимальный коэффициент c = {c} для гаммы γ = {gamma}")
+            logger.debug("Вычислен оптимальный коэффициент c = %s для гаммы γ = %s", c, gamma)
             return c
             
         except Exception as e:
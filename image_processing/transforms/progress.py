@@ -0,0 +1,129 @@
+"""
+Контекст прогресса и кооперативной отмены для долгих преобразований.
+"""
+
+import time
+from typing import Callable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TransformCancelled(Exception):
+    """Исключение, прерывающее преобразование по запросу отмены."""
+    pass
+
+
+class ProgressContext:
+    """
+    Контекст выполнения преобразования: прогресс, оценка времени и отмена.
+
+    Преобразование объявляет общий объем работы через begin() и вызывает
+    step() после каждой полосы строк. В step() проверяется запрос отмены,
+    а прогресс передается в callback не чаще, чем раз в report_interval секунд.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[float, Optional[float]], None]] = None,
+                 is_cancelled: Optional[Callable[[], bool]] = None,
+                 report_interval: float = 0.1):
+        """
+        Инициализация контекста.
+
+        Args:
+            on_progress: Callback (доля выполнения 0-1, оценка оставшегося времени в секундах)
+            is_cancelled: Функция, возвращающая True при запросе отмены
+            report_interval: Минимальный интервал между вызовами on_progress в секундах
+        """
+        self.on_progress = on_progress
+        self.is_cancelled = is_cancelled
+        self.report_interval = report_interval
+        self.total = 0
+        self.done = 0
+        self._start_time = time.perf_counter()
+        self._last_report = 0.0
+
+    def begin(self, total: int):
+        """
+        Объявляет объем работы и сбрасывает отсчет времени.
+
+        Args:
+            total: Число шагов (обычно строк, умноженных на число каналов)
+        """
+        self.total = max(0, int(total))
+        self.done = 0
+        self._start_time = time.perf_counter()
+        self._last_report = 0.0
+        self.check_cancelled()
+
+    def step(self, amount: int = 1):
+        """
+        Отмечает выполненные шаги и проверяет запрос отмены.
+
+        Args:
+            amount: Число выполненных шагов
+
+        Raises:
+            TransformCancelled: Если запрошена отмена
+        """
+        self.done += amount
+        self.check_cancelled()
+
+        if self.on_progress is None:
+            return
+
+        now = time.perf_counter()
+        if now - self._last_report >= self.report_interval or self.done >= self.total:
+            self._last_report = now
+            self.on_progress(self.fraction, self.eta())
+
+    def check_cancelled(self):
+        """
+        Проверяет запрос отмены.
+
+        Raises:
+            TransformCancelled: Если запрошена отмена
+        """
+        if self.is_cancelled is not None and self.is_cancelled():
+            raise TransformCancelled()
+
+    @property
+    def fraction(self) -> float:
+        """Доля выполненной работы (0-1)."""
+        if self.total <= 0:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    def eta(self) -> Optional[float]:
+        """
+        Оценивает оставшееся время по средней скорости выполнения.
+
+        Returns:
+            Optional[float]: Оставшееся время в секундах или None, если оценки еще нет
+        """
+        fraction = self.fraction
+        if fraction <= 0.0:
+            return None
+        elapsed = time.perf_counter() - self._start_time
+        return elapsed * (1.0 - fraction) / fraction
+
+
+class NullProgressContext(ProgressContext):
+    """
+    Контекст без отмены и без уведомлений.
+
+    Не хранит состояния: один экземпляр используется всеми преобразованиями,
+    в том числе из разных потоков, поэтому begin() и step() ничего не делают.
+    """
+
+    def begin(self, total: int):
+        """Ничего не делает: объем работы не отслеживается."""
+
+    def step(self, amount: int = 1):
+        """Ничего не делает: прогресс не отслеживается."""
+
+    def check_cancelled(self):
+        """Ничего не делает: отмена невозможна."""
+
+
+# Контекст по умолчанию: без отмены и без уведомлений
+NULL_PROGRESS = NullProgressContext()
@@ -0,0 +1,190 @@
+"""
+Эталонные попиксельные реализации фильтров.
+
+Попиксельные алгоритмы исходных фильтров сглаживания и резкости, которые
+не должны изменяться при оптимизации рабочих классов. Используются как оракулы
+в дифференциальной проверке (см. equivalence.py): любая ускоренная реализация
+сравнивается с ними на случайных изображениях.
+
+Особенности исходного поведения сохранены намеренно:
+- края дополняются повторением крайних пикселей (mode='edge');
+- результат приводится к целому отбрасыванием дробной части;
+- в нерезком маскировании дополнение определяется размером k, а размытие -
+  ядром Гаусса по правилу 3σ. Если радиус размытия больше k // 2, у краев
+  размытое значение остается нулевым и маска равна исходному пикселю.
+
+Две ошибки исходного кода исправлены, эталоны описывают исправленное поведение:
+- исходные фильтры всегда ограничивали результат диапазоном 0-255 и
+  приводили его к uint8, поэтому 16-битные изображения теряли разрядность;
+  эталоны ограничивают результат диапазоном исходного типа (dtype_max)
+  и возвращают массив того же типа;
+- исходное нерезкое маскирование цветного изображения записывало результат
+  канала в массив uint8 (np.zeros_like от дополненного изображения), и
+  выбросы за пределы 0-255 переполнялись до ограничения диапазона;
+  эталон вычисляет все каналы в float64, как исходный код делал
+  для оттенков серого.
+"""
+
+from typing import Callable, Dict
+import numpy as np
+
+from ..bit_depth import dtype_max
+from ..factories.transform_factory import (
+    FAMILY_BOX, FAMILY_MEDIAN, FAMILY_GAUSSIAN, FAMILY_SIGMA, FAMILY_UNSHARP
+)
+
+
+def reference_box(image_array: np.ndarray, kernel_size: int = 3) -> np.ndarray:
+    """
+    Прямоугольный фильтр.
+
+    Args:
+        image_array: Массив изображения
+        kernel_size: Размер ядра
+
+    Returns:
+        np.ndarray: Отфильтрованное изображение
+    """
+    kernel = np.ones((kernel_size, kernel_size)) / (kernel_size * kernel_size)
+    return _filter(image_array, kernel_size // 2, lambda window: np.sum(window * kernel))
+
+
+def reference_median(image_array: np.ndarray, kernel_size: int = 3) -> np.ndarray:
+    """
+    Медианный фильтр.
+
+    Args:
+        image_array: Массив изображения
+        kernel_size: Размер ядра
+
+    Returns:
+        np.ndarray: Отфильтрованное изображение
+    """
+    return _filter(image_array, kernel_size // 2, np.median)
+
+
+def reference_gaussian(image_array: np.ndarray, sigma: float = 1.0) -> np.ndarray:
+    """
+    Фильтр Гаусса с ядром по правилу 3σ.
+
+    Args:
+        image_array: Массив изображения
+        sigma: Стандартное отклонение
+
+    Returns:
+        np.ndarray: Отфильтрованное изображение
+    """
+    kernel = _gaussian_kernel(sigma)
+    return _filter(image_array, kernel.shape[0] // 2, lambda window: np.sum(window * kernel))
+
+
+def reference_sigma(image_array: np.ndarray, sigma: float = 1.0, kernel_size: int = 5) -> np.ndarray:
+    """
+    Сигма-фильтр: среднее пикселей окна, отклоняющихся от среднего не более чем на σ·std.
+
+    Args:
+        image_array: Массив изображения
+        sigma: Коэффициент порога отклонения
+        kernel_size: Размер окна
+
+    Returns:
+        np.ndarray: Отфильтрованное изображение
+    """
+    def sigma_mean(window: np.ndarray) -> float:
+        mean_value = np.mean(window)
+        threshold = sigma * np.std(window)
+        filtered_pixels = [pixel for pixel in window.flatten()
+                           if abs(pixel - mean_value) <= threshold]
+        if filtered_pixels:
+            return np.mean(filtered_pixels)
+        return mean_value
+
+    return _filter(image_array, kernel_size // 2, sigma_mean)
+
+
+def reference_unsharp(image_array: np.ndarray, kernel_size: int = 3,
+                      lambda_coeff: float = 1.0, sigma: float = 1.0) -> np.ndarray:
+    """
+    Нерезкое маскирование: I + λ·(I - G_σ * I).
+
+    Args:
+        image_array: Массив изображения
+        kernel_size: Размер ядра (k), определяет дополнение краев
+        lambda_coeff: Коэффициент усиления (λ)
+        sigma: Стандартное отклонение размытия
+
+    Returns:
+        np.ndarray: Изображение с повышенной резкостью
+    """
+    kernel = _gaussian_kernel(sigma)
+    blur_pad = kernel.shape[0] // 2
+
+    def sharpen(channel: np.ndarray) -> np.ndarray:
+        blurred = np.zeros_like(channel, dtype=np.float64)
+        for i in range(blur_pad, channel.shape[0] - blur_pad):
+            for j in range(blur_pad, channel.shape[1] - blur_pad):
+                window = channel[i-blur_pad:i+blur_pad+1, j-blur_pad:j+blur_pad+1]
+                blurred[i, j] = np.sum(window * kernel)
+        original = channel.astype(np.float64)
+        return original + lambda_coeff * (original - blurred)
+
+    return _per_channel(image_array, kernel_size // 2, sharpen)
+
+
+# Эталоны по семействам фильтров фабрики
+REFERENCE_FILTERS: Dict[str, Callable[..., np.ndarray]] = {
+    FAMILY_BOX: reference_box,
+    FAMILY_MEDIAN: reference_median,
+    FAMILY_GAUSSIAN: reference_gaussian,
+    FAMILY_SIGMA: reference_sigma,
+    FAMILY_UNSHARP: reference_unsharp,
+}
+
+
+def _gaussian_kernel(sigma: float) -> np.ndarray:
+    """Ядро Гаусса по правилу 3σ, вычисляемое поэлементно."""
+    kernel_size = int(2 * 3 * sigma) + 1
+    if kernel_size % 2 == 0:
+        kernel_size += 1
+    center = kernel_size // 2
+
+    kernel = np.zeros((kernel_size, kernel_size), dtype=np.float64)
+    for i in range(kernel_size):
+        for j in range(kernel_size):
+            x = i - center
+            y = j - center
+            kernel[i, j] = np.exp(-(x*x + y*y) / (2 * sigma * sigma))
+
+    kernel_sum = np.sum(kernel)
+    if kernel_sum > 0:
+        return kernel / kernel_sum
+    return np.ones((kernel_size, kernel_size)) / (kernel_size * kernel_size)
+
+
+def _filter(image_array: np.ndarray, pad_size: int,
+            window_function: Callable[[np.ndarray], float]) -> np.ndarray:
+    """Применяет функцию окна к каждому пикселю каждого канала."""
+    def filter_channel(channel: np.ndarray) -> np.ndarray:
+        result = np.zeros_like(channel, dtype=np.float64)
+        for i in range(pad_size, channel.shape[0] - pad_size):
+            for j in range(pad_size, channel.shape[1] - pad_size):
+                result[i, j] = window_function(channel[i-pad_size:i+pad_size+1, j-pad_size:j+pad_size+1])
+        return result
+
+    return _per_channel(image_array, pad_size, filter_channel)
+
+
+def _per_channel(image_array: np.ndarray, pad_size: int,
+                 channel_function: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Дополняет края, обрабатывает каналы по отдельности и приводит результат к исходному типу."""
+    if image_array.ndim == 3:
+        padded = np.pad(image_array, ((pad_size, pad_size), (pad_size, pad_size), (0, 0)), mode='edge')
+        result = np.stack([channel_function(padded[:, :, channel])
+                           for channel in range(padded.shape[2])], axis=2)
+    else:
+        padded = np.pad(image_array, pad_size, mode='edge')
+        result = channel_function(padded)
+
+    if pad_size > 0:
+        result = result[pad_size:-pad_size, pad_size:-pad_size]
+    return np.clip(result, 0, dtype_max(image_array)).astype(image_array.dtype)
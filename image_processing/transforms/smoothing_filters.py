@@ -3,8 +3,9 @@
 """
 
 import numpy as np
-from typing import Dict, Any, Tuple
-from .base_transform import BaseTransform
+from typing import Dict, Any, Tuple, Optional
+from .base_transform import BaseTransform, alpha_aware
+from .kernels import box_kernel, gaussian_kernel, gaussian_kernel_size
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,7 +19,7 @@ class SmoothingFilter(BaseTransform):
         Инициализация фильтра сглаживания.
         
         Args:
-            kernel_size: Размер ядра фильтра (3 или 5)
+            kernel_size: Размер ядра фильтра (нечетный, не меньше 3)
         """
         super().__init__()
         self.kernel_size = kernel_size
@@ -26,51 +27,29 @@ class SmoothingFilter(BaseTransform):
     
     def _validate_kernel_size(self):
         """Валидирует размер ядра."""
-        if self.kernel_size not in [3, 5]:
-            # Для фильтра Гаусса разрешаем большие размеры ядра
-            if hasattr(self, 'sigma') and self.kernel_size > 0:
-                pass  # Размер ядра вычисляется по правилу 3σ
-            else:
-                raise ValueError("Размер ядра должен быть 3 или 5")
-    
-    def _apply_padding(self, image: np.ndarray) -> np.ndarray:
-        """
-        Применяет padding к изображению для корректной обработки краев.
-        
-        Args:
-            image: Исходное изображение
-            
-        Returns:
-            np.ndarray: Изображение с padding
-        """
-        pad_size = self.kernel_size // 2
-        if len(image.shape) == 3:
-            # Цветное изображение
-            return np.pad(image, ((pad_size, pad_size), (pad_size, pad_size), (0, 0)), mode='edge')
-        else:
-            # Оттенки серого
-            return np.pad(image, pad_size, mode='edge')
-    
-    def _remove_padding(self, image: np.ndarray) -> np.ndarray:
-        """
-        Удаляет padding с изображения.
-        
-        Args:
-            image: Изображение с padding
-            
-        Returns:
-            np.ndarray: Изображение без padding
-        """
-        pad_size = self.kernel_size // 2
-        if len(image.shape) == 3:
-            return image[pad_size:-pad_size, pad_size:-pad_size, :]
-        else:
-            return image[pad_size:-pad_size, pad_size:-pad_size]
+        if not self._is_valid_kernel_size(self.kernel_size):
+            raise ValueError("Размер ядра должен быть нечетным числом не меньше 3")
+    
+    @staticmethod
+    def _is_valid_kernel_size(kernel_size) -> bool:
+        """Проверяет, что размер ядра - нечетное целое не меньше 3 (окно с центральным пикселем)."""
+        return isinstance(kernel_size, (int, np.integer)) and kernel_size >= 3 and kernel_size % 2 == 1
     
     def validate_parameters(self, **kwargs) -> bool:
         """Валидирует параметры фильтра."""
         kernel_size = kwargs.get('kernel_size', self.kernel_size)
-        return kernel_size in [3, 5]
+        return self._is_valid_kernel_size(kernel_size)
+    
+    def get_preview_parameters(self, scale: float, **kwargs) -> Optional[Dict[str, Any]]:
+        """Масштабирует радиус ядра под уменьшенную копию изображения."""
+        kernel_size = kwargs.get('kernel_size', self.kernel_size)
+        radius = int(round((kernel_size // 2) * scale))
+        if radius < 1:
+            return None
+        
+        preview_parameters = dict(kwargs)
+        preview_parameters['kernel_size'] = 2 * radius + 1
+        return preview_parameters
 
 
 class RectangularFilter(SmoothingFilter):
@@ -81,23 +60,31 @@ class RectangularFilter(SmoothingFilter):
         Инициализация прямоугольного фильтра.
         
         Args:
-            kernel_size: Размер ядра (3 или 5)
+            kernel_size: Размер ядра (нечетный, не меньше 3)
         """
         super().__init__(kernel_size)
-        self._create_kernel()
+        # Ядро строится при первом применении
+        self._kernel: Optional[np.ndarray] = None
+    
+    @property
+    def kernel(self) -> np.ndarray:
+        """Ядро фильтра, создаваемое при первом обращении."""
+        if self._kernel is None:
+            self._create_kernel()
+        return self._kernel
     
     def _create_kernel(self):
-        """Создает ядро прямоугольного фильтра."""
-        kernel_value = 1.0 / (self.kernel_size * self.kernel_size)
-        self.kernel = np.full((self.kernel_size, self.kernel_size), kernel_value)
+        """Берет ядро прямоугольного фильтра из общего кэша."""
+        self._kernel = box_kernel(self.kernel_size)
     
+    @alpha_aware(spatial=True)
     def apply(self, image_array: np.ndarray, **kwargs) -> np.ndarray:
         """
         Применяет прямоугольный фильтр к изображению.
         
         Args:
             image_array: Массив изображения
-            **kwargs: Дополнительные параметры (kernel_size)
+            **kwargs: Дополнительные параметры (kernel_size, border_mode, border_value)
             
         Returns:
             np.ndarray: Отфильтрованное изображение
@@ -106,39 +93,17 @@ class RectangularFilter(SmoothingFilter):
         if 'kernel_size' in kwargs:
             self.kernel_size = kwargs['kernel_size']
             self._validate_kernel_size()
-            self._create_kernel()
-        
-        # Применяем padding
-        padded_image = self._apply_padding(image_array)
+            self._kernel = None
         
-        # Применяем фильтр
-        filtered_image = self._apply_convolution(padded_image)
+        # Обновляем режим обработки краев если указан
+        self._update_border_parameters(kwargs)
         
-        # Удаляем padding
-        result = self._remove_padding(filtered_image)
+        # Применяем фильтр: внутренняя область - по исходному массиву,
+        # дополняются только полосы вдоль краев
+        result = self._filter_with_border(image_array, self._convolve_2d, self.kernel_size // 2)
         
         # Обеспечиваем корректный тип данных
-        return np.clip(result, 0, 255).astype(np.uint8)
-    
-    def _apply_convolution(self, image: np.ndarray) -> np.ndarray:
-        """
-        Применяет свертку с ядром фильтра.
-        
-        Args:
-            image: Изображение с padding
-            
-        Returns:
-            np.ndarray: Результат свертки
-        """
-        if len(image.shape) == 3:
-            # Цветное изображение
-            result = np.zeros_like(image)
-            for channel in range(image.shape[2]):
-                result[:, :, channel] = self._convolve_2d(image[:, :, channel])
-            return result
-        else:
-            # Оттенки серого
-            return self._convolve_2d(image)
+        return self._to_source_range(result, image_array)
     
     def _convolve_2d(self, image: np.ndarray) -> np.ndarray:
         """
@@ -159,6 +124,8 @@ class RectangularFilter(SmoothingFilter):
                 window = image[i-pad_size:i+pad_size+1, j-pad_size:j+pad_size+1]
                 # Применяем свертку
                 result[i, j] = np.sum(window * self.kernel)
+            
+            self.progress.step()
         
         return result
     
@@ -175,17 +142,18 @@ class MedianFilter(SmoothingFilter):
         Инициализация медианного фильтра.
         
         Args:
-            kernel_size: Размер ядра (3 или 5)
+            kernel_size: Размер ядра (нечетный, не меньше 3)
         """
         super().__init__(kernel_size)
     
+    @alpha_aware(spatial=True)
     def apply(self, image_array: np.ndarray, **kwargs) -> np.ndarray:
         """
         Применяет медианный фильтр к изображению.
         
         Args:
             image_array: Массив изображения
-            **kwargs: Дополнительные параметры (kernel_size)
+            **kwargs: Дополнительные параметры (kernel_size, border_mode, border_value)
             
         Returns:
             np.ndarray: Отфильтрованное изображение
@@ -195,37 +163,15 @@ class MedianFilter(SmoothingFilter):
             self.kernel_size = kwargs['kernel_size']
             self._validate_kernel_size()
         
-        # Применяем padding
-        padded_image = self._apply_padding(image_array)
+        # Обновляем режим обработки краев если указан
+        self._update_border_parameters(kwargs)
         
-        # Применяем медианный фильтр
-        filtered_image = self._apply_median_filter(padded_image)
-        
-        # Удаляем padding
-        result = self._remove_padding(filtered_image)
+        # Применяем фильтр: внутренняя область - по исходному массиву,
+        # дополняются только полосы вдоль краев
+        result = self._filter_with_border(image_array, self._median_filter_2d, self.kernel_size // 2)
         
         # Обеспечиваем корректный тип данных
-        return np.clip(result, 0, 255).astype(np.uint8)
-    
-    def _apply_median_filter(self, image: np.ndarray) -> np.ndarray:
-        """
-        Применяет медианный фильтр.
-        
-        Args:
-            image: Изображение с padding
-            
-        Returns:
-            np.ndarray: Результат медианной фильтрации
-        """
-        if len(image.shape) == 3:
-            # Цветное изображение
-            result = np.zeros_like(image)
-            for channel in range(image.shape[2]):
-                result[:, :, channel] = self._median_filter_2d(image[:, :, channel])
-            return result
-        else:
-            # Оттенки серого
-            return self._median_filter_2d(image)
+        return self._to_source_range(result, image_array)
     
     def _median_filter_2d(self, image: np.ndarray) -> np.ndarray:
         """
@@ -246,6 +192,8 @@ class MedianFilter(SmoothingFilter):
                 window = image[i-pad_size:i+pad_size+1, j-pad_size:j+pad_size+1]
                 # Вычисляем медиану
                 result[i, j] = np.median(window)
+            
+            self.progress.step()
         
         return result
     
@@ -254,46 +202,6 @@ class MedianFilter(SmoothingFilter):
         return f"Медианный фильтр {self.kernel_size}x{self.kernel_size}"
 
 
-class RectangularFilter3x3(RectangularFilter):
-    """Прямоугольный фильтр 3x3."""
-    
-    def __init__(self):
-        super().__init__(3)
-    
-    def get_name(self) -> str:
-        return "Прямоугольный фильтр 3x3"
-
-
-class RectangularFilter5x5(RectangularFilter):
-    """Прямоугольный фильтр 5x5."""
-    
-    def __init__(self):
-        super().__init__(5)
-    
-    def get_name(self) -> str:
-        return "Прямоугольный фильтр 5x5"
-
-
-class MedianFilter3x3(MedianFilter):
-    """Медианный фильтр 3x3."""
-    
-    def __init__(self):
-        super().__init__(3)
-    
-    def get_name(self) -> str:
-        return "Медианный фильтр 3x3"
-
-
-class MedianFilter5x5(MedianFilter):
-    """Медианный фильтр 5x5."""
-    
-    def __init__(self):
-        super().__init__(5)
-    
-    def get_name(self) -> str:
-        return "Медианный фильтр 5x5"
-
-
 class GaussianFilter(SmoothingFilter):
     """Фильтр Гаусса с ядром по правилу 3σ."""
     
@@ -305,14 +213,17 @@ class GaussianFilter(SmoothingFilter):
             sigma: Стандартное отклонение для фильтра Гаусса
         """
         # Вычисляем размер ядра по правилу 3σ
-        kernel_size = int(2 * 3 * sigma) + 1
-        # Обеспечиваем нечетный размер ядра
-        if kernel_size % 2 == 0:
-            kernel_size += 1
-        
-        super().__init__(kernel_size)
+        super().__init__(gaussian_kernel_size(sigma))
         self.sigma = sigma
-        self._create_gaussian_kernel()
+        # Ядро строится при первом применении
+        self._kernel: Optional[np.ndarray] = None
+    
+    @property
+    def kernel(self) -> np.ndarray:
+        """Ядро фильтра Гаусса, создаваемое при первом обращении."""
+        if self._kernel is None:
+            self._create_gaussian_kernel()
+        return self._kernel
     
     def _validate_kernel_size(self):
         """Валидирует размер ядра для фильтра Гаусса."""
@@ -320,80 +231,43 @@ class GaussianFilter(SmoothingFilter):
         if self.kernel_size <= 0:
             raise ValueError("Размер ядра должен быть положительным")
     
+    def validate_parameters(self, **kwargs) -> bool:
+        """Валидирует параметры фильтра Гаусса."""
+        sigma = kwargs.get('sigma', self.sigma)
+        return sigma > 0
+    
     def _create_gaussian_kernel(self):
-        """Создает ядро фильтра Гаусса."""
-        center = self.kernel_size // 2
-        kernel = np.zeros((self.kernel_size, self.kernel_size), dtype=np.float64)
-        
-        # Вычисляем значения ядра по формуле Гаусса
-        for i in range(self.kernel_size):
-            for j in range(self.kernel_size):
-                x = i - center
-                y = j - center
-                # Формула 2D Гаусса: G(x,y) = (1/(2πσ²)) * exp(-(x²+y²)/(2σ²))
-                exponent = -(x*x + y*y) / (2 * self.sigma * self.sigma)
-                kernel[i, j] = np.exp(exponent)
-        
-        # Нормализуем ядро, чтобы сумма была равна 1
-        kernel_sum = np.sum(kernel)
-        if kernel_sum > 0:
-            self.kernel = kernel / kernel_sum
-        else:
-            # Если сумма равна 0, создаем единичное ядро
-            self.kernel = np.ones((self.kernel_size, self.kernel_size)) / (self.kernel_size * self.kernel_size)
+        """Берет ядро фильтра Гаусса из общего кэша."""
+        self._kernel = gaussian_kernel(self.sigma, self.kernel_size)
     
+    @alpha_aware(spatial=True)
     def apply(self, image_array: np.ndarray, **kwargs) -> np.ndarray:
         """
         Применяет фильтр Гаусса к изображению.
         
         Args:
             image_array: Массив изображения
-            **kwargs: Дополнительные параметры (sigma)
+            **kwargs: Дополнительные параметры (sigma, border_mode, border_value)
             
         Returns:
             np.ndarray: Отфильтрованное изображение
         """
         # Обновляем параметры если указаны
-        if 'sigma' in kwargs:
+        if 'sigma' in kwargs and kwargs['sigma'] != self.sigma:
             self.sigma = kwargs['sigma']
-            # Пересчитываем размер ядра и ядро
-            kernel_size = int(2 * 3 * self.sigma) + 1
-            if kernel_size % 2 == 0:
-                kernel_size += 1
-            self.kernel_size = kernel_size
-            self._create_gaussian_kernel()
-        
-        # Применяем padding
-        padded_image = self._apply_padding(image_array)
+            # Пересчитываем размер ядра, ядро берется из кэша при применении
+            self.kernel_size = gaussian_kernel_size(self.sigma)
+            self._kernel = None
         
-        # Применяем фильтр
-        filtered_image = self._apply_convolution(padded_image)
+        # Обновляем режим обработки краев если указан
+        self._update_border_parameters(kwargs)
         
-        # Удаляем padding
-        result = self._remove_padding(filtered_image)
+        # Применяем фильтр: внутренняя область - по исходному массиву,
+        # дополняются только полосы вдоль краев
+        result = self._filter_with_border(image_array, self._convolve_2d, self.kernel_size // 2)
         
         # Обеспечиваем корректный тип данных
-        return np.clip(result, 0, 255).astype(np.uint8)
-    
-    def _apply_convolution(self, image: np.ndarray) -> np.ndarray:
-        """
-        Применяет свертку с ядром фильтра Гаусса.
-        
-        Args:
-            image: Изображение с padding
-            
-        Returns:
-            np.ndarray: Результат свертки
-        """
-        if len(image.shape) == 3:
-            # Цветное изображение
-            result = np.zeros_like(image)
-            for channel in range(image.shape[2]):
-                result[:, :, channel] = self._convolve_2d(image[:, :, channel])
-            return result
-        else:
-            # Оттенки серого
-            return self._convolve_2d(image)
+        return self._to_source_range(result, image_array)
     
     def _convolve_2d(self, image: np.ndarray) -> np.ndarray:
         """
@@ -414,9 +288,22 @@ class GaussianFilter(SmoothingFilter):
                 window = image[i-pad_size:i+pad_size+1, j-pad_size:j+pad_size+1]
                 # Применяем свертку
                 result[i, j] = np.sum(window * self.kernel)
+            
+            self.progress.step()
         
         return result
     
+    def get_preview_parameters(self, scale: float, **kwargs) -> Optional[Dict[str, Any]]:
+        """Масштабирует σ под уменьшенную копию изображения."""
+        sigma = kwargs.get('sigma', self.sigma) * scale
+        # Ядро меньше 3x3 по правилу 3σ не изменяет изображение
+        if int(2 * 3 * sigma) + 1 < 3:
+            return None
+        
+        preview_parameters = dict(kwargs)
+        preview_parameters['sigma'] = sigma
+        return preview_parameters
+    
     def get_name(self) -> str:
         """Возвращает название фильтра."""
         return f"Фильтр Гаусса σ={self.sigma:.1f}"
@@ -430,36 +317,6 @@ class GaussianFilter(SmoothingFilter):
         return self.sigma
 
 
-class GaussianFilterSigma1(GaussianFilter):
-    """Фильтр Гаусса с σ=1.0."""
-    
-    def __init__(self):
-        super().__init__(1.0)
-    
-    def get_name(self) -> str:
-        return "Фильтр Гаусса σ=1.0"
-
-
-class GaussianFilterSigma2(GaussianFilter):
-    """Фильтр Гаусса с σ=2.0."""
-    
-    def __init__(self):
-        super().__init__(2.0)
-    
-    def get_name(self) -> str:
-        return "Фильтр Гаусса σ=2.0"
-
-
-class GaussianFilterSigma3(GaussianFilter):
-    """Фильтр Гаусса с σ=3.0."""
-    
-    def __init__(self):
-        super().__init__(3.0)
-    
-    def get_name(self) -> str:
-        return "Фильтр Гаусса σ=3.0"
-
-
 class SigmaFilter(SmoothingFilter):
     """Сигма-фильтр для удаления шума."""
     
@@ -480,13 +337,20 @@ class SigmaFilter(SmoothingFilter):
         if self.kernel_size <= 0:
             raise ValueError("Размер ядра должен быть положительным")
     
+    def validate_parameters(self, **kwargs) -> bool:
+        """Валидирует параметры сигма-фильтра."""
+        kernel_size = kwargs.get('kernel_size', self.kernel_size)
+        sigma = kwargs.get('sigma', self.sigma)
+        return kernel_size > 0 and sigma >= 0
+    
+    @alpha_aware(spatial=True)
     def apply(self, image_array: np.ndarray, **kwargs) -> np.ndarray:
         """
         Применяет сигма-фильтр к изображению.
         
         Args:
             image_array: Массив изображения
-            **kwargs: Дополнительные параметры (sigma, kernel_size)
+            **kwargs: Дополнительные параметры (sigma, kernel_size, border_mode, border_value)
             
         Returns:
             np.ndarray: Отфильтрованное изображение
@@ -498,37 +362,15 @@ class SigmaFilter(SmoothingFilter):
             self.kernel_size = kwargs['kernel_size']
             self._validate_kernel_size()
         
-        # Применяем padding
-        padded_image = self._apply_padding(image_array)
+        # Обновляем режим обработки краев если указан
+        self._update_border_parameters(kwargs)
         
-        # Применяем сигма-фильтр
-        filtered_image = self._apply_sigma_filter(padded_image)
-        
-        # Удаляем padding
-        result = self._remove_padding(filtered_image)
+        # Применяем фильтр: внутренняя область - по исходному массиву,
+        # дополняются только полосы вдоль краев
+        result = self._filter_with_border(image_array, self._sigma_filter_2d, self.kernel_size // 2)
         
         # Обеспечиваем корректный тип данных
-        return np.clip(result, 0, 255).astype(np.uint8)
-    
-    def _apply_sigma_filter(self, image: np.ndarray) -> np.ndarray:
-        """
-        Применяет сигма-фильтр.
-        
-        Args:
-            image: Изображение с padding
-            
-        Returns:
-            np.ndarray: Результат сигма-фильтрации
-        """
-        if len(image.shape) == 3:
-            # Цветное изображение
-            result = np.zeros_like(image)
-            for channel in range(image.shape[2]):
-                result[:, :, channel] = self._sigma_filter_2d(image[:, :, channel])
-            return result
-        else:
-            # Оттенки серого
-            return self._sigma_filter_2d(image)
+        return self._to_source_range(result, image_array)
     
     def _sigma_filter_2d(self, image: np.ndarray) -> np.ndarray:
         """
@@ -569,6 +411,8 @@ class SigmaFilter(SmoothingFilter):
                 else:
                     # Если все пиксели отклоняются, берем среднее всего окна
                     result[i, j] = mean_value
+            
+            self.progress.step()
         
         return result
     
@@ -579,33 +423,3 @@ class SigmaFilter(SmoothingFilter):
     def get_sigma(self) -> float:
         """Возвращает значение σ."""
         return self.sigma
-
-
-class SigmaFilterSigma1(SigmaFilter):
-    """Сигма-фильтр с σ=1.0."""
-    
-    def __init__(self):
-        super().__init__(1.0, 5)
-    
-    def get_name(self) -> str:
-        return "Сигма-фильтр σ=1.0"
-
-
-class SigmaFilterSigma2(SigmaFilter):
-    """Сигма-фильтр с σ=2.0."""
-    
-    def __init__(self):
-        super().__init__(2.0, 5)
-    
-    def get_name(self) -> str:
-        return "Сигма-фильтр σ=2.0"
-
-
-class SigmaFilterSigma3(SigmaFilter):
-    """Сигма-фильтр с σ=3.0."""
-    
-    def __init__(self):
-        super().__init__(3.0, 5)
-    
-    def get_name(self) -> str:
-        return "Сигма-фильтр σ=3.0"
@@ -15,6 +15,9 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Импортируем новое группированное главное окно
 from gui.grouped_main_window import GroupedMainWindow
+from gui.components.animations import LoadingSpinner, ProgressBar
+from gui.components.render_queue import RenderQueue
+from image_processing.rendering import render_transform
 
 class ModernPhotoEditor:
     """Современный фоторедактор с полной функциональностью."""
@@ -27,6 +30,7 @@ class ModernPhotoEditor:
         self.setup_window()
         self.setup_styles()
         self.create_interface()
+        self.render_queue = RenderQueue(self.root, spinner=self.spinner, progress_bar=self.progress_bar)
         
     def setup_window(self):
         """Настройка главного окна."""
@@ -352,10 +356,19 @@ class ModernPhotoEditor:
         self.info_text.pack(fill=tk.X)
         self.info_text.insert(1.0, "Информация об изображении:\nИзображение не загружено")
         
-        # Статус бар
+        # Статус бар с индикаторами фонового расчета
+        status_frame = ttk.Frame(parent, style='Modern.TFrame')
+        status_frame.pack(fill=tk.X, pady=(10, 0), padx=20)
+        
         self.status_var = tk.StringVar(value="Готов к работе")
-        status_bar = ttk.Label(parent, textvariable=self.status_var, style='Status.TLabel')
-        status_bar.pack(fill=tk.X, pady=(10, 0), padx=20)
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, style='Status.TLabel')
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        self.progress_bar = ProgressBar(status_frame, width=160, height=16)
+        self.progress_bar.pack(side=tk.RIGHT, padx=(10, 0))
+        
+        self.spinner = LoadingSpinner(status_frame, size=20)
+        self.spinner.canvas.pack(side=tk.RIGHT)
     
     def load_image(self):
         """Загружает изображение."""
@@ -372,6 +385,7 @@ class ModernPhotoEditor:
         )
         
         if file_path:
+            self.render_queue.cancel()
             try:
                 self.original_image = Image.open(file_path)
                 self.display_original_image()
@@ -409,36 +423,33 @@ class ModernPhotoEditor:
         try:
             # Получаем параметры преобразования
             params = self.get_transform_parameters()
-            
-            # Применяем преобразование с помощью фабрики
-            from image_processing.factories.transform_factory import TransformFactory
-            
-            # Создаем преобразование
-            transform = TransformFactory.create_transform(transform_type)
-            
-            # Конвертируем изображение в numpy array
-            import numpy as np
-            image_array = np.array(self.original_image)
-            
-            # Применяем преобразование
-            processed_array = transform.apply(image_array, **params)
-            
-            # Конвертируем обратно в PIL Image
-            from PIL import Image
-            if len(processed_array.shape) == 3:
-                self.processed_image = Image.fromarray(processed_array)
-            else:
-                self.processed_image = Image.fromarray(processed_array, mode='L')
-            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Не удалось применить преобразование: {e}")
+            self.status_var.set("Ошибка применения преобразования")
+            return
+        
+        # Декодируем файл в потоке Tk: PIL не допускает параллельной загрузки
+        source_image = self.original_image
+        source_image.load()
+        
+        def on_done(processed_image):
+            self.processed_image = processed_image
             self.display_processed_image()
             
             # Обновляем информацию о примененных параметрах
             param_info = self.format_parameters_info(params)
             self.update_info(f"Применено преобразование: {transform_type}\n{param_info}")
             self.status_var.set(f"{transform_type} преобразование применено")
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Не удалось применить преобразование: {e}")
+        
+        def on_error(error):
+            messagebox.showerror("Ошибка", f"Не удалось применить преобразование: {error}")
             self.status_var.set("Ошибка применения преобразования")
+        
+        # Расчет выполняется в фоне, результат возвращается через after()
+        self.render_queue.submit(
+            lambda task: render_transform(source_image, transform_type, params, task.progress_context()),
+            on_done, on_error, debounce=False
+        )
     
     def get_transform_parameters(self):
         """Возвращает параметры преобразования."""
@@ -597,6 +608,7 @@ class ModernPhotoEditor:
             messagebox.showwarning("Предупреждение", "Нет изображения для сброса")
             return
         
+        self.render_queue.cancel()
         self.processed_image = None
         self.processed_canvas.delete("all")
         self.processed_canvas.create_text(200, 150, text="Примените преобразование\nдля просмотра результата", 
@@ -780,8 +792,9 @@ class ModernPhotoEditor:
             
             # Конвертируем изображения в numpy arrays
             import numpy as np
-            original_array = np.array(self.original_image)
-            processed_array = np.array(self.processed_image)
+            from image_processing.palette import image_to_array
+            original_array = image_to_array(self.original_image)
+            processed_array = image_to_array(self.processed_image)
             
             # Вычисляем метрики качества
             self.quality_metrics = self.quality_assessor.compute_quality_metrics(original_array, processed_array)
@@ -808,8 +821,11 @@ class ModernPhotoEditor:
             return
         
         try:
-            # Создаем визуализацию карты разности
-            visualization = self.quality_assessor.create_visualization_map(self.difference_map, 'hot')
+            # Создаем визуализацию карты разности сразу в разрешении отображения
+            display_size = (400, 200)
+            visualization = self.quality_assessor.create_visualization_map(
+                self.difference_map, 'hot', max_size=display_size
+            )
             
             # Конвертируем в PIL Image
             from PIL import Image
@@ -819,7 +835,6 @@ class ModernPhotoEditor:
                 diff_image = Image.fromarray(visualization, mode='L')
             
             # Изменяем размер для отображения
-            display_size = (400, 200)
             display_image = diff_image.copy()
             display_image.thumbnail(display_size, Image.Resampling.LANCZOS)
             
@@ -944,8 +959,9 @@ class ModernPhotoEditor:
             # Применяем выбранные фильтры
             import numpy as np
             from image_processing.factories.transform_factory import TransformFactory
+            from image_processing.palette import image_to_array
             
-            original_array = np.array(self.original_image)
+            original_array = image_to_array(self.original_image)
             filter_results = {}
             
             for filter_name in selected:
@@ -1065,7 +1081,8 @@ class ModernPhotoEditor:
             
             # Конвертируем изображение в numpy array
             import numpy as np
-            original_array = np.array(self.original_image)
+            from image_processing.palette import image_to_array
+            original_array = image_to_array(self.original_image)
             
             # Выполняем сравнение
             results = comparator.compare_sharpness_filters(
@@ -0,0 +1,79 @@
+"""
+Тесты для обработки изображений с альфа-каналом.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.channels import premultiply, unpremultiply
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_GAUSSIAN, FAMILY_MEDIAN
+from image_processing.quality_assessment import QualityAssessment
+from image_processing.transforms import NegativeTransform, ALPHA_PREMULTIPLIED
+
+
+class TestAlphaPassthrough(unittest.TestCase):
+    """Тесты для обработки только цветовых каналов."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.rgba = rng.integers(0, 256, (12, 15, 4), dtype=np.uint8)
+        self.la = rng.integers(0, 256, (12, 15, 2), dtype=np.uint8)
+
+    def test_filter_keeps_alpha_and_matches_rgb(self):
+        """Тест: фильтр не изменяет альфу, цвет совпадает с обработкой RGB."""
+        for family in (FAMILY_GAUSSIAN, FAMILY_MEDIAN):
+            result = TransformFactory.create_family(family).apply(self.rgba)
+            expected = TransformFactory.create_family(family).apply(self.rgba[..., :3].copy())
+            self.assertEqual(result.shape, self.rgba.shape)
+            np.testing.assert_array_equal(result[..., 3], self.rgba[..., 3])
+            np.testing.assert_array_equal(result[..., :3], expected)
+
+    def test_point_transform_on_la(self):
+        """Тест: негатив LA инвертирует яркость и сохраняет альфу."""
+        result = NegativeTransform().apply(self.la)
+        np.testing.assert_array_equal(result[..., 0], 255 - self.la[..., 0])
+        np.testing.assert_array_equal(result[..., 1], self.la[..., 1])
+
+    def test_premultiplied_mode(self):
+        """Тест: в режиме premultiplied цвет прозрачных пикселей не смешивается с соседними."""
+        image = np.zeros((9, 9, 4), dtype=np.uint8)
+        image[..., :3] = 200
+        image[..., 3] = 255
+        image[:, :4, :3] = (255, 0, 0)
+        image[:, :4, 3] = 0
+
+        result = TransformFactory.create_family(FAMILY_GAUSSIAN, sigma=1.0).apply(
+            image, alpha_mode=ALPHA_PREMULTIPLIED)
+        # Погрешность только от округления предумноженных значений
+        visible = result[..., 3] >= 64
+        self.assertTrue(visible.any())
+        self.assertLessEqual(np.abs(result[visible][:, :3].astype(int) - 200).max(), 3)
+
+    def test_premultiply_round_trip(self):
+        """Тест: для непрозрачных пикселей предумножение обратимо."""
+        image = self.rgba.copy()
+        image[..., 3] = 255
+        np.testing.assert_array_equal(unpremultiply(premultiply(image)), image)
+
+    def test_invalid_mode(self):
+        """Тест: неизвестный режим альфа-канала отклоняется."""
+        with self.assertRaises(ValueError):
+            NegativeTransform().apply(self.rgba, alpha_mode="unknown")
+
+
+class TestQualityIgnoresAlpha(unittest.TestCase):
+    """Тесты для метрик качества изображений с альфа-каналом."""
+
+    def test_alpha_difference_is_ignored(self):
+        """Тест: разность только в альфа-канале не влияет на метрики."""
+        original = np.full((10, 10, 4), 100, dtype=np.uint8)
+        processed = original.copy()
+        processed[..., 3] = 0
+
+        assessor = QualityAssessment()
+        self.assertEqual(assessor.compute_absolute_difference_map(original, processed).shape, (10, 10, 3))
+        self.assertEqual(assessor.compute_quality_metrics(original, processed)['max_difference'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
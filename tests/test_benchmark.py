@@ -0,0 +1,54 @@
+"""
+Тесты для набора замеров производительности.
+"""
+
+import unittest
+import numpy as np
+
+from benchmarks.transform_benchmark import (
+    TransformBenchmark, compare_results, synthetic_image, STATUS_OK
+)
+
+
+class TestTransformBenchmark(unittest.TestCase):
+    """Тесты для замеров и сравнения с базовой линией."""
+
+    def test_synthetic_image_modes(self):
+        """Тест размеров и каналов синтетических изображений."""
+        self.assertEqual(synthetic_image(0.01, "gray").ndim, 2)
+        self.assertEqual(synthetic_image(0.01, "rgba").shape[2], 4)
+        self.assertAlmostEqual(synthetic_image(0.25, "rgb")[..., 0].size / 1e6, 0.25, places=2)
+
+    def test_synthetic_image_does_not_wrap(self):
+        """Тест: сумма градиента и шума не переполняет uint8 (нет резких перепадов)."""
+        image = synthetic_image(0.01, "gray").astype(int)
+        self.assertLess(np.abs(np.diff(image, axis=1)).max(), 64)
+        self.assertGreater(image[-1, -1], 200)
+
+    def test_run_reports_throughput_and_memory(self):
+        """Тест: замер возвращает время, Мп/с и пиковую память."""
+        benchmark = TransformBenchmark(sizes=[0.01], modes=["rgb"], workers=[1, 2],
+                                       targets=["Бинарное"])
+        results = benchmark.run()
+
+        self.assertEqual(len(results), 2)
+        for result in results:
+            self.assertEqual(result['status'], STATUS_OK)
+            self.assertGreater(result['megapixels_per_second'], 0)
+            self.assertGreater(result['peak_memory_bytes'], 0)
+
+    def test_regressions_are_flagged(self):
+        """Тест: падение пропускной способности отмечается как регрессия."""
+        baseline = [{'key': 'a', 'status': STATUS_OK, 'megapixels_per_second': 10.0,
+                     'peak_memory_bytes': 100}]
+        current = [{'key': 'a', 'status': STATUS_OK, 'megapixels_per_second': 7.0,
+                    'peak_memory_bytes': 110}]
+
+        regressions = compare_results(current, baseline, tolerance=0.2)
+        self.assertEqual([regression['metric'] for regression in regressions],
+                         ['megapixels_per_second'])
+        self.assertEqual(compare_results(current, baseline, tolerance=0.5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Тесты для поддержки 16-битных изображений и изображений с плавающей точкой.
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+from image_processing.bit_depth import dtype_max, level_lut, to_histogram_levels
+from image_processing.image_manager import ImageManager
+from gui.image.image_manager import ImageManager as GuiImageManager
+from image_processing.transforms import (
+    LogarithmicTransform, PowerTransform, BinaryTransform, NegativeTransform, COLOR_SPACE_YCBCR
+)
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_BOX
+
+
+class TestBitDepth(unittest.TestCase):
+    """Тесты для преобразований с сохранением разрядности."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(7)
+        self.image16 = rng.integers(0, 4096, (12, 10, 3), dtype=np.uint16)
+        self.image_float = rng.random((12, 10)).astype(np.float32)
+
+    def test_lut_has_65536_entries_for_uint16(self):
+        """Тест размера таблицы и шкалы гистограммы для 16 бит."""
+        lut = level_lut(lambda levels: levels, np.uint16)
+        self.assertEqual(lut.size, 65536)
+        np.testing.assert_array_equal(lut, np.arange(65536))
+        self.assertEqual(dtype_max(self.image16), 65535.0)
+        self.assertEqual(to_histogram_levels(np.array([65535], dtype=np.uint16))[0], 255)
+
+    def test_transforms_keep_dtype_and_range(self):
+        """Тест: 16-битные значения не обрезаются до 8 бит."""
+        log_result = LogarithmicTransform().apply(self.image16)
+        self.assertEqual(log_result.dtype, np.uint16)
+        # c подбирается по максимуму 12-битных данных, поэтому результат доходит почти до 65535
+        self.assertGreater(int(log_result.max()), 60000)
+
+        self.assertEqual(LogarithmicTransform().apply(self.image16, color_space=COLOR_SPACE_YCBCR).dtype,
+                         np.uint16)
+        np.testing.assert_array_equal(NegativeTransform().apply(self.image16), 65535 - self.image16)
+
+        binary = BinaryTransform().apply(self.image_float, threshold=127.5)
+        self.assertEqual(binary.dtype, np.float32)
+        np.testing.assert_array_equal(binary, (self.image_float >= 0.5).astype(np.float32))
+
+    def test_filter_keeps_uint16(self):
+        """Тест: фильтр сохраняет тип uint16."""
+        result = TransformFactory.create_family(FAMILY_BOX, kernel_size=3).apply(self.image16)
+        self.assertEqual(result.dtype, np.uint16)
+        self.assertGreater(int(result.max()), 255)
+
+    def test_float_range_above_255(self):
+        """Тест: значения float-изображения выше 255 не обрезаются."""
+        image = np.linspace(0, 1000, 120, dtype=np.float32).reshape(12, 10)
+        self.assertEqual(dtype_max(image), 1000.0)
+
+        for result in (LogarithmicTransform().apply(image),
+                       PowerTransform().apply(image, gamma=1.0, c=1.0),
+                       TransformFactory.create_family(FAMILY_BOX, kernel_size=3).apply(image)):
+            self.assertEqual(result.dtype, np.float32)
+            self.assertGreater(float(result.max()), 900.0)
+        np.testing.assert_allclose(PowerTransform().apply(image, gamma=1.0, c=1.0), image, rtol=1e-5)
+
+
+class TestHighBitDepthPreview(unittest.TestCase):
+    """Тесты для предпросмотра 16-битных изображений."""
+
+    def setUp(self):
+        """Сохранение 16-битного изображения I;16."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "image16.png")
+        gradient = np.linspace(0, 65535, 300 * 200).reshape(200, 300).astype(np.uint16)
+        Image.fromarray(gradient).save(self.path)
+
+    def tearDown(self):
+        """Удаление временных файлов."""
+        self.directory.cleanup()
+
+    def test_preview_keeps_uint16(self):
+        """Тест: копия для предпросмотра I;16 строится и сохраняет 16 бит."""
+        manager = ImageManager()
+        self.assertTrue(manager.load_image(self.path))
+        proxy, scale = manager.get_preview_array((100, 100))
+        self.assertEqual(proxy.dtype, np.uint16)
+        self.assertEqual(proxy.shape, (67, 100))
+        self.assertAlmostEqual(scale, 1 / 3)
+        self.assertGreater(int(proxy.max()), 60000)
+
+        gui_manager = GuiImageManager(None)
+        gui_manager.original_image = Image.open(self.path)
+        success, message = gui_manager.preview_transform("Фильтр Гаусса σ=1.0", {})
+        self.assertTrue(success, message)
+        self.assertEqual(gui_manager.preview_image.mode, 'I;16')
+
+
+if __name__ == '__main__':
+    unittest.main()
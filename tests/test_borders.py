@@ -0,0 +1,48 @@
+"""
+Тесты для обработки краев фильтрами с окном.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.transforms.borders import BORDER_MODES, filter_with_border
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_BOX
+
+
+def box_region(region: np.ndarray, radius: int = 2) -> np.ndarray:
+    """Среднее по окну для позиций с полным окном."""
+    result = np.zeros(region.shape)
+    for i in range(radius, region.shape[0] - radius):
+        for j in range(radius, region.shape[1] - radius):
+            result[i, j] = region[i-radius:i+radius+1, j-radius:j+radius+1].mean()
+    return result
+
+
+class TestBorderModes(unittest.TestCase):
+    """Тесты для дополнения только полос вдоль краев."""
+
+    def test_matches_full_padding(self):
+        """Тест: результат совпадает с дополнением всего изображения через np.pad."""
+        channel = np.random.default_rng(0).random((17, 19))
+        for mode in BORDER_MODES:
+            for height, width in ((17, 19), (3, 19), (4, 5), (1, 1)):
+                with self.subTest(mode=mode, shape=(height, width)):
+                    source = channel[:height, :width]
+                    options = {'constant_values': 0.25} if mode == 'constant' else {}
+                    expected = box_region(np.pad(source, 2, mode=mode, **options))[2:-2, 2:-2]
+                    np.testing.assert_allclose(filter_with_border(source, box_region, 2, mode, 0.25), expected)
+
+    def test_filter_border_mode(self):
+        """Тест: режим краев задается параметром фильтра, внутренняя область не зависит от него."""
+        image = np.random.default_rng(1).integers(0, 256, (12, 14, 3), dtype=np.uint8)
+        edge = TransformFactory.create_family(FAMILY_BOX, kernel_size=3).apply(image)
+        wrap = TransformFactory.create_family(FAMILY_BOX, kernel_size=3).apply(image, border_mode='wrap')
+        np.testing.assert_array_equal(edge[1:-1, 1:-1], wrap[1:-1, 1:-1])
+        self.assertFalse(np.array_equal(edge, wrap))
+
+        with self.assertRaises(ValueError):
+            TransformFactory.create_family(FAMILY_BOX).apply(image, border_mode='mirror')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Тесты для точечных преобразований в режимах цветового пространства.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.transform_manager import TransformManager
+from image_processing.transforms import COLOR_SPACE_YCBCR, COLOR_SPACE_HSV
+from image_processing.transforms.color_space import apply_lut
+
+
+class TestColorSpaceModes(unittest.TestCase):
+    """Тесты для преобразования только яркостного канала."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(6)
+        self.test_image = rng.integers(0, 256, (30, 20, 3), dtype=np.uint8)
+        self.manager = TransformManager()
+
+    def test_identity_lut_round_trip(self):
+        """Тест: тождественная таблица почти не меняет изображение."""
+        identity = np.arange(256, dtype=np.uint8)
+
+        ycbcr = apply_lut(self.test_image, identity, COLOR_SPACE_YCBCR)
+        self.assertLessEqual(np.abs(ycbcr.astype(int) - self.test_image).max(), 2)
+        np.testing.assert_array_equal(apply_lut(self.test_image, identity, COLOR_SPACE_HSV), self.test_image)
+
+    def test_hsv_mode_preserves_hue(self):
+        """Тест: в режиме HSV соотношение каналов сохраняется."""
+        result = self.manager.apply_transform(
+            "Степенное", self.test_image, gamma=0.5, color_space=COLOR_SPACE_HSV
+        )
+
+        self.assertEqual(result.shape, self.test_image.shape)
+        value = self.test_image.max(axis=2).astype(float)
+        new_value = result.max(axis=2).astype(float)
+        mask = value > 64
+        expected = self.test_image[mask] * (new_value[mask] / value[mask])[:, np.newaxis]
+        self.assertLessEqual(np.abs(result[mask] - expected).max(), 1.0)
+        self.assertEqual(self.manager.last_parameters['color_space'], COLOR_SPACE_HSV)
+
+    def test_binary_keeps_color_in_ycbcr_mode(self):
+        """Тест: бинарное преобразование в режиме YCbCr возвращает цветное изображение."""
+        result = self.manager.apply_transform(
+            "Бинарное", self.test_image, threshold=128, color_space=COLOR_SPACE_YCBCR
+        )
+        self.assertEqual(result.shape, self.test_image.shape)
+
+        with self.assertRaises(ValueError):
+            self.manager.apply_transform("Негативное", self.test_image, color_space="lab")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Тесты для реентерабельного применения преобразований.
+"""
+
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from image_processing.image_statistics import ImageStatistics
+from image_processing.luma import LumaProvider
+from image_processing.transform_manager import TransformManager
+from image_processing.transforms.kernels import box_kernel
+from image_processing.transforms.smoothing_filters import GaussianFilter
+
+
+class TestConcurrentExecution(unittest.TestCase):
+    """Тесты для одновременного использования одного экземпляра."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.test_image = rng.integers(0, 256, (16, 16), dtype=np.uint8)
+
+    def test_execute_does_not_mutate_transform(self):
+        """Тест: параметры вызова не изменяют общий экземпляр."""
+        transform = GaussianFilter(sigma=1.0)
+        sigmas = [0.5, 1.0, 1.5, 2.0] * 2
+        expected = [GaussianFilter(sigma=sigma).apply(self.test_image) for sigma in sigmas]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda sigma: transform.execute(self.test_image, sigma=sigma).image, sigmas))
+
+        for result, reference in zip(results, expected):
+            np.testing.assert_array_equal(result, reference)
+        self.assertEqual(transform.sigma, 1.0)
+        self.assertEqual(transform.kernel_size, 7)
+
+    def test_manager_records_last_call(self):
+        """Тест: менеджер сохраняет параметры завершенного вызова."""
+        manager = TransformManager()
+        manager.apply_transform("Бинарное", self.test_image, threshold=100)
+
+        info = manager.get_last_transform_info()
+        self.assertEqual(info['transform_name'], "Бинарное")
+        self.assertEqual(info['parameters'], {'threshold': 100})
+        self.assertEqual(manager.last_parameters, {'threshold': 100})
+        self.assertEqual(manager.get_transform_info("Бинарное")['last_parameters'], {'threshold': 100})
+        # Общий экземпляр не хранит параметры вызовов из рабочих потоков
+        self.assertIsNone(manager.get_transform("Бинарное").last_parameters)
+
+
+
+class TestConcurrentCaches(unittest.TestCase):
+    """Тесты для общих LRU-кэшей при вытеснении из нескольких потоков."""
+
+    THREADS = 8
+    ROUNDS = 200
+
+    def setUp(self):
+        # Частое переключение потоков, чтобы гонки проявлялись стабильно
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def _run_threads(self, work):
+        """Выполняет work(index) одновременно в нескольких потоках и возвращает ошибки."""
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def run(index):
+            barrier.wait()
+            try:
+                for _ in range(self.ROUNDS):
+                    work(index)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_luma_and_statistics_caches(self):
+        """Тест: разные изображения в каждом потоке не приводят к ошибкам кэша."""
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 256, (4, 4, 3), dtype=np.uint8) for _ in range(self.THREADS)]
+        provider = LumaProvider(max_entries=2)
+        statistics = ImageStatistics(max_entries=2)
+        expected_luma = [LumaProvider().get(image) for image in images]
+
+        def work(index):
+            np.testing.assert_array_equal(provider.get(images[index]), expected_luma[index])
+            statistics.samples(images[index])
+
+        self.assertEqual(self._run_threads(work), [])
+
+    def test_kernel_cache(self):
+        """Тест: построение разных ядер из нескольких потоков с вытеснением из кэша."""
+        def work(index):
+            for kernel_size in range(1, 20, 2):
+                self.assertEqual(box_kernel(kernel_size + index * 20).shape[0], kernel_size + index * 20)
+
+        self.assertEqual(self._run_threads(work), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
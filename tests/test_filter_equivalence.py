@@ -0,0 +1,35 @@
+"""
+Дифференциальные тесты фильтров относительно эталонных реализаций.
+"""
+
+import unittest
+
+from image_processing.transforms.equivalence import (
+    EquivalenceHarness, format_mismatches, FILTER_PARAMETERS
+)
+from image_processing.transforms.reference_filters import REFERENCE_FILTERS
+
+
+class TestFilterEquivalence(unittest.TestCase):
+    """Тесты совпадения рабочих фильтров с эталонами."""
+
+    def setUp(self):
+        self.harness = EquivalenceHarness(seed=42)
+
+    def test_production_filters_match_reference(self):
+        """Тест: рабочие реализации всех семейств совпадают с эталоном."""
+        for family in REFERENCE_FILTERS:
+            with self.subTest(family=family):
+                mismatches = self.harness.compare(family)
+                self.assertEqual(mismatches, [], format_mismatches(mismatches))
+
+    def test_harness_detects_wrong_backend(self):
+        """Тест: реализация, не изменяющая изображение, не проходит проверку."""
+        mismatches = self.harness.compare("box", lambda image, **parameters: image.copy(),
+                                          FILTER_PARAMETERS["box"][:1])
+        self.assertTrue(mismatches)
+        self.assertTrue(all(mismatch.max_difference > 1 for mismatch in mismatches))
+
+
+if __name__ == '__main__':
+    unittest.main()
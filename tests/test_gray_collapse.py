@@ -0,0 +1,96 @@
+"""
+Тесты для хранения изображений в оттенках серого, сохраненных как RGB, одним каналом.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from PIL import Image
+
+from image_processing.channels import is_gray_rgb, collapse_gray, expand_gray
+from image_processing.image_processor import ImageProcessor
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_GAUSSIAN
+from gui.image.image_manager import ImageManager as GuiImageManager
+
+
+class TestGrayDetection(unittest.TestCase):
+    """Тесты для обнаружения одинаковых каналов."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.gray = np.repeat(rng.integers(0, 256, (300, 200, 1), dtype=np.uint8), 3, axis=2)
+
+    def test_detection(self):
+        """Тест: совпадающие каналы обнаруживаются, единичное отличие - нет."""
+        self.assertTrue(is_gray_rgb(self.gray))
+        color = self.gray.copy()
+        # Пиксель вне выборки находится полной проверкой
+        color[151, 37, 2] ^= 1
+        self.assertFalse(is_gray_rgb(color))
+        self.assertFalse(is_gray_rgb(self.gray[..., 0]))
+
+    def test_round_trip_with_alpha(self):
+        """Тест: RGBA сводится к LA и восстанавливается без потерь."""
+        rgba = np.concatenate([self.gray, self.gray[..., :1] // 2], axis=2)
+        collapsed = collapse_gray(rgba)
+        self.assertEqual(collapsed.shape, (300, 200, 2))
+        np.testing.assert_array_equal(expand_gray(collapsed), rgba)
+
+
+class TestGrayCollapseOnLoad(unittest.TestCase):
+    """Тесты для загрузки и сохранения изображения с одинаковыми каналами."""
+
+    def test_filter_runs_on_one_channel(self):
+        """Тест: фильтр применяется к одному каналу, а файл сохраняется в RGB."""
+        rng = np.random.default_rng(1)
+        rgb = np.repeat(rng.integers(0, 256, (40, 50, 1), dtype=np.uint8), 3, axis=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "scan.png")
+            target = os.path.join(directory, "result.png")
+            Image.fromarray(rgb).save(source)
+
+            processor = ImageProcessor()
+            self.assertTrue(processor.load_image(source))
+            self.assertEqual(processor.image_array.shape, (40, 50))
+            self.assertTrue(processor.get_image_info()['gray_collapsed'])
+
+            self.assertTrue(processor.apply_transform("Фильтр Гаусса σ=1.0"))
+            self.assertTrue(processor.save_image(target))
+
+            with Image.open(target) as saved:
+                self.assertEqual(saved.mode, 'RGB')
+                expected = TransformFactory.create_family(FAMILY_GAUSSIAN, sigma=1.0).apply(rgb)
+                np.testing.assert_array_equal(np.array(saved), expected)
+
+    def test_gui_manager_collapses_on_load(self):
+        """Тест: менеджер GUI тоже хранит изображение одним каналом и сохраняет RGBA."""
+        rng = np.random.default_rng(2)
+        gray = rng.integers(0, 256, (30, 20, 1), dtype=np.uint8)
+        rgba = np.concatenate([np.repeat(gray, 3, axis=2), np.full_like(gray, 200)], axis=2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "scan.png")
+            target = os.path.join(directory, "result.png")
+            Image.fromarray(rgba).save(source)
+
+            manager = GuiImageManager(None)
+            with mock.patch("gui.image.image_manager.filedialog") as dialog:
+                dialog.askopenfilename.return_value = source
+                dialog.asksaveasfilename.return_value = target
+                self.assertTrue(manager.load_image()[0])
+                self.assertEqual(manager.original_image.mode, 'LA')
+
+                self.assertTrue(manager.apply_transform("Фильтр Гаусса σ=1.0", {})[0])
+                self.assertTrue(manager.save_image()[0])
+
+            with Image.open(target) as saved:
+                self.assertEqual(saved.mode, 'RGBA')
+                expected = TransformFactory.create_family(FAMILY_GAUSSIAN, sigma=1.0).apply(rgba)
+                np.testing.assert_array_equal(np.array(saved), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Тесты для пирамиды изображения и области просмотра.
+"""
+
+import unittest
+import numpy as np
+from PIL import Image
+
+from gui.components.image_pyramid import ImagePyramid, ImageViewport
+from gui.components.overlay_compositor import (
+    OverlayCompositor, OVERLAY_SWIPE, OVERLAY_OPACITY, OVERLAY_DIFFERENCE
+)
+
+
+class TestImagePyramid(unittest.TestCase):
+    """Тесты для пирамиды ImagePyramid."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(2)
+        self.image = Image.fromarray(rng.integers(0, 256, (1100, 2100, 3), dtype=np.uint8))
+        self.pyramid = ImagePyramid(self.image, min_size=256)
+
+    def test_levels_are_built_lazily(self):
+        """Тест ленивого построения уровней."""
+        self.assertEqual(self.pyramid.level_count, 3)
+        self.assertEqual(len(self.pyramid._levels), 1)
+
+        self.assertEqual(self.pyramid.get_level(2).size, (525, 275))
+        self.assertEqual(len(self.pyramid._levels), 3)
+
+    def test_select_level(self):
+        """Тест выбора ближайшего уровня не ниже масштаба."""
+        self.assertEqual(self.pyramid.select_level(2.0), 0)
+        self.assertEqual(self.pyramid.select_level(0.6), 0)
+        self.assertEqual(self.pyramid.select_level(0.3), 1)
+        self.assertEqual(self.pyramid.select_level(0.01), 2)
+
+    def test_render_returns_viewport_size(self):
+        """Тест отрисовки только видимой области."""
+        region = self.pyramid.render(0.3, (10, 20, 200, 100))
+        self.assertEqual(region.size, (200, 100))
+
+    def test_palette_image_is_converted(self):
+        """Тест приведения палитрового изображения к режиму отображения."""
+        pyramid = ImagePyramid(self.image.convert('P'), min_size=256)
+        self.assertEqual(pyramid.get_level(1).mode, 'RGB')
+
+
+class TestImageViewport(unittest.TestCase):
+    """Тесты для области просмотра ImageViewport."""
+
+    def test_fit_centers_image(self):
+        """Тест вписывания и центрирования изображения."""
+        viewport = ImageViewport((800, 400))
+        viewport.fit(400, 400)
+
+        self.assertAlmostEqual(viewport.zoom, 0.5)
+        x, y, region = viewport.visible_region(400, 400)
+        self.assertEqual((x, y), (0, 100))
+        self.assertEqual(region, (0, 0, 400, 200))
+
+    def test_zoom_keeps_point_under_cursor(self):
+        """Тест масштабирования относительно курсора."""
+        viewport = ImageViewport((1000, 1000))
+        viewport.zoom = 1.0
+        viewport.offset_x, viewport.offset_y = 100.0, 100.0
+
+        viewport.zoom_at(2.0, 50, 50, 200, 200)
+
+        self.assertAlmostEqual(viewport.zoom, 2.0)
+        self.assertAlmostEqual((viewport.offset_x + 50) / viewport.zoom, 150.0)
+
+    def test_pan_is_clamped(self):
+        """Тест ограничения панорамирования краями изображения."""
+        viewport = ImageViewport((1000, 1000))
+        viewport.pan(500, 500, 200, 200)
+        self.assertEqual((viewport.offset_x, viewport.offset_y), (0.0, 0.0))
+
+        viewport.pan(-5000, -5000, 200, 200)
+        self.assertEqual((viewport.offset_x, viewport.offset_y), (800.0, 800.0))
+
+
+class TestOverlayCompositor(unittest.TestCase):
+    """Тесты для совмещения буферов в режиме наложения."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        self.compositor = OverlayCompositor()
+        original = Image.new('L', (10, 4), 100)
+        processed = Image.new('RGB', (10, 4), (200, 50, 100))
+        self.compositor.set_buffers('key', original, processed)
+
+    def test_swipe_splits_at_divider(self):
+        """Тест: слева от разделителя исходное, справа результат."""
+        composed = np.array(self.compositor.compose(OVERLAY_SWIPE, split=4))
+        np.testing.assert_array_equal(composed[:, :4], 100)
+        self.assertTrue(np.all(composed[:, 4:] == [200, 50, 100]))
+
+    def test_opacity_and_difference(self):
+        """Тест смешивания с прозрачностью и карты разности."""
+        blended = np.array(self.compositor.compose(OVERLAY_OPACITY, opacity=0.5))
+        np.testing.assert_array_equal(blended[0, 0], [150, 75, 100])
+
+        difference = np.array(self.compositor.compose(OVERLAY_DIFFERENCE))
+        np.testing.assert_array_equal(difference[0, 0], [100, 50, 0])
+        self.assertTrue(self.compositor.has_buffers('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Тесты для сервиса статистик изображения.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.image_statistics import ImageStatistics
+from image_processing.luma import LumaProvider, LUMA_BT709, LUMA_COEFFICIENTS, luma_provider
+from image_processing.auto_parameters import auto_parameters
+
+
+class TestImageStatistics(unittest.TestCase):
+    """Тесты для статистик на основе гистограмм."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(3)
+        self.image = rng.integers(0, 256, (40, 30, 3), dtype=np.uint8)
+        self.service = ImageStatistics()
+
+    def test_statistics_match_numpy(self):
+        """Тест совпадения статистик гистограммы с numpy."""
+        gray = luma_provider.get(self.image).astype(np.float64)
+        statistics = self.service.luma(self.image)
+
+        self.assertAlmostEqual(statistics.mean, float(gray.mean()))
+        self.assertAlmostEqual(statistics.std, float(gray.std()))
+        for q in (0, 25, 50, 75, 100):
+            self.assertAlmostEqual(statistics.percentile(q), float(np.percentile(gray, q)))
+        self.assertEqual(self.service.samples(self.image).max_value, int(self.image.max()))
+
+    def test_histogram_is_cached_per_array(self):
+        """Тест: гистограмма вычисляется один раз для каждого массива."""
+        first = self.service.luma(self.image)
+        self.assertIs(self.service.luma(self.image), first)
+        self.assertIsNot(self.service.luma(self.image.copy()), first)
+
+        self.service.invalidate(self.image)
+        self.assertIsNot(self.service.luma(self.image), first)
+
+
+class TestLumaProvider(unittest.TestCase):
+    """Тесты для целочисленного вычисления яркости."""
+
+    def test_fixed_point_matches_float_and_is_cached(self):
+        """Тест: целочисленная яркость близка к точной и кэшируется."""
+        rng = np.random.default_rng(5)
+        image = rng.integers(0, 256, (50, 40, 3), dtype=np.uint8)
+        provider = LumaProvider(standard=LUMA_BT709)
+
+        luma = provider.get(image)
+        exact = np.dot(image.astype(np.float64), LUMA_COEFFICIENTS[LUMA_BT709])
+        self.assertEqual(luma.dtype, np.uint8)
+        self.assertLessEqual(np.abs(luma - exact).max(), 1.5)
+        self.assertIs(provider.get(image), luma)
+        self.assertFalse(luma.flags.writeable)
+
+
+class TestAutoParameters(unittest.TestCase):
+    """Тесты для подбора параметров по гистограмме."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        self.rng = np.random.default_rng(4)
+        self.service = ImageStatistics()
+
+    def test_thresholds_separate_bimodal_histogram(self):
+        """Тест: пороги Оцу и треугольника лежат между модами."""
+        image = np.concatenate([
+            self.rng.normal(60, 10, 5000), self.rng.normal(180, 15, 5000)
+        ]).clip(0, 255).astype(np.uint8)
+        histogram = self.service.luma(image).histogram
+
+        self.assertTrue(90 < auto_parameters.otsu_threshold(histogram) < 150)
+        self.assertTrue(60 < auto_parameters.triangle_threshold(histogram) < 180)
+
+    def test_entropy_gamma_brightens_dark_image(self):
+        """Тест: для темного изображения выбирается гамма меньше 1, для светлого - больше."""
+        dark = (self.rng.random(10000) ** 3 * 255).astype(np.uint8)
+        bright = (self.rng.random(10000) ** 0.3 * 255).astype(np.uint8)
+
+        self.assertLess(auto_parameters.entropy_gamma(self.service.samples(dark))[0], 1.0)
+        self.assertGreater(auto_parameters.entropy_gamma(self.service.samples(bright))[0], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Тесты для реестра показателей производительности.
+"""
+
+import json
+import unittest
+import numpy as np
+
+from image_processing.instrumentation import InstrumentationRegistry, instrumentation
+from image_processing.transforms.smoothing_filters import MedianFilter
+
+
+class TestInstrumentationRegistry(unittest.TestCase):
+    """Тесты для замеров и экспорта показателей."""
+
+    def setUp(self):
+        self.registry = InstrumentationRegistry()
+
+    def test_measure_records_time_and_throughput(self):
+        """Тест: замер учитывает вызовы, ошибки и мегапиксели."""
+        with self.registry.measure("op", megapixels=2.0):
+            pass
+        with self.assertRaises(RuntimeError):
+            with self.registry.measure("op", megapixels=2.0):
+                raise RuntimeError()
+
+        stats = self.registry.snapshot()['operations']['op']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['megapixels'], 4.0)
+        self.assertGreaterEqual(stats['wall_time'], 0.0)
+
+    def test_allocation_tracking_is_opt_in(self):
+        """Тест: память учитывается только после включения."""
+        with self.registry.measure("alloc"):
+            np.ones(1 << 20)
+        self.registry.enable_allocation_tracking()
+        try:
+            with self.registry.measure("alloc"):
+                np.ones(1 << 20)
+        finally:
+            self.registry.disable_allocation_tracking()
+
+        stats = self.registry.snapshot()['operations']['alloc']
+        self.assertGreaterEqual(stats['max_allocated_bytes'], 8 << 20)
+
+    def test_exports(self):
+        """Тест экспорта в JSON и формат Prometheus."""
+        with self.registry.measure('transform."X"', megapixels=1.0):
+            pass
+        self.registry.record_cache("kernel", True)
+        self.registry.record_cache("kernel", False)
+
+        self.assertIn('transform."X"', json.loads(self.registry.to_json())['operations'])
+        text = self.registry.to_prometheus()
+        self.assertIn('image_processing_operation_calls_total{operation="transform.\\"X\\""} 1', text)
+        self.assertIn('image_processing_cache_hits_total{cache="kernel"} 1', text)
+        self.assertEqual(self.registry.summary()['cache_hit_rate']['kernel'], 0.5)
+
+    def test_transform_execution_is_measured(self):
+        """Тест: применение преобразования попадает в общий реестр."""
+        instrumentation.reset()
+        MedianFilter().execute(np.zeros((10, 10), dtype=np.uint8))
+        self.assertEqual(instrumentation.snapshot()['operations']['transform.MedianFilter']['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
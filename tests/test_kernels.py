@@ -0,0 +1,49 @@
+"""
+Тесты для фабрики ядер свертки.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.transforms import kernels
+
+
+class TestKernelFactory(unittest.TestCase):
+    """Тесты для построения и кэширования ядер."""
+
+    def setUp(self):
+        kernels.clear_kernel_cache()
+
+    def test_gaussian_kernel_matches_formula(self):
+        """Тест: ядро совпадает с формулой 2D Гаусса."""
+        sigma, size = 1.5, 9
+        offsets = np.arange(size) - size // 2
+        x, y = np.meshgrid(offsets, offsets, indexing='ij')
+        expected = np.exp(-(x * x + y * y) / (2 * sigma * sigma))
+        expected /= expected.sum()
+
+        kernel = kernels.gaussian_kernel(sigma, size)
+        np.testing.assert_allclose(kernel, expected, atol=1e-15)
+        np.testing.assert_allclose(np.outer(*[kernels.gaussian_kernel_1d(sigma, size)] * 2), kernel)
+
+    def test_kernels_are_cached_by_dtype(self):
+        """Тест: ядро строится один раз для каждого набора (σ, размер, тип)."""
+        kernel = kernels.gaussian_kernel(2.0)
+        self.assertIs(kernels.gaussian_kernel(2.0), kernel)
+        kernel32 = kernels.gaussian_kernel(2.0, dtype=np.float32)
+        self.assertEqual(kernel32.dtype, np.float32)
+        self.assertIsNot(kernel32, kernel)
+        with self.assertRaises(ValueError):
+            kernel[0, 0] = 1.0
+
+    def test_cache_is_bounded(self):
+        """Тест: кэш вытесняет давно не использованные ядра."""
+        first = kernels.box_kernel(3)
+        for size in range(5, 5 + 2 * kernels.MAX_CACHED_KERNELS, 2):
+            kernels.box_kernel(size)
+        self.assertEqual(len(kernels._kernel_cache), kernels.MAX_CACHED_KERNELS)
+        self.assertIsNot(kernels.box_kernel(3), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Тесты для очередного логирования с ограничением частоты.
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.logger import DeferredQueueHandler, RateLimitFilter, PACKAGE_LOGGERS, setup_logger, stop_logging
+
+
+class _ListQueue(list):
+    """Очередь, сохраняющая записи в список."""
+
+    def put_nowait(self, record):
+        self.append(record)
+
+
+class TestQueuedLogging(unittest.TestCase):
+    """Тесты для отложенного форматирования и ограничения частоты."""
+
+    def setUp(self):
+        self.records = _ListQueue()
+        self.handler = DeferredQueueHandler(self.records)
+        self.logger = logging.getLogger("tests.queued_logging")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+
+    def test_formatting_is_deferred(self):
+        """Тест: аргументы подставляются только при форматировании."""
+        self.logger.info("Порог = %s", 128)
+        record = self.records[0]
+        self.assertEqual(record.msg, "Порог = %s")
+        self.assertEqual(record.getMessage(), "Порог = 128")
+
+    def test_repeated_messages_are_rate_limited(self):
+        """Тест: одинаковые сообщения ограничиваются, предупреждения - нет."""
+        self.handler.addFilter(RateLimitFilter(max_records=3, interval=60.0))
+        for value in range(10):
+            self.logger.debug("Строка %d", value)
+            self.logger.warning("Предупреждение %d", value)
+
+        debug_records = [record for record in self.records if record.levelno == logging.DEBUG]
+        self.assertEqual(len(debug_records), 3)
+        self.assertEqual(len(self.records) - len(debug_records), 10)
+
+    def test_expired_windows_are_evicted(self):
+        """Тест: завершившиеся интервалы не накапливаются."""
+        clock = [0.0]
+        with mock.patch("utils.logger.time.monotonic", side_effect=lambda: clock[0]):
+            rate_filter = RateLimitFilter(max_records=1, interval=1.0)
+            self.handler.addFilter(rate_filter)
+            for value in range(100):
+                clock[0] = value * 0.5
+                self.logger.debug(f"Уникальное сообщение {value}")
+
+        self.assertLessEqual(len(rate_filter._windows), 3)
+
+
+class TestSetupLogger(unittest.TestCase):
+    """Тесты для настройки логгера приложения."""
+
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        stop_logging()
+        for name in ("tests.setup_logger",) + PACKAGE_LOGGERS:
+            configured = logging.getLogger(name)
+            for handler in list(configured.handlers):
+                configured.removeHandler(handler)
+            configured.setLevel(logging.NOTSET)
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    def test_package_loggers_keep_effective_level(self):
+        """Тест: логгеры модулей сохраняют уровень, если он не задан явно."""
+        levels = {name: logging.getLogger(name).getEffectiveLevel() for name in PACKAGE_LOGGERS}
+        setup_logger("tests.setup_logger", level=logging.INFO)
+
+        for name in PACKAGE_LOGGERS:
+            self.assertEqual(logging.getLogger(name).getEffectiveLevel(), levels[name])
+            self.assertTrue(logging.getLogger(name).handlers)
+
+
+if __name__ == '__main__':
+    unittest.main()
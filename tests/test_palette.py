@@ -0,0 +1,58 @@
+"""
+Тесты для обработки изображений с палитрой.
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from PIL import Image
+
+from image_processing.image_processor import ImageProcessor
+from image_processing.palette import apply_to_palette, image_to_array
+from image_processing.transforms import NegativeTransform, PowerTransform
+
+
+class TestPalettePath(unittest.TestCase):
+    """Тесты для преобразования палитры вместо пикселей."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        rgb = rng.integers(0, 256, (20, 30, 3), dtype=np.uint8)
+        self.image = Image.fromarray(rgb).quantize(colors=16)
+        self.colors = image_to_array(self.image)
+
+    def test_image_to_array_returns_colors(self):
+        """Тест: изображение с палитрой преобразуется в цвета, а не в индексы."""
+        self.assertEqual(self.colors.shape, (20, 30, 3))
+        np.testing.assert_array_equal(self.colors, np.array(self.image.convert('RGB')))
+
+    def test_palette_matches_pixel_processing(self):
+        """Тест: преобразование палитры совпадает с преобразованием пикселей."""
+        for transform, parameters in ((NegativeTransform(), {}), (PowerTransform(), {'gamma': 0.5})):
+            result = apply_to_palette(self.image, lambda colors: transform.apply(colors, **parameters))
+            self.assertEqual(result.mode, 'P')
+            np.testing.assert_array_equal(np.array(result), np.array(self.image))
+            np.testing.assert_array_equal(image_to_array(result), transform.apply(self.colors, **parameters))
+
+    def test_processor_uses_palette_for_point_transforms(self):
+        """Тест: процессор сохраняет палитру для поточечных преобразований и RGB для фильтров."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "palette.png")
+            self.image.save(path)
+
+            processor = ImageProcessor()
+            self.assertTrue(processor.load_image(path))
+            self.assertEqual(processor.image_array.shape, (20, 30, 3))
+
+            self.assertTrue(processor.apply_power_transform(gamma=2.0))
+            self.assertEqual(processor.processed_image.mode, 'P')
+            np.testing.assert_array_equal(processor.image_manager.processed_array,
+                                          PowerTransform().apply(self.colors, gamma=2.0))
+
+            self.assertTrue(processor.apply_transform("Фильтр Гаусса σ=1.0"))
+            self.assertEqual(processor.processed_image.mode, 'RGB')
+
+
+if __name__ == '__main__':
+    unittest.main()
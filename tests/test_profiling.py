@@ -0,0 +1,77 @@
+"""
+Тесты для профилирования операций по запросу.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from utils.profiling import TracedPeak, configure_profiling, get_profiling_config, profiled
+
+
+class TestProfiling(unittest.TestCase):
+    """Тесты для сохранения снимков cProfile и tracemalloc."""
+
+    def setUp(self):
+        config = get_profiling_config()
+        self.saved = (config.enabled, config.sample_rate, config.output_dir)
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.output_dir = self.temporary_directory.name
+
+    def tearDown(self):
+        enabled, sample_rate, output_dir = self.saved
+        configure_profiling(enabled=enabled, sample_rate=sample_rate, output_dir=output_dir)
+        self.temporary_directory.cleanup()
+
+    def test_disabled_profiling_writes_nothing(self):
+        """Тест: без включения снимки не создаются."""
+        configure_profiling(enabled=False, output_dir=self.output_dir)
+        self.assertEqual(profiled("op")(lambda: 42)(), 42)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_capture_files(self):
+        """Тест: профилируемый вызов сохраняет .pstats и .json."""
+        configure_profiling(enabled=True, sample_rate=1.0, output_dir=self.output_dir)
+
+        @profiled("test.operation")
+        def allocate():
+            return [bytearray(1024) for _ in range(100)]
+
+        self.assertEqual(len(allocate()), 100)
+        files = sorted(os.listdir(self.output_dir))
+        self.assertEqual([os.path.splitext(name)[1] for name in files], ['.json', '.pstats'])
+        self.assertTrue(files[0].startswith("test.operation_"))
+
+        with open(os.path.join(self.output_dir, files[0]), encoding='utf-8') as file:
+            report = json.load(file)
+        self.assertEqual(report['status'], "ok")
+        self.assertGreater(report['peak_memory_bytes'], 100 * 1024)
+
+    def test_nested_peak_is_kept(self):
+        """Тест: вложенный замер памяти не сбрасывает пик профилируемой операции."""
+        configure_profiling(enabled=True, sample_rate=1.0, output_dir=self.output_dir)
+
+        @profiled("test.nested")
+        def allocate_then_measure():
+            buffer = bytearray(1024 * 1024)
+            del buffer
+            with TracedPeak() as inner:
+                small = bytearray(1024)
+            return inner.peak, small
+
+        allocate_then_measure()
+        report_name = next(name for name in os.listdir(self.output_dir) if name.endswith(".json"))
+        with open(os.path.join(self.output_dir, report_name), encoding='utf-8') as file:
+            report = json.load(file)
+        self.assertGreater(report['peak_memory_bytes'], 1024 * 1024)
+
+    def test_sampling(self):
+        """Тест: при нулевой доле вызовы не профилируются."""
+        configure_profiling(enabled=True, sample_rate=0.0, output_dir=self.output_dir)
+        profiled("op")(lambda: None)()
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Тесты для карты разности и цветовых схем.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.colormaps import COLORMAPS, get_colormap
+from image_processing.quality_assessment import QualityAssessment
+
+
+class TestDifferenceVisualization(unittest.TestCase):
+    """Тесты для вычисления и раскраски карты разности."""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.original = rng.integers(0, 256, (30, 40, 3), dtype=np.uint8)
+        self.processed = rng.integers(0, 256, (30, 40, 3), dtype=np.uint8)
+        self.assessor = QualityAssessment()
+
+    def test_difference_map_matches_float_computation(self):
+        """Тест: разность в int16 совпадает с вычислением в float64."""
+        expected = np.abs(self.original.astype(np.float64) - self.processed).astype(np.uint8)
+        np.testing.assert_array_equal(
+            self.assessor.compute_absolute_difference_map(self.original, self.processed), expected)
+
+    def test_colormap_tables(self):
+        """Тест: таблицы схем 256x3 и горячая схема от черного к белому."""
+        for table in COLORMAPS.values():
+            self.assertEqual(table.shape, (256, 3))
+            self.assertEqual(table.dtype, np.uint8)
+        hot = get_colormap("hot")
+        np.testing.assert_array_equal(hot[0], [0, 0, 0])
+        np.testing.assert_array_equal(hot[255], [255, 255, 255])
+        np.testing.assert_array_equal(hot[100], [255, 45, 0])
+        self.assertIs(get_colormap("unknown"), COLORMAPS["gray"])
+
+    def test_visualization_is_normalized_and_colored(self):
+        """Тест: максимум разности отображается в последний цвет схемы."""
+        diff_map = np.array([[0, 10], [20, 40]], dtype=np.uint8)
+        visualization = self.assessor.create_visualization_map(diff_map, "viridis")
+        self.assertEqual(visualization.shape, (2, 2, 3))
+        np.testing.assert_array_equal(visualization[1, 1], COLORMAPS["viridis"][255])
+        np.testing.assert_array_equal(visualization[0, 1], COLORMAPS["viridis"][63])
+
+    def test_preview_keeps_maximum_at_display_size(self):
+        """Тест: уменьшенная карта не больше max_size и сохраняет точечные отличия."""
+        original = np.zeros((101, 203), dtype=np.uint8)
+        processed = original.copy()
+        processed[57, 131] = 200
+
+        preview = self.assessor.compute_difference_preview(original, processed, (40, 30), "gray")
+        self.assertLessEqual(preview.shape[1], 40)
+        self.assertLessEqual(preview.shape[0], 30)
+        self.assertEqual(int(preview.max()), 255)
+
+
+if __name__ == '__main__':
+    unittest.main()
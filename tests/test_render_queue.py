@@ -0,0 +1,127 @@
+"""
+Тесты для фоновой очереди расчета преобразований.
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from PIL import Image
+
+from gui.components.render_queue import RenderQueue
+from image_processing.image_processor import ImageProcessor
+from image_processing.transforms.progress import ProgressContext, TransformCancelled
+
+
+class FakeWidget:
+    """Заменитель виджета Tk: вызовы after() выполняются вручную."""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+    def run_pending(self):
+        callbacks = list(self.callbacks.values())
+        self.callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+
+class TestRenderQueue(unittest.TestCase):
+    """Тесты для очереди RenderQueue."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        self.widget = FakeWidget()
+        self.render_queue = RenderQueue(self.widget, debounce_ms=10, poll_ms=1)
+
+    def tearDown(self):
+        """Остановка рабочего потока."""
+        self.render_queue.shutdown()
+
+    def _wait_idle(self, timeout=5.0):
+        deadline = time.time() + timeout
+        while self.render_queue.is_busy() and time.time() < deadline:
+            self.widget.run_pending()
+            time.sleep(0.005)
+
+    def test_rapid_requests_are_coalesced(self):
+        """Тест объединения частых запросов: выполняется только последний."""
+        rendered = []
+        delivered = []
+
+        for value in range(5):
+            self.render_queue.submit(
+                lambda task, value=value: rendered.append(value) or value,
+                delivered.append
+            )
+
+        self._wait_idle()
+
+        self.assertEqual(rendered, [4])
+        self.assertEqual(delivered, [4])
+
+    def test_stale_result_is_dropped(self):
+        """Тест отбрасывания результата устаревшего расчета."""
+        started = threading.Event()
+        release = threading.Event()
+        delivered = []
+
+        def slow_render(task):
+            started.set()
+            release.wait(5.0)
+            return "stale"
+
+        self.render_queue.submit(slow_render, delivered.append, debounce=False)
+        self.assertTrue(started.wait(5.0))
+
+        self.render_queue.submit(lambda task: "latest", delivered.append, debounce=False)
+        release.set()
+        self._wait_idle()
+
+        self.assertEqual(delivered, ["latest"])
+
+
+class TestBackgroundRender(unittest.TestCase):
+    """Тесты для расчета без изменения состояния процессора."""
+
+    def setUp(self):
+        """Загрузка тестового изображения."""
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, "image.png")
+        rng = np.random.default_rng(0)
+        Image.fromarray(rng.integers(0, 256, (16, 16, 3), dtype=np.uint8)).save(path)
+        self.processor = ImageProcessor()
+        self.assertTrue(self.processor.load_image(path))
+
+    def tearDown(self):
+        """Удаление временных файлов."""
+        self.directory.cleanup()
+
+    def test_render_does_not_change_state(self):
+        """Тест: результат сохраняется только при commit_transform."""
+        result = self.processor.render_transform("Бинарное", threshold=128)
+        self.assertIsNone(self.processor.processed_image)
+
+        self.processor.commit_transform(result)
+        np.testing.assert_array_equal(self.processor.image_manager.processed_array, result)
+
+    def test_cancelled_point_transform_stops(self):
+        """Тест: отмененный расчет поточечного преобразования прерывается."""
+        progress = ProgressContext(is_cancelled=lambda: True)
+        with self.assertRaises(TransformCancelled):
+            self.processor.render_transform("Степенное", progress, gamma=2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Тесты для поиска параметров фильтров резкости.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.sharpness_comparator import SharpnessComparator
+
+
+class TestCoarseToFineSearch(unittest.TestCase):
+    """Тесты для поиска параметров от грубого к точному."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(0)
+        y, x = np.mgrid[0:48, 0:56]
+        base = 127 + 60 * np.sin(x / 5.0) * np.cos(y / 7.0) + rng.normal(0, 8, (48, 56))
+        self.test_image = np.clip(base, 0, 255).astype(np.uint8)
+        self.comparator = SharpnessComparator()
+
+    def test_golden_section_finds_maximum(self):
+        """Тест поиска максимума методом золотого сечения."""
+        best_x, best_value = self.comparator._golden_section_search(
+            lambda x: -(x - 1.3) ** 2, 0.0, 3.0, 1e-3
+        )
+        self.assertAlmostEqual(best_x, 1.3, places=2)
+        self.assertAlmostEqual(best_value, 0.0, places=4)
+
+    def test_optimizer_confirms_only_top_candidates(self):
+        """Тест проверки на полном разрешении только лучших кандидатов."""
+        results = self.comparator.optimize_sharpness_parameters(
+            self.test_image, sigma_range=(0.5, 2.0), lambda_range=(0.1, 3.0),
+            proxy_size=24, top_candidates=2
+        )
+
+        # Два кандидата с λ от копии и, возможно, уточненный λ лучшего из них
+        self.assertIn(len(results['quality_metrics']), (2, 3))
+
+        best = results['best_parameters']
+        self.assertTrue(0.5 <= best['sigma'] <= 2.0)
+        self.assertTrue(0.1 <= best['lambda_coeff'] <= 3.0)
+        self.assertIn('best_score', results['best_filters'])
+
+    def test_optimizer_matches_grid_optimum(self):
+        """Тест совпадения результата поиска с оптимумом полного перебора."""
+        # Амплитуда подобрана так, чтобы насыщение давало оптимум внутри диапазонов σ и λ
+        y, x = np.mgrid[0:64, 0:72]
+        image = np.clip(127 + 116 * np.sin(x / 7.0) * np.cos(y / 11.0), 0, 255).astype(np.uint8)
+        lambda_values = np.linspace(0.1, 3.0, 15)
+
+        grid_score, grid_sigma, grid_lambda = max(
+            (self.comparator._sharpness_score(image, self.comparator._unsharp_masking(image, sigma, lambda_coeff), 10.0),
+             round(float(sigma), 6), lambda_coeff)
+            for sigma in np.geomspace(0.5, 3.0, 4) for lambda_coeff in lambda_values
+        )
+
+        results = self.comparator.optimize_sharpness_parameters(
+            image, sigma_range=(0.5, 3.0), sigma_steps=4, proxy_size=32, top_candidates=2
+        )
+
+        best = results['best_parameters']
+        self.assertAlmostEqual(best['sigma'], grid_sigma)
+        self.assertLess(abs(best['lambda_coeff'] - grid_lambda), lambda_values[1] - lambda_values[0])
+        self.assertGreaterEqual(max(results['candidate_scores'].values()), grid_score - 1e-3)
+
+    def test_optimizer_handles_16_bit_color(self):
+        """Тест поиска параметров для 16-битного цветного изображения."""
+        image = self.test_image.astype(np.uint16)[..., np.newaxis].repeat(3, axis=2) * 257
+        image = np.clip(image, 257, 65535 - 257)
+
+        proxy = self.comparator._create_proxy_image(image, 24)
+        self.assertEqual(proxy.dtype, np.uint16)
+        self.assertEqual(proxy.shape, (21, 24, 3))
+
+        # Насыщение считается относительно 65535, а не 255
+        def clip_fraction(sharpened):
+            penalized = self.comparator._sharpness_score(image, sharpened, 1.0)
+            return self.comparator._sharpness_score(image, sharpened, 0.0) - penalized
+
+        for value, expected in ((255, 0.0), (65535, 1 / image.shape[0])):
+            sharpened = image.copy()
+            sharpened[0] = value
+            self.assertAlmostEqual(clip_fraction(sharpened), expected)
+
+        results = self.comparator.optimize_sharpness_parameters(
+            image, sigma_range=(0.5, 1.0), sigma_steps=2, proxy_size=24, top_candidates=1
+        )
+        self.assertEqual(results['filter_results'][results['best_filters']['best_score']].dtype, np.uint16)
+
+    def test_unknown_search_mode(self):
+        """Тест неизвестного режима поиска."""
+        with self.assertRaises(ValueError):
+            self.comparator.compare_sharpness_filters(self.test_image, search_mode="random")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Тесты для отчета о прогрессе и отмены преобразований.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.transforms.progress import ProgressContext, TransformCancelled, NULL_PROGRESS
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_MEDIAN
+from image_processing.transforms.sharpness_filters import UnsharpMasking
+
+
+class TestTransformProgress(unittest.TestCase):
+    """Тесты для контекста прогресса в фильтрах."""
+
+    def setUp(self):
+        """Настройка тестов."""
+        rng = np.random.default_rng(1)
+        self.test_image = rng.integers(0, 256, (20, 16, 3), dtype=np.uint8)
+
+    def test_progress_reaches_completion(self):
+        """Тест: прогресс доходит до 100% и результат не меняется."""
+        reports = []
+        progress = ProgressContext(on_progress=lambda f, eta: reports.append(f), report_interval=0.0)
+
+        transform = UnsharpMasking(kernel_size=3, lambda_coeff=1.0)
+        result = transform.apply_with_progress(self.test_image, progress)
+
+        self.assertEqual(progress.done, progress.total)
+        self.assertEqual(reports[-1], 1.0)
+        np.testing.assert_array_equal(result, transform.apply(self.test_image))
+
+    def test_cancellation_stops_filter(self):
+        """Тест: отмена прерывает фильтр на очередной строке."""
+        progress = ProgressContext(is_cancelled=lambda: progress.done >= 5)
+        transform = TransformFactory.create_family(FAMILY_MEDIAN, kernel_size=3)
+
+        with self.assertRaises(TransformCancelled):
+            transform.apply_with_progress(self.test_image, progress)
+
+        self.assertEqual(progress.done, 5)
+        # После отмены фильтр работает без контекста
+        self.assertEqual(transform.apply(self.test_image).shape, self.test_image.shape)
+
+    def test_default_context_is_stateless(self):
+        """Тест: контекст по умолчанию не накапливает состояние между вызовами."""
+        transform = UnsharpMasking(kernel_size=3, lambda_coeff=1.0)
+        transform.apply(self.test_image)
+        transform.execute(self.test_image)
+
+        self.assertEqual((NULL_PROGRESS.done, NULL_PROGRESS.total), (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Тесты для ленивого реестра преобразований.
+"""
+
+import unittest
+import numpy as np
+
+from image_processing.transform_manager import TransformManager
+from image_processing.factories.transform_factory import TransformFactory, FAMILY_BOX, FAMILY_MEDIAN
+from image_processing.transforms.reference_filters import reference_box, reference_median
+
+
+class TestLazyTransformRegistry(unittest.TestCase):
+    """Тесты для создания преобразований по требованию."""
+
+    def test_transforms_are_created_on_first_use(self):
+        """Тест: менеджер не создает преобразования при инициализации."""
+        manager = TransformManager()
+        self.assertEqual(manager.transforms, {})
+        self.assertIn("Фильтр Гаусса σ=2.0", manager.get_available_transforms())
+
+        transform = manager.get_transform("Фильтр Гаусса σ=2.0")
+        self.assertIs(manager.get_transform("Фильтр Гаусса σ=2.0"), transform)
+        self.assertEqual(list(manager.transforms), ["Фильтр Гаусса σ=2.0"])
+
+    def test_kernel_is_built_on_demand(self):
+        """Тест: ядро фильтра строится при первом обращении."""
+        transform = TransformFactory.create_transform("Фильтр Гаусса σ=1.0")
+        self.assertIsNone(transform._kernel)
+        self.assertEqual(transform.kernel.shape, (7, 7))
+        self.assertIsNotNone(transform._kernel)
+
+    def test_family_with_arbitrary_parameters(self):
+        """Тест: семейство создает фильтр с любыми параметрами."""
+        transform = TransformFactory.create_family("unsharp", kernel_size=9, lambda_coeff=0.7)
+        self.assertEqual(transform.get_name(), "Нерезкое маскирование k=9, λ=0.7")
+        with self.assertRaises(ValueError):
+            TransformFactory.create_family("Несуществующее")
+
+    def test_box_and_median_accept_odd_kernel_sizes(self):
+        """Тест: прямоугольный и медианный фильтры принимают любой нечетный размер ядра."""
+        image = np.random.default_rng(3).integers(0, 256, (15, 17), dtype=np.uint8)
+        np.testing.assert_array_equal(TransformFactory.create_family(FAMILY_BOX, kernel_size=7).apply(image),
+                                      reference_box(image, 7))
+        np.testing.assert_array_equal(TransformFactory.create_family(FAMILY_MEDIAN, kernel_size=9).apply(image),
+                                      reference_median(image, 9))
+        for kernel_size in (1, 4):
+            with self.assertRaises(ValueError):
+                TransformFactory.create_family(FAMILY_BOX, kernel_size=kernel_size)
+
+    def test_identical_kernels_are_shared(self):
+        """Тест: одинаковые ядра строятся один раз."""
+        gaussian = TransformFactory.create_transform("Фильтр Гаусса σ=1.0")
+        unsharp = TransformFactory.create_family("unsharp", kernel_size=5, sigma=1.0)
+        self.assertIs(gaussian.kernel, unsharp.blur_kernel)
+        self.assertFalse(gaussian.kernel.flags.writeable)
+
+    def test_unknown_transform(self):
+        """Тест ошибки для неизвестного преобразования."""
+        with self.assertRaises(ValueError):
+            TransformManager().get_transform("Несуществующее")
+
+
+if __name__ == '__main__':
+    unittest.main()
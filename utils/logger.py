@@ -1,21 +1,124 @@
 """
 Модуль для настройки логирования.
 Содержит функции для конфигурации системы логирования.
+
+Записи из рабочих потоков помещаются в очередь (QueueHandler) и
+форматируются и записываются в файл и консоль фоновым потоком
+(QueueListener), поэтому вычисления не ждут дискового ввода-вывода.
+Повторяющиеся сообщения ниже WARNING ограничиваются по частоте.
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Не больше стольких одинаковых сообщений за интервал
+DEFAULT_RATE_LIMIT = 20
+DEFAULT_RATE_INTERVAL = 1.0
+
+# Логгеры модулей приложения, направляемые в ту же очередь
+PACKAGE_LOGGERS = ("image_processing", "gui")
+
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Обработчик, помещающий запись в очередь без форматирования.
+
+    Стандартный QueueHandler форматирует сообщение в вызывающем потоке;
+    здесь подстановка аргументов выполняется фоновым потоком при записи.
+    Поэтому аргументы сообщений не должны изменяться после вызова логгера.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Возвращает запись без изменений."""
+        return record
 
 
-def setup_logger(name: str = "image_processor", level: int = logging.INFO) -> logging.Logger:
+class RateLimitFilter(logging.Filter):
+    """
+    Ограничивает частоту одинаковых сообщений.
+
+    Сообщения считаются одинаковыми, если совпадают логгер и шаблон
+    (record.msg до подстановки аргументов). Записи уровня WARNING и выше
+    не ограничиваются. Число пропущенных сообщений добавляется к первому
+    сообщению следующего интервала. Интервалы без пропусков удаляются сразу
+    после окончания, с пропусками - через еще один интервал, поэтому
+    сообщения, собранные через f-строки, не накапливаются.
+    """
+
+    def __init__(self, max_records: int = DEFAULT_RATE_LIMIT, interval: float = DEFAULT_RATE_INTERVAL):
+        """
+        Инициализация фильтра.
+
+        Args:
+            max_records: Максимальное число одинаковых сообщений за интервал
+            interval: Длительность интервала в секундах
+        """
+        super().__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self._lock = threading.Lock()
+        # (логгер, шаблон) -> (начало интервала, число сообщений, число пропущенных)
+        self._windows: Dict[Tuple[str, str], Tuple[float, int, int]] = {}
+        self._last_sweep = time.monotonic()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Пропускает запись, если лимит интервала не исчерпан."""
+        if record.levelno >= logging.WARNING:
+            return True
+
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.interval:
+                self._evict_expired(now)
+            start, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self.interval:
+                start, count = now, 0
+            if count >= self.max_records:
+                self._windows[key] = (start, count, suppressed + 1)
+                return False
+            self._windows[key] = (start, count + 1, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} (пропущено похожих сообщений: {suppressed})"
+        return True
+
+    def _evict_expired(self, now: float) -> None:
+        """
+        Удаляет завершившиеся интервалы (вызывается под блокировкой).
+
+        Args:
+            now: Текущее время time.monotonic()
+        """
+        self._windows = {
+            key: window for key, window in self._windows.items()
+            if now - window[0] < (2 if window[2] else 1) * self.interval
+        }
+        self._last_sweep = now
+
+
+def setup_logger(name: str = "image_processor", level: int = logging.INFO,
+                 max_records: Optional[int] = DEFAULT_RATE_LIMIT,
+                 package_level: Optional[int] = None) -> logging.Logger:
     """
     Настраивает и возвращает логгер.
-    
+
     Args:
         name: Имя логгера
         level: Уровень логирования
-        
+        max_records: Максимум одинаковых сообщений в секунду (None - без ограничения)
+        package_level: Уровень логгеров модулей приложения (None - не изменять,
+                       по умолчанию они наследуют WARNING корневого логгера)
+
     Returns:
         logging.Logger: Настроенный логгер
     """
@@ -23,34 +126,61 @@ def setup_logger(name: str = "image_processor", level: int = logging.INFO) -> lo
     log_dir = "logs"
     if not os.path.exists(log_dir):
         os.makedirs(log_dir)
-    
+
     # Создаем логгер
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Проверяем, не настроен ли уже логгер
     if logger.handlers:
         return logger
-    
+
     # Создаем форматтер
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     # Создаем обработчик для файла
     log_filename = os.path.join(log_dir, f"app_{datetime.now().strftime('%Y%m%d')}.log")
     file_handler = logging.FileHandler(log_filename, encoding='utf-8')
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    
+
     # Создаем обработчик для консоли
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    
-    # Добавляем обработчики к логгеру
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    # Обработчики вызываются фоновым потоком, логгер только ставит записи в очередь
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    if max_records is not None:
+        queue_handler.addFilter(RateLimitFilter(max_records))
+    logger.addHandler(queue_handler)
+    for package in PACKAGE_LOGGERS:
+        package_logger = logging.getLogger(package)
+        if not package_logger.handlers:
+            if package_level is not None:
+                package_logger.setLevel(package_level)
+            package_logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    _listeners[name] = listener
+
     return logger
+
+
+def stop_logging() -> None:
+    """Дописывает записи из очередей и останавливает фоновые потоки логирования."""
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_logging)
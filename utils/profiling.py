@@ -0,0 +1,250 @@
+"""
+Модуль профилирования операций по запросу.
+Содержит декоратор, сохраняющий снимки cProfile и tracemalloc для долгих операций.
+
+Профилирование включается переменными окружения или через configure_profiling():
+    IMAGE_PROCESSING_PROFILE=1            - включить профилирование
+    IMAGE_PROCESSING_PROFILE_SAMPLE=0.05  - доля профилируемых вызовов (0-1)
+    IMAGE_PROCESSING_PROFILE_DIR=profiles - каталог для снимков (рядом с logs)
+
+Для каждого профилируемого вызова сохраняются два файла с именем
+<операция>_<время>: .pstats (cProfile, открывается pstats/snakeviz) и .json
+(время, результат и крупнейшие выделения памяти по tracemalloc).
+"""
+
+import cProfile
+import functools
+import json
+import os
+import random
+import re
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ENV_ENABLED = "IMAGE_PROCESSING_PROFILE"
+ENV_SAMPLE_RATE = "IMAGE_PROCESSING_PROFILE_SAMPLE"
+ENV_OUTPUT_DIR = "IMAGE_PROCESSING_PROFILE_DIR"
+
+# Каталог по умолчанию: рядом с каталогом logs (см. setup_logger)
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Число строк с крупнейшими выделениями памяти в отчете
+TOP_ALLOCATIONS = 25
+
+
+class ProfilingConfig:
+    """Настройки профилирования."""
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 1.0,
+                 output_dir: str = DEFAULT_PROFILE_DIR, top_allocations: int = TOP_ALLOCATIONS):
+        """
+        Инициализация настроек.
+
+        Args:
+            enabled: Включено ли профилирование
+            sample_rate: Доля профилируемых вызовов (0-1)
+            output_dir: Каталог для снимков
+            top_allocations: Число крупнейших выделений памяти в отчете
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Доля профилируемых вызовов должна быть в диапазоне 0-1")
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.top_allocations = top_allocations
+
+    @classmethod
+    def from_environment(cls) -> 'ProfilingConfig':
+        """
+        Создает настройки из переменных окружения.
+
+        Returns:
+            ProfilingConfig: Настройки
+        """
+        enabled = os.environ.get(ENV_ENABLED, "").strip().lower() in ("1", "true", "yes", "on")
+        try:
+            sample_rate = float(os.environ.get(ENV_SAMPLE_RATE, "1.0"))
+        except ValueError:
+            logger.warning(f"Некорректное значение {ENV_SAMPLE_RATE}, используется 1.0")
+            sample_rate = 1.0
+        return cls(enabled=enabled,
+                   sample_rate=min(max(sample_rate, 0.0), 1.0),
+                   output_dir=os.environ.get(ENV_OUTPUT_DIR, DEFAULT_PROFILE_DIR))
+
+
+_config = ProfilingConfig.from_environment()
+
+# Одновременно профилируется один вызов: cProfile и tracemalloc глобальны
+_profile_lock = threading.Lock()
+
+# Открытые замеры пика памяти (см. TracedPeak)
+_active_peaks: List['TracedPeak'] = []
+_peak_lock = threading.Lock()
+
+
+class TracedPeak:
+    """
+    Замер пика памяти tracemalloc за время блока with.
+
+    tracemalloc.reset_peak() сбрасывает общий для процесса пик, поэтому
+    вложенный замер (например, instrumentation.measure внутри профилируемой
+    операции) обнулил бы пик внешнего. Перед каждым сбросом текущий пик
+    переносится во все открытые замеры, и внешний замер учитывает пик всего
+    блока. tracemalloc должен быть запущен до входа в блок.
+    """
+
+    def __init__(self):
+        """Инициализация замера."""
+        # Абсолютный пик отслеживаемой памяти в байтах
+        self.peak = 0
+
+    def __enter__(self) -> 'TracedPeak':
+        with _peak_lock:
+            _fold_peak()
+            tracemalloc.reset_peak()
+            _active_peaks.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        with _peak_lock:
+            _fold_peak()
+            _active_peaks.remove(self)
+        return False
+
+
+def _fold_peak() -> None:
+    """Переносит текущий пик tracemalloc в открытые замеры (под _peak_lock)."""
+    if not tracemalloc.is_tracing():
+        return
+    peak = tracemalloc.get_traced_memory()[1]
+    for traced_peak in _active_peaks:
+        traced_peak.peak = max(traced_peak.peak, peak)
+
+
+def configure_profiling(enabled: Optional[bool] = None, sample_rate: Optional[float] = None,
+                        output_dir: Optional[str] = None) -> ProfilingConfig:
+    """
+    Изменяет настройки профилирования во время работы.
+
+    Args:
+        enabled: Включено ли профилирование
+        sample_rate: Доля профилируемых вызовов (0-1)
+        output_dir: Каталог для снимков
+
+    Returns:
+        ProfilingConfig: Текущие настройки
+    """
+    global _config
+    _config = ProfilingConfig(
+        enabled=_config.enabled if enabled is None else enabled,
+        sample_rate=_config.sample_rate if sample_rate is None else sample_rate,
+        output_dir=_config.output_dir if output_dir is None else output_dir,
+        top_allocations=_config.top_allocations,
+    )
+    return _config
+
+
+def get_profiling_config() -> ProfilingConfig:
+    """Возвращает текущие настройки профилирования."""
+    return _config
+
+
+def profiled(operation: str) -> Callable:
+    """
+    Декоратор профилирования операции.
+
+    Если профилирование выключено, вызов не попал в выборку или другой вызов
+    уже профилируется, функция выполняется без накладных расходов, кроме
+    проверки настроек.
+
+    Args:
+        operation: Название операции (используется в именах файлов)
+
+    Returns:
+        Callable: Декоратор
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            config = _config
+            if not config.enabled or random.random() >= config.sample_rate:
+                return function(*args, **kwargs)
+            if not _profile_lock.acquire(blocking=False):
+                return function(*args, **kwargs)
+            try:
+                return _run_profiled(config, operation, function, args, kwargs)
+            finally:
+                _profile_lock.release()
+        return wrapper
+    return decorator
+
+
+def _run_profiled(config: ProfilingConfig, operation: str, function: Callable,
+                  args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Выполняет функцию под cProfile и tracemalloc и сохраняет снимки."""
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+
+    profiler = cProfile.Profile()
+    traced_peak = TracedPeak()
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        # Пик сохраняется и при вложенных замерах памяти (см. TracedPeak)
+        with traced_peak:
+            profiler.enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                profiler.disable()
+    except BaseException as e:
+        status = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        wall_time = time.perf_counter() - start
+        current_memory = tracemalloc.get_traced_memory()[0]
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        report = {
+            'operation': operation,
+            'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+            'wall_time': wall_time,
+            'status': status,
+            'memory_delta_bytes': current_memory - start_memory,
+            'peak_memory_bytes': max(0, traced_peak.peak - start_memory),
+            'top_allocations': [
+                {
+                    'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    'size_bytes': stat.size,
+                    'count': stat.count,
+                }
+                for stat in snapshot.statistics('lineno')[:config.top_allocations]
+            ],
+        }
+        _save_capture(config, operation, profiler, report)
+
+
+def _save_capture(config: ProfilingConfig, operation: str, profiler: cProfile.Profile,
+                  report: Dict[str, Any]) -> None:
+    """Сохраняет .pstats и .json; ошибки записи не прерывают операцию."""
+    try:
+        os.makedirs(config.output_dir, exist_ok=True)
+        safe_operation = re.sub(r"[^\w.-]+", "_", operation)
+        base_name = os.path.join(config.output_dir,
+                                 f"{safe_operation}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+        profiler.dump_stats(base_name + ".pstats")
+        with open(base_name + ".json", 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        logger.info(f"Сохранен профиль операции {operation}: {base_name}")
+    except OSError as e:
+        logger.error(f"Ошибка при сохранении профиля операции {operation}: {e}")